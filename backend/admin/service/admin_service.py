@@ -0,0 +1,63 @@
+from flask import jsonify
+
+from slow_query_log import get_slow_query_log
+
+# 느린 쿼리 리포트에서 한 번에 볼 수 있는 최대 쿼리 형태 수
+SLOW_QUERY_REPORT_LIMIT = 200
+
+
+class AdminService:
+
+    """ 운영 관리 서비스
+    """
+
+    # noinspection PyMethodMayBeStatic
+    def get_slow_query_report(self, user, order_by, limit):
+
+        """ 쿼리 형태별 실행 통계와 느린 쿼리 실행 계획 조회
+            Args:
+                user: 유저 정보
+                order_by: 정렬 기준 (total, p95, count, slow)
+                limit: 조회할 쿼리 형태 수
+
+            Returns:
+                200: 현재 워커 프로세스의 쿼리 형태별 통계
+                400: INVALID_LIMIT
+                403: 마스터 권한이 아닌 경우
+                404: SLOW_QUERY_LOG_DISABLED
+        """
+        if user.get('auth_type_id', None) != 1:
+            return jsonify({'message': 'AUTHORIZATION_REQUIRED'}), 403
+
+        slow_query_log = get_slow_query_log()
+        if slow_query_log is None:
+            return jsonify({'message': 'SLOW_QUERY_LOG_DISABLED'}), 404
+
+        if limit is None:
+            limit = 50
+        if not 0 < limit <= SLOW_QUERY_REPORT_LIMIT:
+            return jsonify({'message': 'INVALID_LIMIT'}), 400
+
+        return jsonify(slow_query_log.report(order_by or 'total', limit)), 200
+
+    # noinspection PyMethodMayBeStatic
+    def reset_slow_query_log(self, user):
+
+        """ 쿼리 형태별 실행 통계 초기화
+            Args:
+                user: 유저 정보
+
+            Returns:
+                200: SUCCESS
+                403: 마스터 권한이 아닌 경우
+                404: SLOW_QUERY_LOG_DISABLED
+        """
+        if user.get('auth_type_id', None) != 1:
+            return jsonify({'message': 'AUTHORIZATION_REQUIRED'}), 403
+
+        slow_query_log = get_slow_query_log()
+        if slow_query_log is None:
+            return jsonify({'message': 'SLOW_QUERY_LOG_DISABLED'}), 404
+
+        slow_query_log.reset()
+        return jsonify({'message': 'SUCCESS'}), 200
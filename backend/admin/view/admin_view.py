@@ -0,0 +1,64 @@
+from flask import Blueprint, g
+from flask_request_validator import (
+    GET,
+    Param,
+    Pattern,
+    validate_params
+)
+
+from admin.service.admin_service import AdminService
+from utils import login_required
+
+
+class AdminView:
+    """ 운영 관리 뷰
+    """
+    admin_app = Blueprint('admin_app', __name__, url_prefix='/admin')
+
+    @admin_app.route('/slow-queries', methods=['GET'], endpoint='get_slow_query_report')
+    @login_required
+    @validate_params(
+        Param('order_by', GET, str, required=False, rules=[Pattern(r'^(total|p95|count|slow)$')]),
+        Param('limit', GET, int, required=False)
+    )
+    def get_slow_query_report(*args):
+        """ 느린 쿼리 리포트
+        마스터 권한을 가진 어카운트가 쿼리 형태별 실행 통계를 조회하는 기능.
+        get_seller_list, get_product_list, get_all_events 처럼 필터 조합으로 쿼리를 만드는 경우
+        필터 조합마다 다른 형태로 묶이므로 어떤 조합에 인덱스가 필요한지 볼 수 있다.
+        기준 시간보다 느린 실행은 바인딩된 파라미터와 EXPLAIN FORMAT=JSON 결과가 같이 나온다.
+        워커 프로세스마다 따로 모이므로 응답한 워커의 통계만 나온다.
+
+        Args:
+            args: 유효성 검사를 통과한 파라미터 리스트
+                order_by: 정렬 기준 (total: 실행 시간 합계(기본값), p95, count: 실행 수, slow: 느린 실행 수)
+                limit: 조회할 쿼리 형태 수 (기본값 50, 최대 200)
+
+        Returns:
+            200: 쿼리 형태별 실행 수, 실행 시간 퍼센타일, 느린 실행 예시
+            400: INVALID_LIMIT
+            403: AUTHORIZATION_REQUIRED
+            404: SLOW_QUERY_LOG_DISABLED
+        """
+
+        # 유저정보를 가져와 서비스로 넘김
+        user = g.account_info
+
+        admin_service = AdminService()
+        return admin_service.get_slow_query_report(user, args[0], args[1])
+
+    @admin_app.route('/slow-queries', methods=['DELETE'], endpoint='reset_slow_query_log')
+    @login_required
+    def reset_slow_query_log():
+        """ 느린 쿼리 리포트 초기화
+        인덱스를 추가한 뒤 다시 측정할 때 사용한다.
+
+        Returns:
+            200: SUCCESS
+            403: AUTHORIZATION_REQUIRED
+            404: SLOW_QUERY_LOG_DISABLED
+        """
+        user = g.account_info
+
+        admin_service = AdminService()
+        return admin_service.reset_slow_query_log(user)
@@ -1,15 +1,29 @@
+import os
+
 from datetime import timedelta, datetime, time
 from decimal import Decimal
 
+import click
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from flask import Flask
 from flask_cors import CORS
 from flask.json import JSONEncoder
 
 from config import S3_CONFIG
+from connection import get_db_connection
+from metrics import init_app as init_metrics
+from slow_query_log import init_app as init_slow_query_log, SLOW_QUERY_THRESHOLD_MS
 from seller.view.seller_view import SellerView
 from product.view.product_view import ProductView
 from image.view.image_view import ImageView
 from event.view.event_view import EventView
+from admin.view.admin_view import AdminView
+from product.model.product_dao import ProductDao
 
 
 class CustomJSONEncoder(JSONEncoder):
@@ -50,6 +64,79 @@ class CustomJSONEncoder(JSONEncoder):
         return JSONEncoder.default(self, obj)
 
 
+# 응답의 datetime 을 한국 시간으로 바꿀 때 더하는 시간
+KST_OFFSET = timedelta(hours=+9)
+
+
+def format_kst_datetime(obj):
+    # naive datetime 은 isoformat 이 strftime('%Y-%m-%d %H:%M:%S') 와 같은 문자열을 더 빠르게 만든다.
+    if obj.tzinfo is None and obj.year >= 1000:
+        return (obj + KST_OFFSET).isoformat(' ', 'seconds')
+    return datetime.strftime(obj + KST_OFFSET, '%Y-%m-%d %H:%M:%S')
+
+
+class FastJSONEncoder(CustomJSONEncoder):
+
+    """
+    CustomJSONEncoder 와 같은 결과를 orjson 으로 빠르게 만드는 JSONEncoder
+    """
+
+    # 자주 나오는 자료형은 isinstance 를 차례로 확인하지 않고 타입으로 바로 변환 함수를 찾는다.
+    DEFAULT_CONVERTERS = {
+        datetime: format_kst_datetime,
+        Decimal: float,
+        timedelta: str,
+        set: list,
+        bytes: lambda obj: obj.decode("utf-8"),
+    }
+
+    def default(self, obj):
+        converter = self.DEFAULT_CONVERTERS.get(type(obj))
+        if converter is not None:
+            return converter(obj)
+
+        # 하위 클래스 등은 CustomJSONEncoder 의 처리를 그대로 따름
+        return CustomJSONEncoder.default(self, obj)
+
+    def encode(self, obj):
+        """
+
+        orjson 이 직접 변환하는 datetime, dataclass 는 CustomJSONEncoder 와 결과가 다르므로 default 로 넘기고,
+        정렬(JSON_SORT_KEYS), 들여쓰기(디버그 모드) 설정도 orjson 옵션으로 맞춘다.
+        한글을 \\uXXXX 로 바꾸지 않고 utf-8 그대로 내보내는 것 외에는 파싱 결과가 같다.
+        orjson 이 처리하지 못하는 값(64 bit 를 넘는 정수 등)이 있으면 기존 encoder 로 변환한다.
+
+        Args:
+            obj: json 형태로 반환하고자 하는 객체
+
+        Returns: json 문자열
+        """
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+        except (orjson.JSONEncodeError, TypeError):
+            return CustomJSONEncoder.encode(self, obj)
+
+
+def get_json_encoder(json_serializer):
+    """
+
+    Args:
+        json_serializer: 응답 json 을 만들 라이브러리 (orjson, json)
+
+    Returns: 설정에 맞는 JSONEncoder 클래스. orjson 이 설치되어 있지 않으면 CustomJSONEncoder
+    """
+    if json_serializer == 'orjson' and orjson is not None:
+        return FastJSONEncoder
+    return CustomJSONEncoder
+
+
 def make_config(app):
     """
 
@@ -70,9 +157,51 @@ def make_config(app):
     app.config['AWS_SECRET_ACCESS_KEY'] = S3_CONFIG['AWS_SECRET_ACCESS_KEY']
     app.config['S3_BUCKET_NAME'] = S3_CONFIG['S3_BUCKET_NAME']
     app.config['DEBUG'] = True
+
+    # 응답 json 을 만들 라이브러리 (orjson: FastJSONEncoder, json: CustomJSONEncoder)
+    app.config['JSON_SERIALIZER'] = os.environ.get('JSON_SERIALIZER', 'orjson')
+
+    # 요청, 쿼리, s3 호출 측정과 /metrics 엔드포인트 사용 여부 (METRICS_ENABLED=1 일 때만 켬)
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '0') == '1'
+
+    # 쿼리 형태별 통계, 느린 쿼리 EXPLAIN 기록 사용 여부와 기준 시간(ms)
+    app.config['SLOW_QUERY_LOG_ENABLED'] = os.environ.get('SLOW_QUERY_LOG_ENABLED', '0') == '1'
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', SLOW_QUERY_THRESHOLD_MS))
     return
 
 
+@click.command('rebuild-seller-product-stats')
+def rebuild_seller_product_stats_command():
+    """ 셀러별 상품 수(seller_product_stats) 를 product_infos 의 최신 이력으로 다시 계산
+
+    실행:
+        FLASK_APP=app flask rebuild-seller-product-stats
+    """
+    db_connection = get_db_connection()
+    try:
+        seller_count = ProductDao().rebuild_seller_product_stats(db_connection)
+        click.echo(f'REBUILT_SELLER_PRODUCT_STATS: {seller_count} sellers')
+
+    finally:
+        db_connection.close()
+
+
+@click.command('rebuild-product-name-search')
+def rebuild_product_name_search_command():
+    """ 상품명 검색 테이블(product_name_search) 을 product_infos 의 최신 이력으로 다시 채움
+
+    실행:
+        FLASK_APP=app flask rebuild-product-name-search
+    """
+    db_connection = get_db_connection()
+    try:
+        product_count = ProductDao().rebuild_product_name_search(db_connection)
+        click.echo(f'REBUILT_PRODUCT_NAME_SEARCH: {product_count} products')
+
+    finally:
+        db_connection.close()
+
+
 def create_app():
     """
 
@@ -89,13 +218,18 @@ def create_app():
     """
     # set flask object
     app = Flask(__name__)
-    app.json_encoder = CustomJSONEncoder
     make_config(app)
+    app.json_encoder = get_json_encoder(app.config['JSON_SERIALIZER'])
     CORS(app, resources={r"/*/*": {"origins": "*"}})
+    init_metrics(app)
+    init_slow_query_log(app, get_db_connection)
     app.register_blueprint(SellerView.seller_app)
     app.register_blueprint(ProductView.product_app)
     app.register_blueprint(ImageView.image_app)
     app.register_blueprint(EventView.event_app)
+    app.register_blueprint(AdminView.admin_app)
+    app.cli.add_command(rebuild_seller_product_stats_command)
+    app.cli.add_command(rebuild_product_name_search_command)
 
     return app
 
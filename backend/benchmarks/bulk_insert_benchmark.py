@@ -0,0 +1,156 @@
+""" 상품 이미지, 태그, 기획전 상품 multi-row INSERT 벤치마크
+
+기존 방식(행마다 INSERT 실행)과 connection.bulk_insert 의 multi-row INSERT 를 같은 트랜잭션 안에서 비교한다.
+요청 하나에서 넣는 행(상품 이미지 5장 x 크기 3개, 태그, 기획전 상품)을 만들어서 넣고 매번 롤백하므로 데이터는 남지 않는다.
+행이 참조할 상품 정보, 기획전 정보가 필요하므로 seed_data 로 데이터를 넣은 데이터베이스에서 실행한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bulk_insert_benchmark --tags 20 --event-products 100 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+from connection import DatabaseConnection, bulk_insert
+from event.model.event_dao import EVENT_PRODUCT_COLUMNS
+from product.model.product_dao import PRODUCT_IMAGE_COLUMNS, PRODUCT_TAG_COLUMNS
+
+# 상품 이미지는 최대 5장, 장마다 크기 3개
+PRODUCT_IMAGE_COUNT = 5
+PRODUCT_IMAGE_SIZE_IDS = (1, 2, 3)
+
+
+class CountingCursor:
+
+    """ execute 호출 수(데이터베이스 왕복 수)를 세는 커서 """
+
+    def __init__(self, db_cursor):
+        self.db_cursor = db_cursor
+        self.round_trips = 0
+
+    def execute(self, statement, params=None):
+        self.round_trips += 1
+        return self.db_cursor.execute(statement, params)
+
+
+def legacy_insert(db_cursor, table, columns, rows):
+    # 기존 DAO 와 같은 방식: 행마다 INSERT 실행
+    insert_statement = f'''
+        INSERT INTO {table} ({", ".join(columns)})
+        VALUES ({", ".join(f"%({column})s" for column in columns)})
+    '''
+    for row in rows:
+        db_cursor.execute(insert_statement, row)
+
+
+def load_targets(db_connection, event_product_count):
+    with db_connection as db_cursor:
+        db_cursor.execute('''
+            SELECT product_info_no, product_id
+            FROM product_infos
+            WHERE close_time = '2037-12-31 23:59:59'
+            ORDER BY product_info_no DESC
+            LIMIT 1
+        ''')
+        product_info = db_cursor.fetchone()
+
+        db_cursor.execute('''
+            SELECT event_info_no
+            FROM event_infos
+            WHERE close_time = '2037-12-31 23:59:59'
+            ORDER BY event_info_no DESC
+            LIMIT 1
+        ''')
+        event_info = db_cursor.fetchone()
+
+        db_cursor.execute('''
+            SELECT product_no
+            FROM products
+            ORDER BY product_no DESC
+            LIMIT %(limit)s
+        ''', {'limit': event_product_count})
+        product_nos = [product['product_no'] for product in db_cursor.fetchall()]
+
+    if not product_info or not event_info:
+        raise SystemExit('상품 정보와 기획전 정보가 필요합니다. python -m benchmarks.seed_data 를 먼저 실행하세요.')
+    return product_info, event_info, product_nos
+
+
+def make_request_rows(product_info, event_info, product_nos, tag_count):
+    image_rows = [
+        {
+            'image_url': f'https://example.com/benchmark/{image_order}_{image_size_id}.jpg',
+            'product_info_id': product_info['product_info_no'],
+            'image_size_id': image_size_id,
+            'image_order': image_order
+        }
+        for image_order in range(1, PRODUCT_IMAGE_COUNT + 1)
+        for image_size_id in PRODUCT_IMAGE_SIZE_IDS
+    ]
+    tag_rows = [
+        {'name': f'benchmark_tag_{index}', 'product_info_id': product_info['product_info_no']}
+        for index in range(tag_count)
+    ]
+    event_product_rows = [
+        {'product_order': index + 1, 'product_id': product_no, 'event_info_id': event_info['event_info_no']}
+        for index, product_no in enumerate(product_nos)
+    ]
+    return (
+        ('product_images', PRODUCT_IMAGE_COLUMNS, image_rows),
+        ('product_tags', PRODUCT_TAG_COLUMNS, tag_rows),
+        ('event_detail_product_infos', EVENT_PRODUCT_COLUMNS, event_product_rows),
+    )
+
+
+def measure(insert_function, db_connection, request_rows, repeat):
+    timings = []
+    round_trips = 0
+    for _ in range(repeat):
+        with db_connection as db_cursor:
+            counting_cursor = CountingCursor(db_cursor)
+            started_at = time.perf_counter()
+            for table, columns, rows in request_rows:
+                insert_function(counting_cursor, table, columns, rows)
+            timings.append((time.perf_counter() - started_at) * 1000)
+            round_trips = counting_cursor.round_trips
+        db_connection.rollback()
+
+    return {
+        'round_trips_per_request': round_trips,
+        'mean_ms': round(statistics.mean(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='multi-row INSERT 벤치마크')
+    parser.add_argument('--tags', type=int, default=20)
+    parser.add_argument('--event-products', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_connection = DatabaseConnection()
+    try:
+        product_info, event_info, product_nos = load_targets(db_connection, args.event_products)
+        request_rows = make_request_rows(product_info, event_info, product_nos, args.tags)
+
+        legacy = measure(legacy_insert, db_connection, request_rows, args.repeat)
+        bulk = measure(bulk_insert, db_connection, request_rows, args.repeat)
+
+    finally:
+        db_connection.rollback()
+        db_connection.close()
+
+    print(json.dumps({
+        'rows_per_request': {table: len(rows) for table, columns, rows in request_rows},
+        'repeat': args.repeat,
+        'row_by_row_insert': legacy,
+        'multi_row_insert': bulk,
+        'speedup': round(legacy['mean_ms'] / bulk['mean_ms'], 2),
+    }, indent=4))
+
+
+if __name__ == '__main__':
+    main()
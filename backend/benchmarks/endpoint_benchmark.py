@@ -0,0 +1,629 @@
+""" 엔드포인트 부하 벤치마크
+
+create_app() 으로 만든 앱을 별도 프로세스에서 띄우고, 로컬 MySQL/MariaDB 와 로컬 s3 대체 서버(minio, moto_server 등)를 사용해서
+셀러 리스트, 상품 리스트, 상품 상세, 상품 멀티 조회, 기획전 리스트, 로그인, 상품 등록 엔드포인트에
+정해진 동시 요청 수로 요청을 보내고 p50/p95/p99 응답 시간과 처리량을 측정한다.
+결과는 커밋 해시와 함께 json 파일로 저장하고, --compare 로 이전 결과와 비교할 수 있다.
+
+데이터베이스는 config.DATABASES 의 서버를 사용한다. 스키마 파일이 brandi 데이터베이스를 지우고 다시 만들기 때문에
+DATABASES['database'] 는 brandi 여야 하고, 벤치마크 전용 서버에서만 실행한다.
+    --load-schema: 스키마 파일(brandi_schema_v2.4.sql 또는 db_initial.sql)과 schema/migrations 를 버전 순서대로
+                   mysql 클라이언트로 적용한다. 두 스키마 파일 모두 데이터베이스를 새로 만들기 때문에 하나만 적용한다.
+    --seed: benchmarks.seed_data 로 셀러, 상품, 기획전 데이터를 넣는다.
+상품 등록은 s3 에 이미지를 올리므로 --s3-endpoint-url(또는 S3_ENDPOINT_URL 환경변수)이 있을 때만 실행하고,
+실행할 때마다 상품이 추가된다.
+--metrics, --slow-query-log 를 주면 서버에서 측정을 켜고, 끝난 뒤 /metrics 와 /admin/slow-queries 결과를 같이 저장한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.endpoint_benchmark --load-schema --seed --sellers 2000 --products-per-seller 50 \\
+        --s3-endpoint-url http://127.0.0.1:9000 --concurrency 1,8,32 --requests 300
+    python -m benchmarks.endpoint_benchmark --concurrency 8 --scenarios seller_list,product_list \\
+        --compare endpoint_benchmark_1a2b3c4_20200420T120000.json
+"""
+import argparse
+import glob
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import re
+import socket
+import subprocess
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import jwt
+import requests
+
+from botocore.exceptions import ClientError
+from PIL import Image
+from werkzeug.serving import make_server
+
+from app import create_app
+from config import DATABASES, S3_CONFIG, SECRET
+from connection import get_db_connection, get_s3_connection
+from utils import S3_BUCKET_NAME
+from benchmarks.seed_data import SEED_PASSWORD, seed_database
+
+# backend 디렉토리 기준 스키마 경로
+SCHEMA_DIRECTORY = 'schema'
+DEFAULT_SCHEMA_FILE = os.path.join(SCHEMA_DIRECTORY, 'brandi_schema_v2.4.sql')
+MIGRATION_PATTERN = os.path.join(SCHEMA_DIRECTORY, 'migrations', 'v*.sql')
+
+# 스키마 파일이 만드는 데이터베이스 이름
+SCHEMA_DATABASE = 'brandi'
+
+# 앱 서버가 요청을 받을 수 있을 때까지 기다리는 최대 시간(초)
+SERVER_START_TIMEOUT = 30
+
+# 요청 하나의 최대 대기 시간(초)
+REQUEST_TIMEOUT = 60
+
+# 응답 시간 퍼센타일
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# 시나리오에서 돌아가며 사용하는 상품, 로그인 계정 수
+SAMPLE_PRODUCT_COUNT = 1000
+SAMPLE_LOGIN_COUNT = 200
+
+# 상품 등록에 사용하는 셀러 수, 한 번에 조회하는 상품 수(상품 멀티 조회)
+REGISTRATION_SELLER_COUNT = 10
+PRODUCT_DETAILS_BATCH = 20
+
+# 상품 등록 이미지 크기. 요청 본문이 500KB 보다 작으면 werkzeug 가 파일을 메모리(BytesIO)에 두는데,
+# ImageUpload 는 os.fstat(fileno()) 로 크기를 확인하므로 임시 파일로 저장될 만큼 큰 이미지를 만든다.
+REGISTRATION_IMAGE_SIZE = (1000, 1000)
+
+# 상품 등록 할인 기간 (프론트엔드가 보내는 자바스크립트 Date 문자열 형식)
+DISCOUNT_TIME_FORMAT = '%a %b %d %Y %H:%M:%S GMT+0900 (Korean Standard Time)'
+
+# 검색 조건 조합을 바꿔가며 요청하는 리스트 시나리오
+SELLER_LIST_PARAMS = (
+    {'limit': 10},
+    {'limit': 10, 'offset': 100},
+    {'limit': 10, 'name_kr': '시드셀러1'},
+    {'limit': 10, 'seller_status': '입점'},
+    {'limit': 10, 'manager_name': '담당자2'},
+)
+PRODUCT_LIST_PARAMS = (
+    {'limit': 10},
+    {'limit': 10, 'offset': 100},
+    {'limit': 10, 'product_name': '시드상품1'},
+    {'limit': 10, 'is_available': 1, 'is_on_display': 1},
+    {'limit': 10, 'period_start': '2019-01-01', 'period_end': '2019-12-31'},
+)
+EVENT_LIST_PARAMS = (
+    {'limit': 10},
+    {'limit': 10, 'offset': 50},
+    {'limit': 10, 'event_name': '시드기획전1'},
+)
+
+SCENARIOS = (
+    'seller_list', 'product_list', 'product_detail', 'product_details', 'event_list', 'login', 'product_registration'
+)
+
+
+def get_git_commit():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL)
+        status = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], stderr=subprocess.DEVNULL)
+        return commit.decode('utf-8').strip(), bool(status.strip())
+
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def get_migration_version(path):
+    # v2.10 이 v2.9 다음에 오도록 파일 이름의 버전을 숫자로 비교
+    match = re.match(r'v(\d+)\.(\d+)', os.path.basename(path))
+    return int(match.group(1)), int(match.group(2))
+
+
+def run_mysql_client(mysql_client, sql_file=None, statement=None):
+    command = [
+        mysql_client,
+        f'--host={DATABASES["host"]}',
+        f'--port={DATABASES["port"]}',
+        f'--user={DATABASES["user"]}',
+        '--default-character-set=utf8mb4',
+    ]
+    if statement:
+        command += ['-e', statement]
+
+    # 비밀번호가 프로세스 목록에 보이지 않도록 환경변수로 넘긴다.
+    environment = dict(os.environ, MYSQL_PWD=str(DATABASES['password']))
+    if sql_file:
+        with open(sql_file, 'rb') as sql:
+            subprocess.run(command, stdin=sql, env=environment, check=True)
+    else:
+        subprocess.run(command, env=environment, check=True)
+
+
+def load_schema(schema_file, mysql_client):
+
+    """ 스키마 파일과 마이그레이션을 버전 순서대로 적용한다
+
+    스키마 파일은 DROP DATABASE 로 시작하므로 데이터베이스가 없는 서버에서도 실행되도록 먼저 만들어 둔다.
+
+    Args:
+        schema_file: 기본 스키마 파일 경로
+        mysql_client: mysql 클라이언트 실행 파일
+
+    Returns:
+        적용한 파일 목록
+    """
+    if DATABASES['database'] != SCHEMA_DATABASE:
+        raise SystemExit(f'스키마 파일은 {SCHEMA_DATABASE} 데이터베이스를 만듭니다. DATABASES["database"] 를 확인하세요.')
+
+    run_mysql_client(mysql_client, statement=f'CREATE DATABASE IF NOT EXISTS {SCHEMA_DATABASE}')
+
+    sql_files = [schema_file] + sorted(glob.glob(MIGRATION_PATTERN), key=get_migration_version)
+    for sql_file in sql_files:
+        print(f'LOADING {sql_file}')
+        run_mysql_client(mysql_client, sql_file=sql_file)
+    return sql_files
+
+
+def prepare_s3_bucket(s3_endpoint_url):
+    # 로컬 s3 대체 서버에 상품 이미지 버킷을 만든다. 앱 서버 프로세스도 같은 환경변수로 이 서버를 사용한다.
+    os.environ['S3_ENDPOINT_URL'] = s3_endpoint_url
+    try:
+        get_s3_connection().create_bucket(
+            Bucket=S3_BUCKET_NAME,
+            CreateBucketConfiguration={'LocationConstraint': S3_CONFIG['REGION_NAME']}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] not in ('BucketAlreadyOwnedByYou', 'BucketAlreadyExists'):
+            raise
+
+
+def serve_app(host, port):
+    # 앱 서버 프로세스. 클라이언트 스레드와 GIL 을 나눠 쓰지 않도록 벤치마크 프로세스와 분리한다.
+    make_server(host, port, create_app(), threaded=True).serve_forever()
+
+
+def start_server(host, port):
+    server_process = multiprocessing.Process(target=serve_app, args=(host, port), daemon=True)
+    server_process.start()
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if not server_process.is_alive():
+            raise SystemExit('앱 서버가 시작되지 않았습니다.')
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return server_process
+
+        except OSError:
+            time.sleep(0.2)
+
+    server_process.terminate()
+    raise SystemExit('앱 서버가 제한 시간 안에 요청을 받지 못했습니다.')
+
+
+def make_token(account_no):
+    # 마스터 계정은 셀러 로그인 엔드포인트로 로그인할 수 없으므로 같은 형식의 토큰을 직접 만든다.
+    token = jwt.encode(
+        {'account_no': account_no, 'exp': datetime.utcnow() + timedelta(days=1)},
+        SECRET['secret_key'], algorithm=SECRET['algorithm']
+    )
+    return token.decode('utf-8') if isinstance(token, bytes) else token
+
+
+def make_registration_image():
+    # 압축이 잘 되지 않는 노이즈 이미지로 임시 파일로 저장될 만큼 큰 jpeg 를 만든다.
+    width, height = REGISTRATION_IMAGE_SIZE
+    image = Image.frombytes('RGB', (width, height), os.urandom(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=95)
+    return buffer.getvalue()
+
+
+def load_fixtures(base_url, rng):
+
+    """ 시나리오에서 사용할 토큰, 상품 번호, 로그인 계정, 상품 등록 정보를 준비한다
+
+    Args:
+        base_url: 앱 서버 주소
+        rng: random.Random 객체
+
+    Returns:
+        시나리오 공통 정보 dict
+    """
+    db_connection = get_db_connection()
+    try:
+        with db_connection.cursor() as db_cursor:
+            db_cursor.execute("""
+                SELECT MIN(account_no) AS account_no
+                FROM accounts
+                WHERE auth_type_id = 1
+                AND is_deleted = 0
+            """)
+            master_account_no = db_cursor.fetchone()['account_no']
+
+            db_cursor.execute("""
+                SELECT product_no
+                FROM products
+                ORDER BY product_no DESC
+                LIMIT %(limit)s
+            """, {'limit': SAMPLE_PRODUCT_COUNT})
+            product_nos = [row['product_no'] for row in db_cursor.fetchall()]
+
+            # 입점대기(1) 셀러는 로그인할 수 없으므로 제외
+            db_cursor.execute("""
+                SELECT
+                    AC01.login_id,
+                    SI01.product_sort_id
+                FROM accounts AS AC01
+                INNER JOIN seller_accounts AS SA01 ON AC01.account_no = SA01.account_id
+                INNER JOIN seller_infos AS SI01 ON SA01.seller_account_no = SI01.seller_account_id
+                WHERE
+                    AC01.login_id LIKE 'seed\\_seller\\_%%'
+                    AND AC01.is_deleted = 0
+                    AND SI01.close_time = '2037-12-31 23:59:59'
+                    AND SI01.seller_status_id != 1
+                ORDER BY AC01.account_no DESC
+                LIMIT %(limit)s
+            """, {'limit': SAMPLE_LOGIN_COUNT})
+            login_sellers = db_cursor.fetchall()
+
+            db_cursor.execute('SELECT first_category_no, product_sort_id FROM first_categories')
+            first_categories = {}
+            for row in db_cursor.fetchall():
+                first_categories.setdefault(row['product_sort_id'], []).append(row['first_category_no'])
+
+            db_cursor.execute('SELECT color_filter_no FROM color_filters WHERE NOT color_filter_no = 19')
+            color_filter_ids = [row['color_filter_no'] for row in db_cursor.fetchall()]
+
+            db_cursor.execute('SELECT style_filter_no FROM style_filters')
+            style_filter_ids = [row['style_filter_no'] for row in db_cursor.fetchall()]
+
+    finally:
+        db_connection.close()
+
+    if master_account_no is None or not product_nos:
+        raise SystemExit('마스터 계정과 상품 데이터가 필요합니다. --seed 로 데이터를 먼저 넣으세요.')
+
+    # 상품 등록은 셀러 로그인으로 받은 토큰으로 요청한다.
+    registration_sellers = []
+    for seller in login_sellers[:REGISTRATION_SELLER_COUNT]:
+        response = requests.post(
+            f'{base_url}/seller/login',
+            json={'login_id': seller['login_id'], 'password': SEED_PASSWORD},
+            timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code == 200:
+            registration_sellers.append({
+                'token': response.json()['token'],
+                'first_category_ids': first_categories.get(seller['product_sort_id'], [])
+            })
+
+    return {
+        'master_token': make_token(master_account_no),
+        'product_nos': product_nos,
+        'login_ids': [seller['login_id'] for seller in login_sellers],
+        'registration_sellers': [seller for seller in registration_sellers if seller['first_category_ids']],
+        'color_filter_ids': color_filter_ids,
+        'style_filter_ids': style_filter_ids,
+        'registration_image': make_registration_image(),
+        'rng': rng,
+    }
+
+
+def make_request(scenario, fixtures, index):
+
+    """ 시나리오의 index 번째 요청을 만든다
+
+    Returns:
+        (method, path, requests 인자 dict)
+    """
+    master_headers = {'Authorization': fixtures['master_token']}
+    product_nos = fixtures['product_nos']
+
+    if scenario == 'seller_list':
+        return 'GET', '/seller', {'params': SELLER_LIST_PARAMS[index % len(SELLER_LIST_PARAMS)], 'headers': master_headers}
+
+    if scenario == 'product_list':
+        return 'GET', '/product', {'params': PRODUCT_LIST_PARAMS[index % len(PRODUCT_LIST_PARAMS)], 'headers': master_headers}
+
+    if scenario == 'product_detail':
+        return 'GET', f'/product/{product_nos[index % len(product_nos)]}', {'headers': master_headers}
+
+    if scenario == 'product_details':
+        start = index * PRODUCT_DETAILS_BATCH % len(product_nos)
+        ids = (product_nos * 2)[start:start + min(PRODUCT_DETAILS_BATCH, len(product_nos))]
+        return 'GET', '/product/details', {'params': {'ids': ','.join(map(str, ids))}, 'headers': master_headers}
+
+    if scenario == 'event_list':
+        return 'GET', '/event', {'params': EVENT_LIST_PARAMS[index % len(EVENT_LIST_PARAMS)], 'headers': master_headers}
+
+    if scenario == 'login':
+        login_ids = fixtures['login_ids']
+        return 'POST', '/seller/login', {'json': {'login_id': login_ids[index % len(login_ids)], 'password': SEED_PASSWORD}}
+
+    if scenario == 'product_registration':
+        seller = fixtures['registration_sellers'][index % len(fixtures['registration_sellers'])]
+        rng = fixtures['rng']
+        discount_start_time = datetime(2020, 5, 1)
+        return 'POST', '/product', {
+            'headers': {'Authorization': seller['token']},
+            'data': {
+                'is_available': 1,
+                'is_on_display': 1,
+                'first_category_id': rng.choice(seller['first_category_ids']),
+                'name': f'벤치마크상품{index}',
+                'color_filter_id': rng.choice(fixtures['color_filter_ids']),
+                'style_filter_id': rng.choice(fixtures['style_filter_ids']),
+                'long_description': f'<p>벤치마크상품{index} 상세설명</p>',
+                'stock': 100,
+                'price': 10000,
+                'discount_rate': 10,
+                'discount_start_time': discount_start_time.strftime(DISCOUNT_TIME_FORMAT),
+                'discount_end_time': (discount_start_time + timedelta(days=7)).strftime(DISCOUNT_TIME_FORMAT),
+                'min_unit': 1,
+                'max_unit': 20,
+            },
+            'files': {'image_file_1': (f'benchmark_{index}.jpg', fixtures['registration_image'], 'image/jpeg')},
+        }
+
+    raise ValueError(f'UNKNOWN_SCENARIO: {scenario}')
+
+
+def get_skip_reason(scenario, fixtures, s3_endpoint_url):
+    if scenario == 'login' and not fixtures['login_ids']:
+        return '로그인할 수 있는 시드 셀러가 없습니다.'
+    if scenario == 'product_registration':
+        if not s3_endpoint_url:
+            return '실제 s3 에 올리지 않도록 --s3-endpoint-url 이 있을 때만 실행합니다.'
+        if not fixtures['registration_sellers']:
+            return '상품을 등록할 셀러 토큰을 받지 못했습니다.'
+    return None
+
+
+def percentile(sorted_values, percent):
+    # nearest-rank 퍼센타일
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(base_url, scenario, fixtures, concurrency, request_count, warmup_count):
+
+    """ 시나리오 요청을 concurrency 개의 스레드에서 동시에 보내고 응답 시간을 측정한다
+
+    스레드마다 keep-alive 세션을 하나씩 사용한다. 워밍업 요청은 측정에서 뺀다.
+    4xx, 5xx 응답이나 연결 오류는 에러로 세고, 응답 시간은 에러를 포함해서 계산한다.
+
+    Args:
+        base_url: 앱 서버 주소
+        scenario: 시나리오 이름
+        fixtures: load_fixtures 결과
+        concurrency: 동시 요청 수
+        request_count: 측정할 요청 수
+        warmup_count: 측정 전에 보내는 요청 수
+
+    Returns:
+        {'requests', 'errors', 'status_codes', 'duration_seconds', 'throughput_rps', 'mean_ms', 'p50_ms', ...}
+    """
+    local = threading.local()
+    counter = itertools.count()
+    lock = threading.Lock()
+    timings = []
+    status_codes = {}
+    errors = []
+
+    def send(index):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        method, path, options = make_request(scenario, fixtures, index)
+        started_at = time.perf_counter()
+        try:
+            response = session.request(method, f'{base_url}{path}', timeout=REQUEST_TIMEOUT, **options)
+            status_code = response.status_code
+            error = response.text[:200] if status_code >= 400 else None
+
+        except requests.RequestException as e:
+            status_code = 'CONNECTION_ERROR'
+            error = f'{e}'
+        return (time.perf_counter() - started_at) * 1000, status_code, error
+
+    def worker(total, record):
+        while True:
+            index = next(counter)
+            if index >= total:
+                return
+            elapsed_ms, status_code, error = send(index)
+            if record:
+                with lock:
+                    timings.append(elapsed_ms)
+                    status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + 1
+                    if error is not None:
+                        errors.append(error)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(lambda _: worker(warmup_count, False), range(concurrency)))
+
+        counter = itertools.count()
+        started_at = time.perf_counter()
+        list(executor.map(lambda _: worker(request_count, True), range(concurrency)))
+        duration = time.perf_counter() - started_at
+
+    timings.sort()
+    result = {
+        'requests': len(timings),
+        'errors': len(errors),
+        'status_codes': status_codes,
+        'duration_seconds': round(duration, 3),
+        'throughput_rps': round(len(timings) / duration, 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(timings[-1], 2),
+    }
+    for percent in LATENCY_PERCENTILES:
+        result[f'p{percent}_ms'] = round(percentile(timings, percent), 2)
+    if errors:
+        result['error_samples'] = errors[:5]
+    return result
+
+
+def fetch_server_reports(base_url, fixtures, metrics, slow_query_log):
+    # 서버에서 켠 측정 결과를 가져온다. 서버가 여러 프로세스면 응답한 프로세스의 값이다.
+    reports = {}
+    if metrics:
+        reports['metrics'] = requests.get(f'{base_url}/metrics', timeout=REQUEST_TIMEOUT).text
+    if slow_query_log:
+        response = requests.get(
+            f'{base_url}/admin/slow-queries',
+            params={'order_by': 'total', 'limit': 50},
+            headers={'Authorization': fixtures['master_token']},
+            timeout=REQUEST_TIMEOUT
+        )
+        reports['slow_queries'] = response.json()
+    return reports
+
+
+def compare_results(previous, current):
+
+    """ 이전 결과와 시나리오, 동시 요청 수별로 비교한다
+
+    Returns:
+        {시나리오: {동시 요청 수: {'p50_ms': [이전, 현재, 현재/이전], ...}}}
+    """
+    comparison = {}
+    for scenario, runs in current['results'].items():
+        for concurrency, result in runs.items():
+            previous_result = previous.get('results', {}).get(scenario, {}).get(concurrency)
+            if not previous_result or 'skipped' in result or 'skipped' in previous_result:
+                continue
+
+            comparison.setdefault(scenario, {})[concurrency] = {
+                key: [
+                    previous_result[key],
+                    result[key],
+                    round(result[key] / previous_result[key], 3) if previous_result[key] else None
+                ]
+                for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')
+            }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엔드포인트 부하 벤치마크')
+    parser.add_argument('--base-url', help='이미 실행 중인 앱 서버 주소 (없으면 create_app() 으로 서버를 띄움)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5005)
+    parser.add_argument('--load-schema', action='store_true', help='스키마 파일과 마이그레이션 적용 (데이터베이스를 새로 만듦)')
+    parser.add_argument('--schema-file', default=DEFAULT_SCHEMA_FILE, help='brandi_schema_v2.4.sql 또는 db_initial.sql')
+    parser.add_argument('--mysql-client', default='mysql')
+    parser.add_argument('--seed', action='store_true', help='benchmarks.seed_data 로 데이터 생성')
+    parser.add_argument('--sellers', type=int, default=1000)
+    parser.add_argument('--products-per-seller', type=int, default=20)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--history-versions', type=int, default=2)
+    parser.add_argument('--s3-endpoint-url', default=os.environ.get('S3_ENDPOINT_URL'), help='로컬 s3 대체 서버 주소')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='1,8', help='동시 요청 수 목록 (예: 1,8,32)')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오, 동시 요청 수마다 측정할 요청 수')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--metrics', action='store_true', help='서버의 METRICS_ENABLED 를 켜고 /metrics 결과를 저장')
+    parser.add_argument('--slow-query-log', action='store_true', help='서버의 SLOW_QUERY_LOG_ENABLED 를 켜고 리포트를 저장')
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 json 파일 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 json 파일 경로')
+    args = parser.parse_args()
+
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(',') if scenario.strip()]
+    unknown_scenarios = set(scenarios) - set(SCENARIOS)
+    if unknown_scenarios:
+        raise SystemExit(f'알 수 없는 시나리오: {", ".join(sorted(unknown_scenarios))}')
+    concurrency_levels = [int(level) for level in args.concurrency.split(',')]
+
+    report = {
+        'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'settings': {
+            'scenarios': scenarios,
+            'concurrency': concurrency_levels,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'metrics': args.metrics,
+            'slow_query_log': args.slow_query_log,
+            's3_endpoint_url': args.s3_endpoint_url,
+        },
+    }
+    report['git_commit'], report['git_dirty'] = get_git_commit()
+
+    if args.load_schema:
+        report['schema_files'] = load_schema(args.schema_file, args.mysql_client)
+
+    if args.seed:
+        report['seed'] = seed_database(
+            args.sellers, args.products_per_seller, args.events, args.history_versions, args.random_seed
+        )
+
+    if args.s3_endpoint_url:
+        prepare_s3_bucket(args.s3_endpoint_url)
+
+    # 앱 서버 프로세스가 물려받을 측정 설정
+    if args.metrics:
+        os.environ['METRICS_ENABLED'] = '1'
+    if args.slow_query_log:
+        os.environ['SLOW_QUERY_LOG_ENABLED'] = '1'
+
+    server_process = None
+    base_url = args.base_url
+    if base_url is None:
+        server_process = start_server(args.host, args.port)
+        base_url = f'http://{args.host}:{args.port}'
+    report['base_url'] = base_url
+
+    try:
+        fixtures = load_fixtures(base_url, random.Random(args.random_seed))
+        report['results'] = {}
+        for scenario in scenarios:
+            runs = report['results'][scenario] = {}
+            skip_reason = get_skip_reason(scenario, fixtures, args.s3_endpoint_url)
+            for concurrency in concurrency_levels:
+                if skip_reason:
+                    runs[str(concurrency)] = {'skipped': skip_reason}
+                    continue
+
+                print(f'RUNNING {scenario} (concurrency {concurrency})')
+                runs[str(concurrency)] = run_scenario(
+                    base_url, scenario, fixtures, concurrency, args.requests, args.warmup
+                )
+
+        report.update(fetch_server_reports(base_url, fixtures, args.metrics, args.slow_query_log))
+
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.join()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous_file:
+            report['comparison'] = {
+                'previous': args.compare,
+                'results': compare_results(json.load(previous_file), report),
+            }
+
+    output = args.output or f'endpoint_benchmark_{report["git_commit"] or "unknown"}_{datetime.now():%Y%m%dT%H%M%S}.json'
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, indent=4, ensure_ascii=False)
+
+    summary = {
+        scenario: {
+            concurrency: {key: result.get(key) for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors', 'skipped') if key in result}
+            for concurrency, result in runs.items()
+        }
+        for scenario, runs in report['results'].items()
+    }
+    print(json.dumps({'output': output, 'results': summary, 'comparison': report.get('comparison')}, indent=4, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
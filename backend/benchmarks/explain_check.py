@@ -0,0 +1,468 @@
+""" DAO 쿼리 실행계획(EXPLAIN) 검사
+
+*/model/*.py 의 DAO 소스에서 execute() 로 실행되는 sql 문을 찾아서, 데이터가 들어있는 데이터베이스에 EXPLAIN 을 실행한다.
+큰 테이블을 full table scan(type = ALL) 하는 쿼리가 있으면 실패(exit code 1)한다.
+
+sql 문은 소스를 실행하지 않고 ast 로 읽어서 만든다.
+    - 문자열 변수에 += 로 붙는 검색 조건은 모두 붙인 형태(가장 넓은 검색)로 검사한다.
+    - if / elif / else 로 갈라지는 정렬, 페이지네이션 조건은 경우마다 따로 검사한다.
+    - 다른 메소드가 리턴하거나 인자로 넘겨준 sql 문도 따라간다.
+    - f-string 처럼 실행해야 알 수 있는 sql 문은 건너뛴다(skipped).
+바인딩 값은 파라미터 이름으로 추측한 예시 값을 넣는다.
+
+옵티마이저는 행이 적은 테이블은 인덱스가 있어도 full scan 을 하기 때문에
+benchmarks.seed_data 로 데이터를 넣은 데이터베이스에서 실행한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.seed_data --sellers 2000 --products-per-seller 50
+    python -m benchmarks.explain_check --min-rows 1000
+"""
+import argparse
+import ast
+import copy
+import glob
+import json
+import os
+import re
+import sys
+
+from mysql.connector.errors import Error
+
+from connection import DatabaseConnection
+
+# 검사할 DAO 소스 (backend 디렉토리 기준)
+DAO_SOURCE_PATTERN = os.path.join('*', 'model', '*.py')
+
+# 행이 적어서 full scan 해도 괜찮은 기준 데이터 테이블
+FULL_SCAN_ALLOWED_TABLES = {
+    'authorization_types',
+    'product_sorts',
+    'seller_types',
+    'seller_statuses',
+    'first_categories',
+    'second_categories',
+    'color_filters',
+    'style_filters',
+    'event_types',
+    'event_sorts',
+    'event_button_link_types',
+    'image_sizes',
+}
+
+# 분기마다 sql 문을 따로 만들 때 최대 경우의 수
+MAX_VARIANTS = 16
+
+# 이름이 _id 로 끝나지만 문자열 컬럼인 파라미터
+_STRING_ID_PARAMETERS = {'login_id', 'app_id', 'kakao_id', 'insta_id', 'yellow_id'}
+
+_PARAMETER_PATTERN = re.compile(r'%\((\w+)\)s')
+_IN_PARAMETER_PATTERN = re.compile(r'\bIN\s*%\((\w+)\)s', re.IGNORECASE)
+_COMMENT_PATTERN = re.compile(r'(--[^\n]*|#[^\n]*)')
+_TABLE_ALIAS_PATTERN = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?', re.IGNORECASE
+)
+_NOT_ALIAS_WORDS = {
+    'on', 'where', 'left', 'right', 'inner', 'outer', 'cross', 'join', 'set', 'group', 'order', 'limit',
+    'and', 'or', 'select', 'values', 'using', 'having', 'union', 'straight_join', 'natural', 'for', 'lock'
+}
+_EXPLAINABLE_PATTERN = re.compile(r'^\s*(SELECT|UPDATE|DELETE|INSERT|REPLACE)\b', re.IGNORECASE)
+
+
+class StatementExtractor:
+
+    def __init__(self, source, module_name):
+
+        """ DAO 소스에서 execute() 에 넘겨지는 sql 문을 찾는다
+
+        Args:
+            source: 파이썬 소스 문자열
+            module_name: 리포트에 표시할 모듈 이름
+        """
+        self.module_name = module_name
+        self.functions = {}
+        self._add_functions(ast.parse(source).body)
+
+        # 메소드가 리턴하는 sql 문, 메소드 인자로 넘어오는 sql 문
+        self.returns = {}
+        self.arguments = {}
+        self.statements = []
+        self.skipped = []
+
+    def _add_functions(self, statements):
+        # 메소드 안에서 정의한 함수(get_cached_count 에 넘기는 count 함수 등)는 바깥 변수가 있어야 sql 문을 알 수 있으므로
+        # 따로 실행하지 않고, 바깥 메소드를 실행할 때 그 자리에서 같이 실행한다
+        for node in statements:
+            if isinstance(node, ast.ClassDef):
+                self._add_functions(node.body)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name not in self.functions:
+                self.functions[node.name] = node
+
+    def extract(self):
+
+        """ sql 문 목록을 만든다
+
+        리턴값, 인자로 전달되는 sql 문을 먼저 모으고(몇 번 반복하면 메소드 사이의 전달이 모두 반영됨) 마지막에 execute() 를 모은다.
+
+        Returns:
+            [{'module', 'function', 'line', 'statement'}, ...]
+        """
+        for _ in range(3):
+            for function in self.functions.values():
+                self._run_function(function, record=False)
+
+        for function in self.functions.values():
+            self._run_function(function, record=True)
+
+        # 같은 sql 문은 한 번만 검사
+        unique_statements = {}
+        for statement in self.statements:
+            key = (statement['function'], ' '.join(statement['statement'].split()))
+            unique_statements.setdefault(key, statement)
+        return list(unique_statements.values())
+
+    def _run_function(self, function, record):
+        self._function_name = function.name
+        self._record = record
+
+        # 다른 메소드에서 문자열 인자로 넘겨준 값이 있으면 경우마다 실행
+        parameter_names = [argument.arg for argument in function.args.args]
+        envs = [{}]
+        for index, values in self.arguments.get(function.name, {}).items():
+            if index < len(parameter_names):
+                envs = [dict(env, **{parameter_names[index]: value}) for env in envs for value in values]
+        self._run_block(function.body, envs[:MAX_VARIANTS])
+
+    def _run_block(self, statements, envs):
+        for statement in statements:
+            envs = self._run_statement(statement, envs)
+            if not envs:
+                break
+        return envs
+
+    def _run_statement(self, statement, envs):
+        if isinstance(statement, ast.If):
+            self._collect_calls(statement.test, envs)
+            body_envs = self._run_block(statement.body, copy.deepcopy(envs))
+            if self._terminates(statement.body):
+                body_envs = []
+
+            if statement.orelse:
+                else_envs = self._run_block(statement.orelse, copy.deepcopy(envs))
+                if self._terminates(statement.orelse):
+                    else_envs = []
+            else:
+                # else 가 없는 조건은 조건이 맞는 경우(가장 넓은 검색)로 진행, 조건 안에서 리턴하면 조건이 안 맞는 경우로 진행
+                else_envs = [] if body_envs else envs
+
+            return self._dedupe(body_envs + else_envs) or envs
+
+        if isinstance(statement, (ast.For, ast.While)):
+            self._collect_calls(statement.iter if isinstance(statement, ast.For) else statement.test, envs)
+            return self._run_block(statement.body, envs) or envs
+
+        if isinstance(statement, (ast.With, ast.AsyncWith)):
+            for item in statement.items:
+                self._collect_calls(item.context_expr, envs)
+            return self._run_block(statement.body, envs)
+
+        if isinstance(statement, ast.Try):
+            result_envs = self._run_block(statement.body, envs)
+            for handler in statement.handlers:
+                self._run_block(handler.body, copy.deepcopy(envs))
+            if statement.finalbody:
+                self._run_block(statement.finalbody, copy.deepcopy(envs))
+            return result_envs
+
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # 안쪽 함수는 바깥 변수를 그대로 볼 수 있으므로 지금 상태로 실행
+            self._run_block(statement.body, copy.deepcopy(envs))
+            return envs
+
+        self._collect_calls(statement, envs)
+
+        if isinstance(statement, ast.Assign):
+            return self._assign(statement.targets, statement.value, envs)
+
+        if isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            return self._assign([statement.target], statement.value, envs)
+
+        if isinstance(statement, ast.AugAssign) and isinstance(statement.target, ast.Name):
+            name = statement.target.id
+            for env in envs:
+                value = self._evaluate(statement.value, env)
+                if isinstance(statement.op, ast.Add) and name in env and value is not None:
+                    env[name] += value
+                else:
+                    env.pop(name, None)
+            return envs
+
+        if isinstance(statement, ast.Return) and statement.value is not None:
+            self._record_return(statement.value, envs)
+
+        return envs
+
+    def _assign(self, targets, value, envs):
+        new_envs = []
+        for env in envs:
+            # a, b = self.method(...) 처럼 다른 메소드가 리턴한 sql 문을 받는 경우
+            if isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute) \
+                    and value.func.attr in self.returns:
+                for returned in self.returns[value.func.attr]:
+                    branch_env = dict(env)
+                    for target in targets:
+                        self._bind(target, returned, branch_env)
+                    new_envs.append(branch_env)
+                continue
+
+            evaluated = self._evaluate(value, env)
+            for target in targets:
+                self._bind(target, (evaluated,) if not isinstance(target, ast.Tuple) else (None,) * len(target.elts), env)
+            new_envs.append(env)
+        return self._dedupe(new_envs)[:MAX_VARIANTS]
+
+    def _bind(self, target, values, env):
+        if isinstance(target, ast.Name):
+            value = values[0] if len(values) == 1 else None
+            if value is None:
+                env.pop(target.id, None)
+            else:
+                env[target.id] = value
+            return
+
+        if isinstance(target, ast.Tuple):
+            for index, element in enumerate(target.elts):
+                if isinstance(element, ast.Name):
+                    value = values[index] if index < len(values) else None
+                    if value is None:
+                        env.pop(element.id, None)
+                    else:
+                        env[element.id] = value
+
+    def _record_return(self, value, envs):
+        elements = value.elts if isinstance(value, ast.Tuple) else [value]
+        for env in envs:
+            returned = tuple(self._evaluate(element, env) for element in elements)
+            if any(item is not None for item in returned):
+                variants = self.returns.setdefault(self._function_name, [])
+                if returned not in variants and len(variants) < MAX_VARIANTS:
+                    variants.append(returned)
+
+    def _collect_calls(self, node, envs):
+        for child in ast.walk(node):
+            if not isinstance(child, ast.Call) or not isinstance(child.func, ast.Attribute):
+                continue
+
+            # execute(sql, params) / executemany(sql, rows)
+            if child.func.attr in ('execute', 'executemany') and child.args:
+                for env in envs:
+                    statement = self._evaluate(child.args[0], env)
+                    if not self._record:
+                        continue
+                    if statement is None:
+                        self.skipped.append({
+                            'module': self.module_name,
+                            'function': self._function_name,
+                            'line': child.lineno
+                        })
+                    else:
+                        self.statements.append({
+                            'module': self.module_name,
+                            'function': self._function_name,
+                            'line': child.lineno,
+                            'statement': statement
+                        })
+                continue
+
+            # self.method(sql, ...) 로 같은 클래스의 메소드에 sql 문을 넘기는 경우
+            if child.func.attr in self.functions:
+                for index, argument in enumerate(child.args):
+                    # 메소드 정의의 첫번째 인자는 self
+                    for env in envs:
+                        value = self._evaluate(argument, env)
+                        if value is not None:
+                            values = self.arguments.setdefault(child.func.attr, {}).setdefault(index + 1, [])
+                            if value not in values and len(values) < MAX_VARIANTS:
+                                values.append(value)
+
+    def _evaluate(self, node, env):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return env.get(node.id)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left = self._evaluate(node.left, env)
+            right = self._evaluate(node.right, env)
+            if left is not None and right is not None:
+                return left + right
+        return None
+
+    @staticmethod
+    def _terminates(statements):
+        return bool(statements) and isinstance(statements[-1], (ast.Return, ast.Raise, ast.Continue, ast.Break))
+
+    @staticmethod
+    def _dedupe(envs):
+        unique_envs = []
+        for env in envs:
+            if env not in unique_envs:
+                unique_envs.append(env)
+        return unique_envs
+
+
+def sample_value(name):
+
+    """ 파라미터 이름으로 EXPLAIN 에 넣을 예시 값을 정한다 """
+    lowered = name.lower()
+
+    # 문자열 컬럼과 비교하는 값에 숫자를 넣으면 인덱스를 못 써서 full scan 으로 잘못 보이므로 문자열 아이디는 따로 처리
+    if lowered in _STRING_ID_PARAMETERS:
+        return 'brandi'
+    if lowered in ('limit', 'fetch_limit'):
+        return 10
+    if lowered == 'offset':
+        return 0
+    if 'contact' in lowered or 'business' in lowered:
+        return '010-1234-5678'
+    if 'time' in lowered or 'period' in lowered or lowered.endswith('_at'):
+        return '2020-04-01 00:00:00'
+    if lowered.startswith('is_') or lowered.endswith(('_no', '_id', '_number', 'order', 'ranking', 'price', 'stock', 'rate', 'count')):
+        return 1
+    return 'brandi'
+
+
+def make_sample_params(statement):
+    in_parameters = set(_IN_PARAMETER_PATTERN.findall(statement))
+    params = {}
+    for name in _PARAMETER_PATTERN.findall(statement):
+        params[name] = (1, 2) if name in in_parameters else sample_value(name)
+    return params
+
+
+def get_table_aliases(statement):
+    # 별칭(PL01 등)으로 표시되는 EXPLAIN 결과의 table 을 실제 테이블 이름으로 바꾸기 위한 dict
+    aliases = {}
+    for table, alias in _TABLE_ALIAS_PATTERN.findall(_COMMENT_PATTERN.sub(' ', statement)):
+        aliases[table] = table
+        if alias and alias.lower() not in _NOT_ALIAS_WORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def get_table_rows(db_connection):
+    with db_connection as db_cursor:
+        db_cursor.execute('''
+            SELECT TABLE_NAME AS table_name, TABLE_ROWS AS table_rows
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+        ''')
+        return {row['table_name']: row['table_rows'] or 0 for row in db_cursor.fetchall()}
+
+
+def explain_statement(statement, db_connection, table_rows, min_rows, strict):
+
+    """ sql 문 하나를 EXPLAIN 해서 문제가 되는 접근 방식을 찾는다
+
+    Args:
+        statement: extract() 로 찾은 sql 문 정보
+        db_connection: DatabaseConnection 객체
+        table_rows: 테이블별 예상 행 수
+        min_rows: 이 행 수 이상인 테이블의 full scan 만 문제로 봄
+        strict: full index scan(type = index) 도 문제로 봄
+
+    Returns:
+        검사 결과 dict (status: ok, full_scan, error, skipped)
+    """
+    result = {
+        'module': statement['module'],
+        'function': statement['function'],
+        'line': statement['line'],
+    }
+
+    sql = statement['statement']
+    if not _EXPLAINABLE_PATTERN.match(_COMMENT_PATTERN.sub(' ', sql)) \
+            or (sql.lstrip()[:6].upper() == 'INSERT' and not re.search(r'\bSELECT\b', sql, re.IGNORECASE)):
+        result['status'] = 'skipped'
+        return result
+
+    aliases = get_table_aliases(sql)
+    try:
+        with db_connection as db_cursor:
+            db_cursor.execute('EXPLAIN ' + sql, make_sample_params(sql))
+            plan = db_cursor.fetchall()
+
+    except Error as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+        return result
+
+    problems = []
+    for row in plan:
+        table = aliases.get(row['table'], row['table'])
+        if not table or table.startswith('<') or table in FULL_SCAN_ALLOWED_TABLES:
+            continue
+        if table_rows.get(table, 0) < min_rows:
+            continue
+        if row['type'] == 'ALL' or (strict and row['type'] == 'index'):
+            problems.append({
+                'table': table,
+                'alias': row['table'],
+                'type': row['type'],
+                'possible_keys': row['possible_keys'],
+                'rows': row['rows'],
+                'extra': row['Extra']
+            })
+
+    result['status'] = 'full_scan' if problems else 'ok'
+    if problems:
+        result['problems'] = problems
+        result['statement'] = ' '.join(sql.split())
+    return result
+
+
+def collect_statements(base_path):
+    statements, skipped = [], []
+    for path in sorted(glob.glob(os.path.join(base_path, DAO_SOURCE_PATTERN))):
+        with open(path, encoding='utf-8') as source_file:
+            extractor = StatementExtractor(source_file.read(), os.path.relpath(path, base_path))
+        statements += extractor.extract()
+        skipped += extractor.skipped
+    return statements, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DAO 쿼리 실행계획 검사')
+    parser.add_argument('--min-rows', type=int, default=1000, help='이 행 수 이상인 테이블의 full scan 만 실패로 처리')
+    parser.add_argument('--strict', action='store_true', help='full index scan(type = index) 도 실패로 처리')
+    parser.add_argument('--path', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    args = parser.parse_args()
+
+    statements, skipped = collect_statements(args.path)
+
+    db_connection = DatabaseConnection()
+    try:
+        table_rows = get_table_rows(db_connection)
+        results = [
+            explain_statement(statement, db_connection, table_rows, args.min_rows, args.strict)
+            for statement in statements
+        ]
+        db_connection.rollback()
+
+    finally:
+        db_connection.close()
+
+    failures = [result for result in results if result['status'] in ('full_scan', 'error')]
+    report = {
+        'checked': sum(1 for result in results if result['status'] != 'skipped'),
+        'ok': sum(1 for result in results if result['status'] == 'ok'),
+        'full_scan': sum(1 for result in results if result['status'] == 'full_scan'),
+        'error': sum(1 for result in results if result['status'] == 'error'),
+        'not_explainable': sum(1 for result in results if result['status'] == 'skipped'),
+        'dynamic_sql_skipped': skipped,
+        'failures': failures
+    }
+    print(json.dumps(report, indent=4, ensure_ascii=False, default=str))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
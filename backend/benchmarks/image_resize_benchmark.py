@@ -0,0 +1,95 @@
+""" 상품 이미지 리사이즈 벤치마크
+
+기존 방식(크기마다 원본을 다시 열어서 디코딩)과 image_resizer 의 단일 디코딩 엔진을 비교한다.
+스마트폰 사진 크기의 JPEG, PNG 이미지를 메모리에서 만들어서 사용하므로 별도의 파일이 필요 없다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.image_resize_benchmark --width 4032 --height 3024 --repeat 5
+"""
+import argparse
+import io
+import json
+import statistics
+import time
+
+from PIL import Image
+
+from image_resizer import resize_image, PRODUCT_IMAGE_WIDTHS
+
+
+class UploadedImage(io.BytesIO):
+
+    """ werkzeug FileStorage 처럼 content_type 을 가진 메모리 파일 """
+
+    def __init__(self, data, content_type):
+        super().__init__(data)
+        self.content_type = content_type
+
+
+def make_sample_image(width, height, image_format):
+    # 압축률이 실제 사진과 비슷하도록 노이즈와 그라데이션을 섞어서 만든다.
+    noise = Image.effect_noise((width, height), 64).convert('RGB')
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    sample = Image.blend(noise, gradient, 0.5)
+
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        sample.save(buffer, image_format, quality=92)
+    else:
+        sample.save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def legacy_resize(image_file):
+    # 기존 ImageUpload.resize_to_big/medium/small 과 같은 방식: 크기마다 원본을 다시 디코딩
+    results = []
+    for standard_size in PRODUCT_IMAGE_WIDTHS:
+        image_file.seek(0)
+        with Image.open(image_file) as opened_image:
+            size = (int(standard_size), int(opened_image.size[1] * (standard_size / opened_image.size[0])))
+            resized_image = opened_image.resize(size)
+            buffer = io.BytesIO()
+            resized_image.save(buffer, 'png' if 'png' in image_file.content_type else 'jpeg')
+            buffer.seek(0)
+            results.append(buffer)
+    return results
+
+
+def measure(function, data, content_type, repeat):
+    timings = []
+    for _ in range(repeat):
+        image_file = UploadedImage(data, content_type)
+        started_at = time.perf_counter()
+        function(image_file)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return {
+        'mean_ms': round(statistics.mean(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='상품 이미지 리사이즈 벤치마크')
+    parser.add_argument('--width', type=int, default=4032)
+    parser.add_argument('--height', type=int, default=3024)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    report = {'width': args.width, 'height': args.height, 'repeat': args.repeat, 'results': {}}
+    for image_format, content_type in (('JPEG', 'image/jpeg'), ('PNG', 'image/png')):
+        data = make_sample_image(args.width, args.height, image_format)
+        legacy = measure(legacy_resize, data, content_type, args.repeat)
+        engine = measure(resize_image, data, content_type, args.repeat)
+        report['results'][image_format] = {
+            'file_size_bytes': len(data),
+            'legacy_three_decodes': legacy,
+            'single_decode_engine': engine,
+            'speedup': round(legacy['mean_ms'] / engine['mean_ms'], 2),
+        }
+
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+""" 응답 json 변환 벤치마크
+
+CustomJSONEncoder(표준 json)와 FastJSONEncoder(orjson)로 셀러 리스트, 상품 리스트 응답과 같은 형태의 데이터를 변환해서 비교한다.
+jsonify 와 같은 옵션(JSON_SORT_KEYS, JSON_AS_ASCII, 디버그 모드의 들여쓰기)으로 변환하고,
+두 결과를 다시 파싱했을 때 같은 값인지도 확인한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.json_encoder_benchmark --rows 100 --repeat 200
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app import CustomJSONEncoder, FastJSONEncoder
+
+SELLER_STATUSES = ('입점대기', '입점', '퇴점', '퇴점대기', '휴점')
+SELLER_TYPES = ('쇼핑몰', '마켓', '로드샵', '디자이너브랜드', '제너럴브랜드', '내셔널브랜드', '뷰티')
+
+
+def make_seller_list(rows, rng):
+    # SellerDao.get_seller_list 응답과 같은 컬럼
+    sellers = []
+    for index in range(rows):
+        seller_account_id = 100000 - index
+        sellers.append({
+            'seller_account_id': seller_account_id,
+            'login_id': f'seller_{seller_account_id}',
+            'name_en': f'brandi_seller_{seller_account_id}',
+            'name_kr': f'브랜디 셀러 {seller_account_id}',
+            'brandi_app_user_id': rng.randrange(1, 100000),
+            'seller_status': rng.choice(SELLER_STATUSES),
+            'seller_status_id': rng.randrange(1, 6),
+            'seller_type_name': rng.choice(SELLER_TYPES),
+            'site_url': f'https://www.brandi.co.kr/seller/{seller_account_id}',
+            'product_count': rng.randrange(0, 500),
+            'created_at': datetime(2019, 1, 1) + timedelta(seconds=rng.randrange(40000000)),
+            'manager_name': f'담당자{index}',
+            'manager_contact_number': f'010-{rng.randrange(1000, 10000)}-{rng.randrange(1000, 10000)}',
+            'manager_email': f'manager{index}@brandi.co.kr',
+            'product_sort_id': rng.randrange(1, 3),
+            'profile_image_url': f'https://brandi-intern.s3.amazonaws.com/profile_{seller_account_id}.png',
+            'account_no': seller_account_id + 1,
+            'action': [
+                {'name': '휴점 신청', 'seller_status_id': 5},
+                {'name': '퇴점 신청 처리', 'seller_status_id': 4}
+            ]
+        })
+    return {
+        'seller_list': sellers,
+        'seller_count': {'total_seller_count': 100000, 'filtered_seller_count': 100000},
+        'next_cursor': 'eyJkaXJlY3Rpb24iOiJuZXh0Iiwic2VsbGVyX2FjY291bnRfaWQiOjk5OTAxfQ',
+        'prev_cursor': None
+    }
+
+
+def make_product_list(rows, rng):
+    # ProductDao.get_product_list 응답과 같은 컬럼
+    products = []
+    for index in range(rows):
+        price = rng.randrange(10, 2000) * 100
+        discount_rate = Decimal(rng.choice(('0.00', '0.10', '0.25', '0.50')))
+        products.append({
+            'created_at': datetime(2019, 1, 1) + timedelta(seconds=rng.randrange(40000000)),
+            'image_url': f'https://brandi-intern.s3.amazonaws.com/product_{index}_small.jpg',
+            'product_name': f'브랜디 오버핏 셔츠 {index}',
+            'product_no': 500000 - index,
+            'seller_type_name': rng.choice(SELLER_TYPES),
+            'seller_name': f'브랜디 셀러 {rng.randrange(1, 100000)}',
+            'price': price,
+            'discount_price': Decimal(price * (1 - discount_rate)).quantize(Decimal('1')),
+            'is_available': rng.randrange(2),
+            'is_on_display': rng.randrange(2),
+            'is_discount': 1 if discount_rate > 0 else 0
+        })
+    return {
+        'product_list': products,
+        'product_count': 500000,
+        'next_cursor': 'eyJjcmVhdGVkX2F0IjoiMjAyMC0wNC0wMSAwMDowMDowMCJ9',
+        'prev_cursor': None
+    }
+
+
+def measure(encoder, payload, repeat, indent):
+    options = {'sort_keys': True, 'ensure_ascii': True}
+    if indent:
+        options.update(indent=2, separators=(', ', ': '))
+    else:
+        options.update(separators=(',', ':'))
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        encoded = json.dumps(payload, cls=encoder, **options)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return encoded, {
+        'mean_ms': round(statistics.mean(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='응답 json 변환 벤치마크')
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--indent', action='store_true', help='디버그 모드(JSONIFY_PRETTYPRINT_REGULAR)처럼 들여쓰기')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    payloads = {
+        'seller_list': make_seller_list(args.rows, rng),
+        'product_list': make_product_list(args.rows, rng),
+    }
+
+    report = {'rows': args.rows, 'repeat': args.repeat, 'indent': args.indent, 'results': {}}
+    for name, payload in payloads.items():
+        custom_encoded, custom = measure(CustomJSONEncoder, payload, args.repeat, args.indent)
+        fast_encoded, fast = measure(FastJSONEncoder, payload, args.repeat, args.indent)
+        report['results'][name] = {
+            'custom_json_encoder': custom,
+            'fast_json_encoder': fast,
+            'speedup': round(custom['mean_ms'] / fast['mean_ms'], 2),
+            'same_result': json.loads(custom_encoded) == json.loads(fast_encoded),
+        }
+
+    print(json.dumps(report, indent=4, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+""" 성능 측정용 데이터 생성
+
+brandi_schema 와 마이그레이션이 적용된 데이터베이스에 셀러, 상품, 기획전 데이터를 대량으로 넣는다.
+셀러/상품/기획전 정보는 선분이력 형태로 history_versions 개의 이력을 만들고, 마지막 이력만 최신 이력(close_time = 2037-12-31 23:59:59)이 된다.
+기존 데이터의 가장 큰 번호 다음부터 번호를 직접 지정해서 넣기 때문에 벤치마크 전용 데이터베이스에서 실행한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.seed_data --sellers 2000 --products-per-seller 50 --events 500
+"""
+import argparse
+import json
+import random
+
+from datetime import datetime, timedelta
+
+import bcrypt
+
+from connection import DatabaseConnection
+from product.model.product_dao import REBUILD_SELLER_PRODUCT_STATS_STATEMENT, REBUILD_PRODUCT_NAME_SEARCH_STATEMENT
+
+# 최신 이력의 close_time
+CURRENT_CLOSE_TIME = datetime(2037, 12, 31, 23, 59, 59)
+
+# 생성되는 데이터의 등록일시 범위
+SEED_START_TIME = datetime(2016, 7, 1)
+SEED_END_TIME = datetime(2020, 4, 1)
+
+# 생성되는 셀러 계정의 비밀번호 (벤치마크에서 로그인할 때 사용)
+SEED_PASSWORD = 'brandi-seed-1234'
+
+SEED_BATCH_SIZE = 1000
+
+
+def insert_rows(db_connection, table, columns, rows, batch_size=SEED_BATCH_SIZE):
+
+    """ 여러 행을 batch_size 개씩 multi-row INSERT 로 넣는다
+
+    Args:
+        db_connection: DatabaseConnection 객체
+        table: 테이블 이름
+        columns: 컬럼 이름 목록
+        rows: 컬럼 순서대로 값을 가진 tuple 목록
+        batch_size: 한 번에 넣을 행 수
+    """
+    insert_statement = f'''
+        INSERT INTO {table} ({", ".join(columns)})
+        VALUES ({", ".join(["%s"] * len(columns))})
+    '''
+    with db_connection as db_cursor:
+        for start in range(0, len(rows), batch_size):
+            db_cursor.executemany(insert_statement, rows[start:start + batch_size])
+            db_connection.commit()
+
+
+def get_next_no(db_connection, table, column):
+    with db_connection as db_cursor:
+        db_cursor.execute(f'SELECT COALESCE(MAX({column}), 0) + 1 AS next_no FROM {table}')
+        return db_cursor.fetchone()['next_no']
+
+
+def load_reference_data(db_connection):
+
+    """ 셀러, 상품, 기획전 데이터가 참조하는 기준 데이터(상태, 속성, 카테고리, 필터 등)를 읽어온다
+
+    Args:
+        db_connection: DatabaseConnection 객체
+
+    Returns:
+        기준 데이터 dict
+    """
+    reference = {}
+    with db_connection as db_cursor:
+        db_cursor.execute('SELECT status_no FROM seller_statuses')
+        reference['seller_status_ids'] = [row['status_no'] for row in db_cursor.fetchall()]
+
+        db_cursor.execute('SELECT seller_type_no, product_sort_id FROM seller_types')
+        reference['seller_types'] = db_cursor.fetchall()
+
+        db_cursor.execute('SELECT first_category_no, product_sort_id FROM first_categories')
+        first_categories = {}
+        for row in db_cursor.fetchall():
+            first_categories.setdefault(row['product_sort_id'], []).append(row['first_category_no'])
+        reference['first_categories'] = first_categories
+
+        db_cursor.execute('SELECT color_filter_no FROM color_filters')
+        reference['color_filter_ids'] = [row['color_filter_no'] for row in db_cursor.fetchall()]
+
+        db_cursor.execute('SELECT style_filter_no FROM style_filters')
+        reference['style_filter_ids'] = [row['style_filter_no'] for row in db_cursor.fetchall()]
+
+        db_cursor.execute('SELECT image_size_no FROM image_sizes ORDER BY image_size_no')
+        reference['image_size_ids'] = [row['image_size_no'] for row in db_cursor.fetchall()]
+
+        db_cursor.execute('SELECT event_sort_no, event_type_id FROM event_sorts')
+        reference['event_sorts'] = db_cursor.fetchall()
+
+        db_cursor.execute('SELECT MIN(account_no) AS account_no FROM accounts WHERE auth_type_id = 1')
+        reference['master_account_no'] = db_cursor.fetchone()['account_no']
+
+    return reference
+
+
+def make_history_times(created_at, history_versions, rng):
+    # 등록일시부터 SEED_END_TIME 사이에 이력 변경 시각을 만들고, 마지막 이력은 최신 이력으로 열어둔다.
+    span_seconds = max(1, int((SEED_END_TIME - created_at).total_seconds()))
+    change_times = sorted(
+        created_at + timedelta(seconds=rng.randrange(span_seconds)) for _ in range(history_versions - 1)
+    )
+    start_times = [created_at] + change_times
+    close_times = change_times + [CURRENT_CLOSE_TIME]
+    return list(zip(start_times, close_times))
+
+
+def random_time(rng):
+    span_seconds = int((SEED_END_TIME - SEED_START_TIME).total_seconds())
+    return SEED_START_TIME + timedelta(seconds=rng.randrange(span_seconds))
+
+
+def seed_sellers(db_connection, reference, seller_count, history_versions, rng):
+
+    """ 셀러 계정, 셀러 정보 이력, 담당자, 상태 변경 이력을 만든다
+
+    Returns:
+        [{'account_no', 'seller_account_no', 'product_sort_id'}, ...]
+    """
+    account_no = get_next_no(db_connection, 'accounts', 'account_no')
+    seller_account_no = get_next_no(db_connection, 'seller_accounts', 'seller_account_no')
+    seller_info_no = get_next_no(db_connection, 'seller_infos', 'seller_info_no')
+    manager_info_no = get_next_no(db_connection, 'manager_infos', 'manager_info_no')
+    password = bcrypt.hashpw(SEED_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+    accounts, seller_accounts, seller_infos, manager_infos, status_histories, sellers = [], [], [], [], [], []
+    for index in range(seller_count):
+        created_at = random_time(rng)
+        seller_type = rng.choice(reference['seller_types'])
+        seller_status_id = rng.choice(reference['seller_status_ids'])
+        login_id = f'seed_seller_{account_no}'
+
+        accounts.append((account_no, 2, login_id, password))
+        seller_accounts.append((seller_account_no, account_no, created_at))
+
+        for start_time, close_time in make_history_times(created_at, history_versions, rng):
+            seller_infos.append((
+                seller_info_no, seller_account_no, seller_status_id, seller_type['seller_type_no'],
+                seller_type['product_sort_id'], f'시드셀러{seller_account_no}', f'seed_seller_{seller_account_no}',
+                f'https://seed-seller-{seller_account_no}.brandi.co.kr', f'02-{rng.randrange(1000, 9999)}-{rng.randrange(1000, 9999)}',
+                account_no, start_time, close_time
+            ))
+            manager_infos.append((
+                manager_info_no, f'담당자{seller_account_no}', f'010-{rng.randrange(1000, 9999)}-{rng.randrange(1000, 9999)}',
+                f'manager{seller_account_no}@brandi.co.kr', seller_info_no, 1
+            ))
+            seller_info_no += 1
+            manager_info_no += 1
+
+        status_histories.append((seller_account_no, created_at, seller_status_id, account_no))
+        sellers.append({
+            'account_no': account_no,
+            'seller_account_no': seller_account_no,
+            'product_sort_id': seller_type['product_sort_id']
+        })
+        account_no += 1
+        seller_account_no += 1
+
+    insert_rows(db_connection, 'accounts', ('account_no', 'auth_type_id', 'login_id', 'password'), accounts)
+    insert_rows(db_connection, 'seller_accounts', ('seller_account_no', 'account_id', 'created_at'), seller_accounts)
+    insert_rows(db_connection, 'seller_infos', (
+        'seller_info_no', 'seller_account_id', 'seller_status_id', 'seller_type_id', 'product_sort_id', 'name_kr',
+        'name_en', 'site_url', 'center_number', 'modifier', 'start_time', 'close_time'
+    ), seller_infos)
+    insert_rows(db_connection, 'manager_infos', (
+        'manager_info_no', 'name', 'contact_number', 'email', 'seller_info_id', 'ranking'
+    ), manager_infos)
+    insert_rows(db_connection, 'seller_status_change_histories', (
+        'seller_account_id', 'changed_time', 'seller_status_id', 'modifier'
+    ), status_histories)
+    return sellers
+
+
+def seed_products(db_connection, reference, sellers, products_per_seller, history_versions, rng):
+
+    """ 셀러마다 상품, 상품 정보 이력, 상품 이미지(크기별), 태그를 만든다
+
+    Returns:
+        만든 상품 번호 목록
+    """
+    product_no = get_next_no(db_connection, 'products', 'product_no')
+    product_info_no = get_next_no(db_connection, 'product_infos', 'product_info_no')
+
+    products, product_infos, product_images, product_tags, product_nos = [], [], [], [], []
+    for seller in sellers:
+        first_category_ids = reference['first_categories'].get(seller['product_sort_id']) \
+            or [category_id for category_ids in reference['first_categories'].values() for category_id in category_ids]
+
+        for _ in range(products_per_seller):
+            created_at = random_time(rng)
+            products.append((product_no, seller['account_no'], created_at))
+            product_nos.append(product_no)
+
+            for start_time, close_time in make_history_times(created_at, history_versions, rng):
+                product_infos.append((
+                    product_info_no, product_no, seller['seller_account_no'], rng.randrange(2), rng.randrange(2),
+                    seller['product_sort_id'], rng.choice(first_category_ids), f'시드상품{product_no}',
+                    rng.choice(reference['color_filter_ids']), rng.choice(reference['style_filter_ids']),
+                    f'<p>시드상품{product_no} 상세설명</p>', rng.randrange(0, 1000), rng.randrange(10, 2000) * 100,
+                    rng.choice((0, 0, 0, 0.1, 0.2, 0.5)), seller['account_no'], start_time, close_time
+                ))
+
+                for image_order in (1, 2):
+                    for image_size_id in reference['image_size_ids']:
+                        product_images.append((
+                            f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/seed/{product_info_no}_{image_order}_{image_size_id}',
+                            product_info_no, image_size_id, image_order
+                        ))
+
+                product_tags.append(('시드', product_info_no))
+                product_tags.append((f'태그{product_no % 100}', product_info_no))
+                product_info_no += 1
+
+            product_no += 1
+
+    insert_rows(db_connection, 'products', ('product_no', 'uploader', 'created_at'), products)
+    insert_rows(db_connection, 'product_infos', (
+        'product_info_no', 'product_id', 'seller_id', 'is_available', 'is_on_display', 'product_sort_id',
+        'first_category_id', 'name', 'color_filter_id', 'style_filter_id', 'long_description', 'stock', 'price',
+        'discount_rate', 'modifier', 'start_time', 'close_time'
+    ), product_infos)
+    insert_rows(db_connection, 'product_images', ('image_url', 'product_info_id', 'image_size_id', 'image_order'), product_images)
+    insert_rows(db_connection, 'product_tags', ('name', 'product_info_id'), product_tags)
+    return product_nos
+
+
+def seed_events(db_connection, reference, event_count, product_nos, history_versions, rng):
+
+    """ 기획전, 기획전 정보 이력, 기획전 상품을 만든다
+    """
+    event_no = get_next_no(db_connection, 'events', 'event_no')
+    event_info_no = get_next_no(db_connection, 'event_infos', 'event_info_no')
+
+    events, event_infos, event_products = [], [], []
+    for _ in range(event_count):
+        created_at = random_time(rng)
+        event_sort = rng.choice(reference['event_sorts'])
+        events.append((event_no, reference['master_account_no'], created_at))
+
+        for start_time, close_time in make_history_times(created_at, history_versions, rng):
+            event_start_time = created_at + timedelta(days=rng.randrange(30))
+            event_product_nos = rng.sample(product_nos, min(10, len(product_nos))) if product_nos else []
+            event_infos.append((
+                event_info_no, event_no, f'시드기획전{event_no}', rng.randrange(2), rng.randrange(2),
+                event_start_time, event_start_time + timedelta(days=rng.randrange(1, 60)),
+                event_sort['event_type_id'], event_sort['event_sort_no'], reference['master_account_no'],
+                start_time, close_time, len(event_product_nos)
+            ))
+
+            for product_order, product_no in enumerate(event_product_nos, 1):
+                event_products.append((product_order, product_no, event_info_no))
+            event_info_no += 1
+
+        event_no += 1
+
+    insert_rows(db_connection, 'events', ('event_no', 'uploader', 'created_at'), events)
+    insert_rows(db_connection, 'event_infos', (
+        'event_info_no', 'event_id', 'name', 'is_on_main', 'is_on_event', 'event_start_time', 'event_end_time',
+        'event_type_id', 'event_sort_id', 'modifier', 'start_time', 'close_time', 'product_count'
+    ), event_infos)
+    insert_rows(db_connection, 'event_detail_product_infos', ('product_order', 'product_id', 'event_info_id'), event_products)
+
+
+def seed_database(sellers=1000, products_per_seller=20, events=200, history_versions=2, random_seed=0):
+
+    """ 셀러, 상품, 기획전 데이터를 생성하고 테이블 통계를 갱신한다
+
+    Args:
+        sellers: 만들 셀러 수
+        products_per_seller: 셀러마다 만들 상품 수
+        events: 만들 기획전 수
+        history_versions: 셀러/상품/기획전 정보마다 만들 이력 수
+        random_seed: 같은 데이터를 다시 만들기 위한 seed
+
+    Returns:
+        만든 데이터 수 dict
+    """
+    rng = random.Random(random_seed)
+    db_connection = DatabaseConnection()
+    try:
+        reference = load_reference_data(db_connection)
+        seeded_sellers = seed_sellers(db_connection, reference, sellers, history_versions, rng)
+        product_nos = seed_products(db_connection, reference, seeded_sellers, products_per_seller, history_versions, rng)
+        seed_events(db_connection, reference, events, product_nos, history_versions, rng)
+
+        # DAO 를 거치지 않고 넣었으므로 셀러별 상품 수와 상품명 검색 테이블을 다시 계산
+        with db_connection as db_cursor:
+            db_cursor.execute(REBUILD_SELLER_PRODUCT_STATS_STATEMENT)
+            db_cursor.execute(REBUILD_PRODUCT_NAME_SEARCH_STATEMENT)
+        db_connection.commit()
+
+        # 옵티마이저가 늘어난 행 수를 기준으로 실행계획을 세우도록 통계 갱신
+        with db_connection as db_cursor:
+            db_cursor.execute('''
+                ANALYZE TABLE accounts, seller_accounts, seller_infos, manager_infos, seller_status_change_histories,
+                products, product_infos, product_images, product_tags, seller_product_stats, product_name_search,
+                events, event_infos, event_detail_product_infos
+            ''')
+            db_cursor.fetchall()
+
+        return {
+            'sellers': len(seeded_sellers),
+            'products': len(product_nos),
+            'events': events,
+            'history_versions': history_versions
+        }
+
+    finally:
+        db_connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='성능 측정용 데이터 생성')
+    parser.add_argument('--sellers', type=int, default=1000)
+    parser.add_argument('--products-per-seller', type=int, default=20)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--history-versions', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = seed_database(args.sellers, args.products_per_seller, args.events, args.history_versions, args.seed)
+    print(json.dumps(result, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+""" 셀러 상세 조회 벤치마크
+
+기존 방식(셀러 정보, 담당자, 셀러 상태 변경 기록을 쿼리 3번으로 조회)과
+SellerDao.get_seller_info 의 json 으로 묶은 쿼리 1번을 비교한다.
+--latency-ms 를 주면 쿼리를 실행할 때마다 그만큼 기다려서 다른 가용 영역의 데이터베이스처럼 왕복 지연을 흉내낸다.
+두 방식의 결과를 응답 json 으로 바꿨을 때 같은지도 확인한다.
+seed_data 로 데이터를 넣은 데이터베이스에서 실행한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.seller_detail_benchmark --sellers 50 --repeat 5 --latency-ms 2
+"""
+import argparse
+import json
+import statistics
+import time
+
+from app import CustomJSONEncoder
+from connection import get_db_connection
+from reference_data import get_reference_data
+from seller.model.seller_dao import SellerDao
+
+# 기존 셀러 상세 쿼리 (셀러 정보, 담당자, 셀러 상태 변경 기록)
+LEGACY_SELLER_INFO_STATEMENT = """
+    SELECT
+        seller_info_no,
+        seller_account_id,
+        profile_image_url,
+        CS03.status_no as seller_status_no,
+        CS03.name as seller_status_name,
+        CS04.seller_type_no as seller_type_no,
+        CS04.name as seller_type_name,
+        CS02.product_sort_id as product_sort_id,
+        CS05.account_no as account_no,
+        CS05.login_id as account_login_id,
+        CS06.app_user_no as brandi_app_user_no,
+        CS06.app_id as brandi_app_user_app_id,
+        name_kr,
+        name_en,
+        brandi_app_user_id,
+        ceo_name,
+        company_name,
+        business_number,
+        certificate_image_url,
+        online_business_number,
+        online_business_image_url,
+        background_image_url,
+        short_description,
+        long_description,
+        site_url,
+        insta_id,
+        center_number,
+        kakao_id,
+        yellow_id,
+        zip_code,
+        address,
+        detail_address,
+        weekday_start_time,
+        weekday_end_time,
+        weekend_start_time,
+        weekend_end_time,
+        bank_name,
+        bank_holder_name,
+        account_number
+    FROM seller_accounts AS CS01
+    INNER JOIN seller_infos AS CS02 ON CS01.seller_account_no = CS02.seller_account_id
+    INNER JOIN seller_statuses as CS03 ON CS02.seller_status_id = CS03.status_no
+    INNER JOIN seller_types as CS04 ON CS02.seller_type_id = CS04.seller_type_no
+    LEFT JOIN accounts as CS05 ON CS05.account_no = CS01.account_id AND CS05.is_deleted =0
+    LEFT JOIN brandi_app_users as CS06 ON CS02.brandi_app_user_id = CS06.app_user_no
+    WHERE
+        CS01.account_id = %(account_no)s
+        AND CS01.is_deleted = 0
+        AND CS02.close_time = '2037-12-31 23:59:59'
+"""
+
+LEGACY_MANAGER_INFOS_STATEMENT = """
+    SELECT
+        MI02.name,
+        MI02.contact_number,
+        MI02.email,
+        MI02.ranking
+    FROM seller_infos AS MI01
+    INNER JOIN manager_infos AS MI02 ON MI01.seller_info_no = MI02.seller_info_id
+    WHERE
+        seller_info_no = %(seller_info_no)s
+        AND MI02.is_deleted = 0
+    LIMIT 3
+"""
+
+LEGACY_STATUS_HISTORY_STATEMENT = """
+    SELECT
+        changed_time,
+        SH03.name as seller_status_name,
+        SH04.login_id as modifier
+    FROM seller_accounts as SH01
+    INNER JOIN seller_status_change_histories as SH02 ON SH01.seller_account_no = SH02.seller_account_id
+    INNER JOIN seller_statuses as SH03 ON SH02.seller_status_id = SH03.status_no
+    LEFT JOIN accounts as SH04 ON SH04.account_no = SH01.account_id
+    WHERE
+        SH01.seller_account_no = %(seller_account_id)s
+        AND SH04.is_deleted = 0
+    ORDER BY changed_time
+"""
+
+
+class LatencyCursor:
+
+    """ execute 호출 수(데이터베이스 왕복 수)를 세고, 호출마다 네트워크 지연을 더하는 커서 """
+
+    def __init__(self, db_cursor, latency):
+        self.db_cursor = db_cursor
+        self.latency = latency
+        self.round_trips = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.db_cursor.close()
+
+    def execute(self, statement, params=None):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.db_cursor.execute(statement, params)
+
+    def fetchone(self):
+        return self.db_cursor.fetchone()
+
+    def fetchall(self):
+        return self.db_cursor.fetchall()
+
+
+class LatencyConnection:
+
+    """ cursor() 가 LatencyCursor 를 리턴하는 커넥션 (DAO 에 그대로 넘김) """
+
+    def __init__(self, db_connection, latency):
+        self.db_connection = db_connection
+        self.latency = latency
+        self.last_cursor = None
+
+    def cursor(self):
+        self.last_cursor = LatencyCursor(self.db_connection.cursor(), self.latency)
+        return self.last_cursor
+
+
+def legacy_get_seller_info(db_connection, account_info):
+    with db_connection.cursor() as db_cursor:
+        db_cursor.execute(LEGACY_SELLER_INFO_STATEMENT, {'account_no': account_info['parameter_account_no']})
+        seller_info_result = db_cursor.fetchone()
+        if seller_info_result is None:
+            return None
+
+        db_cursor.execute(LEGACY_MANAGER_INFOS_STATEMENT, {'seller_info_no': seller_info_result['seller_info_no']})
+        seller_info_result['manager_infos'] = list(db_cursor.fetchall())
+
+        db_cursor.execute(LEGACY_STATUS_HISTORY_STATEMENT, {'seller_account_id': seller_info_result['seller_account_id']})
+        seller_info_result['seller_status_change_histories'] = list(db_cursor.fetchall())
+
+    seller_info_result['seller_types'] = get_reference_data().get('seller_types', seller_info_result.pop('product_sort_id'))[0]
+    seller_info_result['auth_type_id'] = account_info['auth_type_id']
+    return seller_info_result
+
+
+def load_account_nos(db_connection, seller_count):
+    with db_connection.cursor() as db_cursor:
+        db_cursor.execute("""
+            SELECT account_id
+            FROM seller_accounts
+            WHERE is_deleted = 0
+            ORDER BY seller_account_no DESC
+            LIMIT %(limit)s
+        """, {'limit': seller_count})
+        account_nos = [row['account_id'] for row in db_cursor.fetchall()]
+
+    if not account_nos:
+        raise SystemExit('셀러 데이터가 필요합니다. python -m benchmarks.seed_data 를 먼저 실행하세요.')
+    return account_nos
+
+
+def to_response_json(seller_info_result):
+    # 기존 쿼리는 담당자 순서를 정하지 않으므로 순위순으로 맞춰서 비교
+    if seller_info_result is not None:
+        seller_info_result = dict(seller_info_result)
+        seller_info_result['manager_infos'] = sorted(seller_info_result['manager_infos'], key=lambda manager: manager['ranking'])
+    return json.dumps(seller_info_result, cls=CustomJSONEncoder, sort_keys=True)
+
+
+def measure(get_seller_info, db_connection, account_nos, repeat):
+    timings = []
+    round_trips = 0
+    results = {}
+    for _ in range(repeat):
+        for account_no in account_nos:
+            account_info = {'parameter_account_no': account_no, 'auth_type_id': 1}
+            started_at = time.perf_counter()
+            result = get_seller_info(db_connection, account_info)
+            timings.append((time.perf_counter() - started_at) * 1000)
+            round_trips = db_connection.last_cursor.round_trips
+            results[account_no] = to_response_json(result)
+
+    timings.sort()
+    return results, {
+        'round_trips_per_request': round_trips,
+        'mean_ms': round(statistics.mean(timings), 2),
+        'p50_ms': round(timings[len(timings) // 2], 2),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='셀러 상세 조회 벤치마크')
+    parser.add_argument('--sellers', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=0, help='쿼리마다 더할 네트워크 왕복 지연(ms)')
+    args = parser.parse_args()
+
+    seller_dao = SellerDao()
+    db_connection = get_db_connection()
+    try:
+        account_nos = load_account_nos(db_connection, args.sellers)
+        latency_connection = LatencyConnection(db_connection, args.latency_ms / 1000)
+
+        # 셀러 속성 리스트는 두 방식 모두 기준 데이터 캐시에서 가져오므로 미리 읽어둠
+        get_reference_data().get('seller_types')
+
+        legacy_results, legacy = measure(legacy_get_seller_info, latency_connection, account_nos, args.repeat)
+        single_results, single = measure(
+            lambda connection, account_info: seller_dao.get_seller_info(account_info, connection),
+            latency_connection, account_nos, args.repeat
+        )
+
+    finally:
+        db_connection.close()
+
+    print(json.dumps({
+        'sellers': len(account_nos),
+        'repeat': args.repeat,
+        'latency_ms': args.latency_ms,
+        'three_queries': legacy,
+        'single_query': single,
+        'speedup': round(legacy['mean_ms'] / single['mean_ms'], 2),
+        'same_result': legacy_results == single_results,
+    }, indent=4))
+
+
+if __name__ == '__main__':
+    main()
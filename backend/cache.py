@@ -0,0 +1,169 @@
+import hashlib
+import json
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class TTLCache:
+
+    def __init__(self, maxsize=1024, ttl=60):
+
+        """ 유효시간(TTL)과 LRU 제거 정책을 가진 프로세스 메모리 캐시
+
+        저장된 값은 ttl 초가 지나면 만료되고, maxsize 를 넘으면 가장 오래 사용되지 않은 값부터 지운다.
+        여러 스레드에서 동시에 사용할 수 있도록 lock 으로 보호한다.
+        프로세스마다 따로 존재하는 캐시이므로 다른 워커의 값은 ttl 이 지나야 갱신된다.
+
+        Args:
+            maxsize: 최대 저장 개수
+            ttl: 값의 유효시간(초)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            # 최근에 사용한 값은 LRU 순서의 맨 뒤로 보낸다.
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+# login_required 에서 사용하는 계정 상태 캐시 (account_no -> {'auth_type_id', 'is_deleted'})
+account_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+def invalidate_account(account_no):
+
+    """ 계정 상태 캐시에서 해당 계정을 지운다
+
+    비밀번호 변경, 셀러 상태 변경, 계정 삭제처럼 계정 상태가 바뀌는 작업이 커밋된 후에 호출한다.
+
+    Args:
+        account_no: 계정 번호
+    """
+    account_cache.invalidate(int(account_no))
+
+
+# 리스트 API 의 검색 조건별 count 캐시 ((대상, 세대 번호, 검색 조건 해시) -> count)
+COUNT_CACHE_TTL = 30
+count_cache = TTLCache(maxsize=5000, ttl=COUNT_CACHE_TTL)
+
+# count 캐시 대상
+SELLER_COUNT = 'seller'
+PRODUCT_COUNT = 'product'
+EVENT_COUNT = 'event'
+
+# 페이지 위치, 크기처럼 count 결과와 상관없는 파라미터
+COUNT_EXCLUDED_PARAMS = {'offset', 'limit', 'fetch_limit', 'cursor', 'excel'}
+
+# 대상별 세대 번호. 쓰기가 일어나면 세대 번호를 올려서 이전 세대의 count 를 한 번에 무효화한다.
+_count_generations = {}
+_count_generations_lock = threading.Lock()
+
+
+def make_count_key(target, filters):
+
+    """ 검색 조건을 정규화해서 count 캐시 키를 만든다
+
+    페이지네이션 파라미터(offset, limit, cursor 등)와 값이 없는 조건은 빼고,
+    여러 값을 가진 조건은 정렬해서 같은 검색이면 순서와 상관없이 같은 키가 되도록 한다.
+
+    Args:
+        target: count 캐시 대상 (SELLER_COUNT, PRODUCT_COUNT, EVENT_COUNT)
+        filters: 검색 조건 dict
+
+    Returns:
+        (대상, 세대 번호, 검색 조건 해시)
+    """
+    normalized_filters = {}
+    for key, value in filters.items():
+        if key in COUNT_EXCLUDED_PARAMS or key.startswith('cursor_'):
+            continue
+        if value is None or value == '' or value == [] or value == ():
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(value, key=str)
+        normalized_filters[key] = value
+
+    filters_json = json.dumps(normalized_filters, sort_keys=True, ensure_ascii=False, default=str)
+    filters_hash = hashlib.sha1(filters_json.encode('utf-8')).hexdigest()
+
+    with _count_generations_lock:
+        generation = _count_generations.get(target, 0)
+    return target, generation, filters_hash
+
+
+def get_cached_count(target, filters, count_loader):
+
+    """ 검색 조건별 count 를 캐시에서 읽고, 없으면 count_loader 로 세어서 저장한다
+
+    키에 세대 번호가 들어있기 때문에 count 를 세는 도중에 쓰기가 일어나 무효화되면
+    오래된 값은 이전 세대 키로 저장되어 다시 읽히지 않는다.
+
+    Args:
+        target: count 캐시 대상
+        filters: 검색 조건 dict
+        count_loader: 캐시에 없을 때 count 를 세어서 리턴하는 함수
+
+    Returns:
+        count
+    """
+    key = make_count_key(target, filters)
+    count = count_cache.get(key)
+    if count is None:
+        count = count_loader()
+        count_cache.set(key, count)
+    return count
+
+
+def invalidate_counts(*targets):
+
+    """ 대상의 count 캐시를 모두 무효화한다
+
+    셀러, 상품, 기획전 쓰기 작업이 커밋된 후에 호출한다.
+    프로세스마다 따로 존재하는 캐시이므로 다른 워커 프로세스의 count 는 COUNT_CACHE_TTL 이 지나야 갱신된다.
+
+    Args:
+        targets: count 캐시 대상들
+    """
+    with _count_generations_lock:
+        for target in targets:
+            _count_generations[target] = _count_generations.get(target, 0) + 1
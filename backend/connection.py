@@ -1,18 +1,77 @@
+import os
+import threading
+import time
+
 import pymysql
 import mysql.connector
 import boto3
 
+from botocore.config import Config
 from flask import jsonify
 
 from mysql.connector.errors import InterfaceError, ProgrammingError, NotSupportedError
 from config import DATABASES, S3_CONFIG
+from connection_pool import get_pool, PoolTimeoutError
+from metrics import (
+    UNKNOWN_CALLER, is_enabled as is_metrics_enabled, find_dao_method, record_query, record_rows,
+    start_s3_call, finish_s3_call
+)
+from slow_query_log import is_enabled as is_slow_query_log_enabled, record_statement
+
+
+# 프로세스마다 하나씩 만들어서 같이 사용하는 s3 클라이언트
+_s3_client = None
+_s3_client_pid = None
+_s3_client_lock = threading.Lock()
+
+
+def _create_s3_client():
+    config_options = {
+        'max_pool_connections': S3_CONFIG.get('MAX_POOL_CONNECTIONS', 50),
+        'connect_timeout': S3_CONFIG.get('CONNECT_TIMEOUT', 5),
+        'read_timeout': S3_CONFIG.get('READ_TIMEOUT', 30),
+        'retries': {
+            'max_attempts': S3_CONFIG.get('MAX_ATTEMPTS', 3),
+            'mode': S3_CONFIG.get('RETRY_MODE', 'standard'),
+        },
+    }
+
+    # tcp keep-alive 는 이 옵션을 지원하는 botocore 버전에서만 설정한다.
+    if 'tcp_keepalive' in Config.OPTION_DEFAULTS:
+        config_options['tcp_keepalive'] = S3_CONFIG.get('TCP_KEEPALIVE', True)
+
+    # 로컬 s3 대체 서버(테스트, 벤치마크용)를 쓸 때는 환경변수나 설정으로 endpoint 를 바꿀 수 있다.
+    endpoint_url = os.environ.get('S3_ENDPOINT_URL', S3_CONFIG.get('ENDPOINT_URL'))
+
+    session = boto3.session.Session()
+    s3_client = session.client(
+        's3',
+        aws_access_key_id=S3_CONFIG['AWS_ACCESS_KEY_ID'],
+        aws_secret_access_key=S3_CONFIG['AWS_SECRET_ACCESS_KEY'],
+        region_name=S3_CONFIG['REGION_NAME'],
+        endpoint_url=endpoint_url,
+        config=Config(**config_options),
+    )
+
+    # s3 호출 시간 측정 (측정이 꺼져 있으면 핸들러가 바로 리턴한다)
+    s3_client.meta.events.register('before-call.s3', start_s3_call)
+    s3_client.meta.events.register('after-call.s3', finish_s3_call)
+    s3_client.meta.events.register('after-call-error.s3', finish_s3_call)
+    return s3_client
 
 
 def get_s3_connection():
 
     """ s3와 커넥션을 만들어주는 함수
 
-    import 되어서 사용될 때 마다 하나의 s3 커넥션이 생긴다
+    프로세스마다 처음 호출될 때 한 번만 s3 클라이언트를 만들고, 이후에는 같은 클라이언트를 리턴한다.
+    boto3 클라이언트는 여러 스레드에서 같이 사용해도 안전하고, 내부 http 커넥션 풀을 재사용한다.
+    fork 된 워커 프로세스에서는 부모의 클라이언트를 쓰지 않고 새로 만든다.
+
+    S3_CONFIG 에 아래 키를 넣어서 설정을 바꿀 수 있다.
+        MAX_POOL_CONNECTIONS(50), CONNECT_TIMEOUT(5), READ_TIMEOUT(30),
+        MAX_ATTEMPTS(3), RETRY_MODE('standard'), TCP_KEEPALIVE(True), ENDPOINT_URL(None)
+    S3_ENDPOINT_URL 환경변수가 있으면 ENDPOINT_URL 보다 우선한다.
 
     Returns:
         s3_connection 객체
@@ -23,13 +82,25 @@ def get_s3_connection():
     History:
         2020-04-01 (yoonhc@brandi.co.kr): 초기 생성
     """
-    s3_connection = boto3.client(
-        's3',
-        aws_access_key_id=S3_CONFIG['AWS_ACCESS_KEY_ID'],
-        aws_secret_access_key=S3_CONFIG['AWS_SECRET_ACCESS_KEY'],
-        region_name=S3_CONFIG['REGION_NAME'],
-    )
-    return s3_connection
+    global _s3_client, _s3_client_pid
+
+    pid = os.getpid()
+    if _s3_client is None or _s3_client_pid != pid:
+        with _s3_client_lock:
+            if _s3_client is None or _s3_client_pid != pid:
+                _s3_client = _create_s3_client()
+                _s3_client_pid = pid
+    return _s3_client
+
+
+def _reset_s3_client_after_fork():
+    global _s3_client, _s3_client_lock
+    _s3_client = None
+    _s3_client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_s3_client_after_fork)
 
 
 class DatabaseConnection:
@@ -38,8 +109,8 @@ class DatabaseConnection:
 
         """ 데이터베이스 커넥션을 만들어주는 클래스.
 
-        import 되어서 사용될 때 마다 하나의 데이터베이스 커넥션이 생긴다.
-        하나의 요청에 하나의 커넥션이라는 독립성을 지켜주기 위해서 connection 은 요청이 들어올 때 마다 만들어준다.
+        요청이 들어올 때 마다 mysql.connector 커넥션 풀에서 커넥션을 하나 빌려온다.
+        하나의 요청에 하나의 커넥션이라는 독립성은 그대로 지키고, close() 하면 커넥션을 닫는 대신 풀에 돌려준다.
 
         Returns:
             database connection 객체
@@ -53,17 +124,12 @@ class DatabaseConnection:
             2020-04-01 (leesh3@brandi.co.kr): 클래스화
 
         """
-        self.db_config = {
-            'database': DATABASES['database'],
-            'user': DATABASES['user'],
-            'password': DATABASES['password'],
-            'host': DATABASES['host'],
-            'port': DATABASES['port'],
-            'charset': DATABASES['charset'],
-            'collation': DATABASES['collation'],
-        }
+        self.pool = get_pool('mysql.connector', _create_mysql_connector_connection)
         try:
-            self.db_connection = mysql.connector.connect(**self.db_config)
+            self.db_connection = self.pool.acquire()
+
+        except PoolTimeoutError as e:
+            print(f'POOL_CHECKOUT_TIMEOUT_WITH {e}')
 
         except InterfaceError as e:
             print(f'INTERFACE_ERROR_WITH {e}')
@@ -76,7 +142,7 @@ class DatabaseConnection:
 
     def __enter__(self):
         try:
-            self.cursor = self.db_connection.cursor(buffered=True, dictionary=True)
+            self.cursor = wrap_cursor(self.db_connection.cursor(buffered=True, dictionary=True))
             return self.cursor
 
         except AttributeError as e:
@@ -90,8 +156,23 @@ class DatabaseConnection:
             print(e)
             return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
 
+    def server_side_cursor(self):
+
+        """ 결과를 클라이언트에 한 번에 받아오지 않는 (unbuffered) dictionary 커서를 리턴
+
+        fetchmany 로 필요한 만큼씩 서버에서 읽어오므로 많은 행을 읽어도 메모리 사용량이 일정하다.
+        결과를 모두 읽기 전에는 같은 커넥션으로 다른 쿼리를 실행할 수 없다.
+
+        Returns:
+            mysql.connector dictionary 커서
+        """
+        return wrap_cursor(self.db_connection.cursor(buffered=False, dictionary=True))
+
     def close(self):
-        return self.db_connection.close()
+        # 커넥션을 닫지 않고 풀에 반납한다. 두 번 호출되어도 한 번만 반납된다.
+        db_connection = self.__dict__.pop('db_connection', None)
+        if db_connection is not None:
+            self.pool.release(db_connection)
 
     def commit(self):
         return self.db_connection.commit()
@@ -100,14 +181,95 @@ class DatabaseConnection:
         return self.db_connection.rollback()
 
 
+class TimedCursor:
+
+    def __init__(self, db_cursor):
+
+        """ execute 마다 실행 시간, 실행한 DAO 메소드, 읽어온 행 수를 metrics 에 기록하는 커서
+
+        측정이나 느린 쿼리 기록이 켜져 있을 때만 wrap_cursor 로 원래 커서를 감싼다.
+        느린 쿼리 기록이 켜져 있으면 실행한 쿼리와 파라미터를 slow_query_log 에도 넘긴다.
+        execute, fetch 외의 속성(lastrowid, rowcount 등)은 원래 커서로 그대로 넘긴다.
+
+        Args:
+            db_cursor: pymysql 또는 mysql.connector 커서
+        """
+        self._cursor = db_cursor
+        self._caller = UNKNOWN_CALLER
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_trace):
+        self._cursor.close()
+
+    def __iter__(self):
+        for row in self._cursor:
+            record_rows(self._caller, 1)
+            yield row
+
+    def _record(self, statement, args, kwargs, started_at):
+        duration = time.perf_counter() - started_at
+        self._caller = find_dao_method()
+        record_query(self._caller, duration)
+
+        # 바인딩 파라미터 인자 이름은 pymysql 은 args, mysql.connector 는 params
+        params = args[0] if args else kwargs.get('args', kwargs.get('params'))
+        record_statement(statement, params, duration, self._caller)
+
+    def execute(self, statement, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return self._cursor.execute(statement, *args, **kwargs)
+        finally:
+            self._record(statement, args, kwargs, started_at)
+
+    def executemany(self, statement, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return self._cursor.executemany(statement, *args, **kwargs)
+        finally:
+            self._record(statement, args, kwargs, started_at)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            record_rows(self._caller, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        record_rows(self._caller, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        record_rows(self._caller, len(rows))
+        return rows
+
+
+def wrap_cursor(db_cursor):
+    # 측정과 느린 쿼리 기록이 모두 꺼져 있으면 원래 커서를 그대로 써서 execute 마다 드는 비용을 없앤다.
+    if is_metrics_enabled() or is_slow_query_log_enabled():
+        return TimedCursor(db_cursor)
+    return db_cursor
+
+
 def get_db_connection():
     """ 데이터베이스 커넥션 생성
 
-    import 되어서 사용될 때 마다 하나의 데이터베이스 커넥션이 생성
+    pymysql 커넥션 풀에서 커넥션을 하나 빌려온다.
+    리턴되는 객체는 pymysql 커넥션과 똑같이 사용하면 되고, close() 하면 풀에 반납된다.
 
     Returns:
         database connection 객체
 
+    Raises:
+        PoolTimeoutError: 풀에서 제한 시간 안에 커넥션을 빌리지 못한 경우
+
     Authors:
         leesh3@brandi.co.kr (이소헌)
 
@@ -115,14 +277,96 @@ def get_db_connection():
         2020-04-03 (leesh3@brandi.co.kr): 초기 생성
 
     """
-    db_config = {
-        'database': DATABASES['database'],
-        'user': DATABASES['user'],
-        'password': DATABASES['password'],
-        'host': DATABASES['host'],
-        'port': DATABASES['port'],
-        'charset': DATABASES['charset'],
-        'cursorclass': pymysql.cursors.DictCursor,
-    }
-    db = pymysql.connect(**db_config)
-    return db
+    pool = get_pool('pymysql', _create_pymysql_connection)
+    return PooledConnection(pool, pool.acquire())
+
+
+class PooledConnection:
+
+    def __init__(self, pool, connection):
+
+        """ 풀에서 빌린 pymysql 커넥션을 감싸는 클래스
+
+        cursor(), commit(), rollback() 등은 원래 커넥션으로 그대로 넘기고, close() 만 풀 반납으로 바꾼다.
+
+        Args:
+            pool: 커넥션을 빌려준 ConnectionPool 객체
+            connection: pymysql 커넥션 객체
+        """
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return wrap_cursor(self._connection.cursor(*args, **kwargs))
+
+    def __enter__(self):
+        return wrap_cursor(self._connection.__enter__())
+
+    def __exit__(self, exc_type, exc_value, exc_trace):
+        return self._connection.__exit__(exc_type, exc_value, exc_trace)
+
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool.release(connection)
+
+
+# multi-row INSERT 한 번에 넣을 최대 행 수 (max_allowed_packet 을 넘지 않도록 나눠서 실행)
+BULK_INSERT_BATCH_SIZE = 500
+
+
+def bulk_insert(db_cursor, table, columns, rows, batch_size=BULK_INSERT_BATCH_SIZE):
+
+    """ 여러 행을 multi-row INSERT 문으로 한 번에 넣는다
+
+    행마다 INSERT 를 실행하면 행 수만큼 데이터베이스 왕복이 생기므로,
+    INSERT INTO table (...) VALUES (...), (...), ... 형태로 batch_size 개씩 묶어서 실행한다.
+    커밋하지 않으므로 호출한 쪽의 트랜잭션 안에서 같이 커밋, 롤백된다.
+    pymysql, mysql.connector 커서 모두 사용할 수 있다.
+
+    Args:
+        db_cursor: 데이터베이스 커서
+        table: 테이블 이름 (코드에 고정된 값만 사용)
+        columns: 컬럼 이름 목록 (코드에 고정된 값만 사용)
+        rows: 컬럼 이름을 키로 가지는 dict 목록
+        batch_size: 한 번에 넣을 최대 행 수
+
+    Returns:
+        넣은 행 수
+    """
+    row_placeholder = f'({", ".join(["%s"] * len(columns))})'
+    for start in range(0, len(rows), batch_size):
+        batch_rows = rows[start:start + batch_size]
+        insert_statement = f"""
+            INSERT INTO {table} ({", ".join(columns)})
+            VALUES {", ".join([row_placeholder] * len(batch_rows))}
+        """
+        db_cursor.execute(insert_statement, [row[column] for row in batch_rows for column in columns])
+    return len(rows)
+
+
+def _create_mysql_connector_connection():
+    return mysql.connector.connect(
+        database=DATABASES['database'],
+        user=DATABASES['user'],
+        password=DATABASES['password'],
+        host=DATABASES['host'],
+        port=DATABASES['port'],
+        charset=DATABASES['charset'],
+        collation=DATABASES['collation'],
+    )
+
+
+def _create_pymysql_connection():
+    return pymysql.connect(
+        database=DATABASES['database'],
+        user=DATABASES['user'],
+        password=DATABASES['password'],
+        host=DATABASES['host'],
+        port=DATABASES['port'],
+        charset=DATABASES['charset'],
+        cursorclass=pymysql.cursors.DictCursor,
+    )
@@ -0,0 +1,324 @@
+import os
+import threading
+import time
+
+from config import DATABASES
+
+
+class PoolTimeoutError(Exception):
+
+    """ 커넥션 풀에서 제한 시간 안에 커넥션을 빌리지 못했을 때 발생하는 예외
+    """
+    pass
+
+
+class _PoolEntry:
+
+    """ 풀에 들어있는 커넥션 하나와 생성/사용 시각을 함께 담는 객체 """
+
+    __slots__ = ('connection', 'created_at', 'last_used_at')
+
+    def __init__(self, connection):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used_at = now
+
+
+class ConnectionPool:
+
+    def __init__(self, name, creator, min_size=0, max_size=10, max_lifetime=3600,
+                 checkout_timeout=10, ping_interval=0):
+
+        """ 최소/최대 개수가 정해진 데이터베이스 커넥션 풀
+
+        요청마다 새로 TCP 연결과 인증을 맺는 대신, 만들어 둔 커넥션을 빌려주고 돌려받는다.
+        빌려줄 때 ping 으로 살아있는지 확인하고, max_lifetime 이 지난 커넥션은 닫고 새로 만든다.
+        max_size 만큼 모두 사용중이면 checkout_timeout 초 동안 기다리고, 그래도 없으면 PoolTimeoutError 를 발생시킨다.
+        gunicorn 처럼 fork 되는 환경에서는 부모 프로세스의 소켓을 공유하지 않도록 프로세스(pid)마다 풀을 새로 만든다.
+
+        Args:
+            name: 풀 이름(통계용)
+            creator: 새 커넥션을 만들어 리턴하는 함수
+            min_size: 처음 사용할 때 미리 만들어 둘 커넥션 수
+            max_size: 동시에 열려있을 수 있는 최대 커넥션 수
+            max_lifetime: 커넥션 최대 수명(초), 0 이면 제한 없음
+            checkout_timeout: 커넥션을 빌릴 때 최대 대기 시간(초)
+            ping_interval: 마지막 사용 후 이 시간(초)이 지난 커넥션만 ping 으로 확인, 0 이면 매번 확인
+        """
+        self.name = name
+        self._creator = creator
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_lifetime = max_lifetime
+        self._checkout_timeout = checkout_timeout
+        self._ping_interval = ping_interval
+        self._reset_state()
+
+    def _reset_state(self):
+        # fork 된 자식 프로세스에서는 부모의 커넥션과 lock 을 물려받지 않고 비어있는 상태로 시작한다.
+        self._pid = os.getpid()
+        self._condition = threading.Condition(threading.Lock())
+        self._idle = []
+        self._in_use = {}
+        self._open_count = 0
+        self._filled = False
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'failed_pings': 0,
+            'expired': 0,
+        }
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    def _is_expired(self, entry):
+        if not self._max_lifetime:
+            return False
+        return time.monotonic() - entry.created_at > self._max_lifetime
+
+    def _is_alive(self, entry):
+        if time.monotonic() - entry.last_used_at < self._ping_interval:
+            return True
+        try:
+            entry.connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _close_entry(self, entry):
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def _create_entry(self):
+        entry = _PoolEntry(self._creator())
+        with self._condition:
+            self._stats['created'] += 1
+        return entry
+
+    def _fill(self):
+        # min_size 만큼 커넥션을 미리 만들어 둔다. 실패하더라도 요청 처리 중에 다시 만들 수 있으므로 무시한다.
+        with self._condition:
+            if self._filled:
+                return
+            self._filled = True
+            needed = max(0, min(self._min_size, self._max_size) - self._open_count)
+            self._open_count += needed
+
+        for _ in range(needed):
+            try:
+                entry = self._create_entry()
+            except Exception as e:
+                print(f'POOL_FILL_ERROR_WITH {e}')
+                with self._condition:
+                    self._open_count -= 1
+                continue
+            with self._condition:
+                self._idle.append(entry)
+                self._condition.notify()
+
+    def acquire(self):
+
+        """ 풀에서 커넥션을 하나 빌린다
+
+        Returns:
+            커넥션 객체
+
+        Raises:
+            PoolTimeoutError: checkout_timeout 동안 빌릴 수 있는 커넥션이 없는 경우
+        """
+        self._check_pid()
+        if not self._filled:
+            self._fill()
+
+        deadline = time.monotonic() + self._checkout_timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._open_count < self._max_size:
+                    self._open_count += 1
+                    entry = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f'{self.name} pool checkout timed out after {self._checkout_timeout}s '
+                        f'(max_size={self._max_size}, in_use={len(self._in_use)})'
+                    )
+                self._stats['waits'] += 1
+                self._condition.wait(remaining)
+
+        # 꺼낸 커넥션이 수명이 지났거나 끊어졌으면 닫고, 같은 자리에 새 커넥션을 만든다.
+        if entry is not None:
+            if self._is_expired(entry):
+                self._close_entry(entry)
+                with self._condition:
+                    self._stats['expired'] += 1
+                    self._stats['closed'] += 1
+                entry = None
+            elif not self._is_alive(entry):
+                self._close_entry(entry)
+                with self._condition:
+                    self._stats['failed_pings'] += 1
+                    self._stats['closed'] += 1
+                entry = None
+
+        if entry is None:
+            try:
+                entry = self._create_entry()
+            except Exception:
+                with self._condition:
+                    self._open_count -= 1
+                    self._condition.notify()
+                raise
+
+        with self._condition:
+            self._in_use[id(entry.connection)] = entry
+            self._stats['checkouts'] += 1
+        return entry.connection
+
+    def release(self, connection, discard=False):
+
+        """ 빌린 커넥션을 풀에 돌려준다
+
+        끝나지 않은 트랜잭션은 rollback 해서 다음 요청에 넘어가지 않도록 한다.
+        rollback 에 실패했거나 수명이 지난 커넥션, discard=True 인 경우에는 닫아버린다.
+
+        Args:
+            connection: acquire 로 빌린 커넥션 객체
+            discard: 풀에 돌려주지 않고 닫을지 여부
+        """
+        # fork 이전에 빌린 커넥션은 이 프로세스의 풀 소속이 아니므로 버린다.
+        if self._pid != os.getpid():
+            return
+
+        with self._condition:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            return
+
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._is_expired(entry):
+            self._close_entry(entry)
+            with self._condition:
+                self._open_count -= 1
+                self._stats['closed'] += 1
+                self._condition.notify()
+            return
+
+        entry.last_used_at = time.monotonic()
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def close_all(self):
+
+        """ 쉬고 있는 커넥션을 모두 닫는다 (사용중인 커넥션은 반납될 때 풀로 돌아온다) """
+        self._check_pid()
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open_count -= len(idle)
+            self._stats['closed'] += len(idle)
+            self._condition.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self):
+
+        """ 풀의 현재 상태와 누적 통계를 리턴한다
+
+        Returns:
+            {
+                'name', 'pid', 'min_size', 'max_size', 'open', 'idle', 'in_use',
+                'created', 'closed', 'checkouts', 'waits', 'timeouts', 'failed_pings', 'expired'
+            }
+        """
+        self._check_pid()
+        with self._condition:
+            stats = {
+                'name': self.name,
+                'pid': self._pid,
+                'min_size': self._min_size,
+                'max_size': self._max_size,
+                'open': self._open_count,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+            }
+            stats.update(self._stats)
+        return stats
+
+
+# 드라이버(mysql.connector, pymysql)별로 프로세스마다 하나씩 만들어지는 풀
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _reset_pools_after_fork():
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _pools.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def get_pool(name, creator):
+
+    """ 이름에 해당하는 커넥션 풀을 리턴하고, 없으면 DATABASES 설정으로 새로 만든다
+
+    풀 설정은 DATABASES 에 아래 키로 넣을 수 있고, 없으면 기본값을 사용한다.
+        pool_min_size(1), pool_max_size(10), pool_max_lifetime(3600),
+        pool_checkout_timeout(10), pool_ping_interval(0)
+
+    Args:
+        name: 풀 이름
+        creator: 새 커넥션을 만들어 리턴하는 함수
+
+    Returns:
+        ConnectionPool 객체
+    """
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = ConnectionPool(
+                name,
+                creator,
+                min_size=DATABASES.get('pool_min_size', 1),
+                max_size=DATABASES.get('pool_max_size', 10),
+                max_lifetime=DATABASES.get('pool_max_lifetime', 3600),
+                checkout_timeout=DATABASES.get('pool_checkout_timeout', 10),
+                ping_interval=DATABASES.get('pool_ping_interval', 0),
+            )
+            _pools[name] = pool
+    return pool
+
+
+def get_pool_stats():
+
+    """ 현재 프로세스에 만들어진 모든 풀의 통계를 리턴한다
+
+    Returns:
+        {풀 이름: 통계 dict}
+    """
+    return {name: pool.stats() for name, pool in list(_pools.items())}
@@ -1,6 +1,13 @@
 from flask import jsonify
 from mysql.connector.errors import Error
 
+from connection import bulk_insert
+from cache import get_cached_count, invalidate_counts, EVENT_COUNT
+from utils import make_ngram_search_phrase
+
+# multi-row INSERT 로 넣는 기획전 상품 컬럼
+EVENT_PRODUCT_COLUMNS = ('product_order', 'product_id', 'event_info_id')
+
 
 class EventDao:
     """ 기획전 모델
@@ -114,6 +121,7 @@ class EventDao:
 
                 db_cursor.execute(insert_event_detail_infos_statement, event_info)
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
 
                 return jsonify({"message": "SUCCESS"}), 200
 
@@ -226,6 +234,7 @@ class EventDao:
                 db_cursor.execute(insert_event_detail_infos_statement, event_info)
 
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
                 return jsonify({"message": "SUCCESS"}), 200
 
         except KeyError as e:
@@ -298,6 +307,7 @@ class EventDao:
                     event_end_time,
                     banner_image_url,
                     detail_image_url,
+                    product_count,
                     modifier
                 ) VALUES (
                     %(event_no)s,
@@ -310,9 +320,13 @@ class EventDao:
                     %(event_end_time)s,
                     %(banner_image_url)s,
                     %(detail_image_url)s,
+                    %(product_count)s,
                     %(account_no)s
                 )'''
 
+                # 기획전 리스트에서 상품 수를 세지 않도록 이력을 만들 때 기획전 상품 수를 같이 저장
+                event_info['product_count'] = len(event_product_info) if event_product_info else 0
+
                 db_cursor.execute(insert_event_infos_statement, event_info)
                 # execute 문 시행 후 방금 만들어진 이벤트인포 번호를 event_info 사전에 저장시킴
                 new_event_info_id = db_cursor.lastrowid
@@ -320,29 +334,19 @@ class EventDao:
                 # 상품리스트가 있으면 이벤트용 상품 테이블에 row 를 생성해줌.
                 if event_product_info:
 
-                    # for 문을 돌면서 이벤트용 상품 리스트를 해당 테이블의 row 로 생성함.
+                    # 이벤트용 상품 리스트를 한 번의 multi-row INSERT 로 해당 테이블의 row 로 생성함.
                     for product in event_product_info:
                         # 바인딩을 위해서 한개의 상품정보에 새로 생성된 이벤트인포 아이디를 넣어줌
-                        product['new_event_info_id'] = new_event_info_id
-
-                        insert_event_detail_product_infos = '''
-                        INSERT INTO event_detail_product_infos(
-                            product_order,
-                            product_id,
-                            event_info_id
-                        ) VALUES (
-                            %(product_order)s,
-                            %(product_id)s,
-                            %(new_event_info_id)s
-                        )
-                        '''
-                        db_cursor.execute(insert_event_detail_product_infos, product)
+                        product['event_info_id'] = new_event_info_id
+
+                    bulk_insert(db_cursor, 'event_detail_product_infos', EVENT_PRODUCT_COLUMNS, event_product_info)
                 # 기획전 상품이 하나이상 들어와야 하기 때문에 값이 들어오지 않으면 에러리턴.
                 else:
                     return jsonify({'message': 'MISSING_EVENT_PRODUCT'}), 400
                 
                 # 모든 row 생성이 완료되면 commit 을 해준다.        
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -415,6 +419,7 @@ class EventDao:
                     event_end_time,
                     short_description,
                     banner_image_url,
+                    product_count,
                     modifier
                 ) VALUES (
                     %(event_no)s,
@@ -427,9 +432,13 @@ class EventDao:
                     %(event_end_time)s,
                     %(short_description)s,
                     %(banner_image_url)s,
+                    %(product_count)s,
                     %(account_no)s
                 )'''
 
+                # 기획전 리스트에서 상품 수를 세지 않도록 이력을 만들 때 기획전 상품 수를 같이 저장
+                event_info['product_count'] = len(event_product_info) if event_product_info else 0
+
                 db_cursor.execute(insert_event_infos_statement, event_info)
                 # execute 문 시행 후 방금 만들어진 이벤트인포 번호를 event_info 사전에 저장시킴
                 new_event_info_id = db_cursor.lastrowid
@@ -437,29 +446,19 @@ class EventDao:
                 # 상품리스트가 있으면 이벤트용 상품 테이블에 row 를 생성해줌.
                 if event_product_info:
 
-                    # for 문을 돌면서 이벤트용 상품 리스트를 해당 테이블의 row 로 생성함.
+                    # 이벤트용 상품 리스트를 한 번의 multi-row INSERT 로 해당 테이블의 row 로 생성함.
                     for product in event_product_info:
                         # 바인딩을 위해서 한개의 상품정보에 새로 생성된 이벤트인포 아이디를 넣어줌
-                        product['new_event_info_id'] = new_event_info_id
-
-                        insert_event_detail_product_infos = '''
-                        INSERT INTO event_detail_product_infos(
-                            product_order,
-                            product_id,
-                            event_info_id
-                        ) VALUES (
-                            %(product_order)s,
-                            %(product_id)s,
-                            %(new_event_info_id)s
-                        )
-                        '''
-                        db_cursor.execute(insert_event_detail_product_infos, product)
+                        product['event_info_id'] = new_event_info_id
+
+                    bulk_insert(db_cursor, 'event_detail_product_infos', EVENT_PRODUCT_COLUMNS, event_product_info)
                 # 기획전 상품이 하나이상 들어와야 하기 때문에 값이 들어오지 않으면 에러리턴.
                 else:
                     return jsonify({'message': 'MISSING_EVENT_PRODUCT'}), 400
 
                 # 모든 row 생성이 완료되면 commit 을 해준다.
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -533,6 +532,7 @@ class EventDao:
                         banner_image_url,
                         detail_image_url,
                         youtube_url,
+                        product_count,
                         modifier
                     ) VALUES (
                         %(event_no)s,
@@ -547,38 +547,32 @@ class EventDao:
                         %(banner_image_url)s,
                         %(detail_image_url)s,
                         %(youtube_url)s,
+                        %(product_count)s,
                         %(account_no)s
                     )'''
 
+                # 기획전 리스트에서 상품 수를 세지 않도록 이력을 만들 때 기획전 상품 수를 같이 저장
+                event_info['product_count'] = len(event_product_info) if event_product_info else 0
+
                 db_cursor.execute(insert_event_infos_statement, event_info)
                 # execute 문 시행 후 방금 만들어진 이벤트인포 번호를 event_info 사전에 저장시킴
                 new_event_info_id = db_cursor.lastrowid
 
                 # 상품리스트가 있으면 이벤트용 상품 테이블에 row 를 생성해줌.
                 if event_product_info:
-                    # for 문을 돌면서 이벤트용 상품 리스트를 해당 테이블의 row 로 생성함.
+                    # 이벤트용 상품 리스트를 한 번의 multi-row INSERT 로 해당 테이블의 row 로 생성함.
                     for product in event_product_info:
                         # 바인딩을 위해서 한개의 상품정보에 새로 생성된 이벤트인포 아이디를 넣어줌
-                        product['new_event_info_id'] = new_event_info_id
-
-                        insert_event_detail_product_infos = '''
-                        INSERT INTO event_detail_product_infos(
-                            product_order,
-                            product_id,
-                            event_info_id
-                        ) VALUES (
-                            %(product_order)s,
-                            %(product_id)s,
-                            %(new_event_info_id)s
-                        )
-                        '''
-                        db_cursor.execute(insert_event_detail_product_infos, product)
+                        product['event_info_id'] = new_event_info_id
+
+                    bulk_insert(db_cursor, 'event_detail_product_infos', EVENT_PRODUCT_COLUMNS, event_product_info)
                 # 기획전 상품이 하나이상 들어와야 하기 때문에 값이 들어오지 않으면 에러리턴.
                 else:
                     return jsonify({'message': 'MISSING_EVENT_PRODUCT'}), 400
 
                 # 모든 row 생성이 완료되면 commit 을 해준다.
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -591,110 +585,6 @@ class EventDao:
             db_connection.rollback()
             return jsonify({'dao_message': 'DB_CURSOR_ERROR'}), 500
 
-    # noinspection PyMethodMayBeStatic
-    def get_event_types(self, db_connection):
-
-        """ 기획전 타입 목록 표출
-
-        기획전 전체 타입 목록을 표출합니다.
-
-        Args:
-            db_connection: 데이터베이스 커넥션 객체
-
-        Returns:
-            200: 기획전 타입 목록
-            500: INVALID_KEY, DB_CURSOR_ERROR
-
-        Authors:
-            leejm3@brandi.co.kr (이종민)
-
-        History:
-            2020-04-09 (leejm3@brandi.co.kr): 초기 생성
-
-        """
-        try:
-            with db_connection.cursor() as db_cursor:
-                select_statement = """
-                    SELECT 
-                        event_type_no as event_type_id,
-                        name as event_type_name
-                    
-                    FROM 
-                        event_types
-                    
-                    ORDER BY 
-                        event_type_no
-                """
-
-                db_cursor.execute(select_statement)
-                types = db_cursor.fetchall()
-
-                return jsonify({'event_types': types}), 200
-
-        except KeyError as e:
-            print(f'KEY_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'INVALID_KEY'}), 500
-
-        except Error as e:
-            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
-
-    # noinspection PyMethodMayBeStatic
-    def get_event_sorts(self, event_type_info, db_connection):
-
-        """ 기획전 타입별 종류 목록 표출
-
-        기획전 특정 타입별 종류 목록을 표출합니다.
-
-        Args:
-            event_type_info: 이벤트 타입 정보
-            db_connection: 데이터베이스 커넥션 객체
-
-        Returns:
-            200: 기획전 타입 목록
-            500: INVALID_KEY, DB_CURSOR_ERROR
-
-        Authors:
-            leejm3@brandi.co.kr (이종민)
-
-        History:
-            2020-04-09 (leejm3@brandi.co.kr): 초기 생성
-
-        """
-        try:
-            with db_connection.cursor() as db_cursor:
-                select_statement = """
-                    SELECT 
-                        event_sort_no as event_sort_id,
-                        name as event_sort_name
-                    
-                    FROM 
-                        event_sorts
-                    
-                    WHERE 
-                        event_type_id = %(event_type_id)s
-                    
-                    ORDER BY 
-                        event_sort_no
-                """
-
-                db_cursor.execute(select_statement, event_type_info)
-                sorts = db_cursor.fetchall()
-
-                return jsonify({'event_sorts': sorts}), 200
-
-        except KeyError as e:
-            print(f'KEY_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'INVALID_KEY'}), 500
-
-        except Error as e:
-            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
-
     # noinspection PyMethodMayBeStatic
     def get_event_infos(self, event_no, db_connection):
 
@@ -861,6 +751,69 @@ class EventDao:
             print(f'DATABASE_CURSOR_ERROR_WITH {e}')
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
+    # noinspection PyMethodMayBeStatic
+    def get_event_infos_version(self, event_no, db_connection):
+
+        """ 기획전 정보의 현재 버전 조회
+
+        기획전 정보는 수정할 때마다 새 이력(event_info_no)이 생기지만, 기획전 상품 리스트에는
+        상품과 셀러의 최신 정보(상품명, 가격, 셀러명 등)가 들어가므로 기획전 이력 번호만으로는 부족하다.
+        기획전 이력에 묶인 상품들의 최신 상품 이력 번호 합과 최신 셀러 이력 번호 합을 같이 리턴한다.
+        이력 번호는 계속 증가하기 때문에 상품이나 셀러 중 하나라도 수정되면 합이 바뀐다.
+
+        Args:
+            event_no: 기획전 번호
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            {'event_info_no', 'event_type_id', 'product_count', 'product_info_sum', 'seller_info_sum'},
+            기획전이 없거나 조회에 실패하면 None
+        """
+        try:
+            with db_connection.cursor() as db_cursor:
+                select_version_statement = """
+                    SELECT
+                        EV02.event_info_no,
+                        EV02.event_type_id,
+                        COUNT(PI01.product_info_no) as product_count,
+                        COALESCE(SUM(PI01.product_info_no), 0) as product_info_sum,
+                        COALESCE(SUM(PI05.seller_info_no), 0) as seller_info_sum
+
+                    FROM
+                        event_infos as EV02
+
+                    -- 기획전 상세상품 정보 조인
+                    LEFT JOIN
+                    event_detail_product_infos as PI02
+                    ON PI02.event_info_id = EV02.event_info_no
+
+                    -- 상품 최신 정보 조인
+                    LEFT JOIN
+                    product_infos as PI01
+                    ON PI01.product_id = PI02.product_id
+                    AND PI01.close_time = '2037-12-31 23:59:59'
+
+                    -- 셀러 최신 정보 조인
+                    LEFT JOIN
+                    seller_infos as PI05
+                    ON PI05.seller_account_id = PI01.seller_id
+                    AND PI05.close_time = '2037-12-31 23:59:59'
+
+                    WHERE
+                        EV02.event_id = %(event_no)s
+                        AND EV02.close_time = '2037-12-31 23:59:59'
+
+                    GROUP BY
+                        EV02.event_info_no,
+                        EV02.event_type_id
+                """
+                db_cursor.execute(select_version_statement, {'event_no': event_no})
+                return db_cursor.fetchone()
+
+        except Error as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            return None
+
     # noinspection PyMethodMayBeStatic
     def change_event(self, event_info, db_connection, event_product_info):
 
@@ -972,6 +925,7 @@ class EventDao:
                     long_description,
                     banner_image_url,
                     detail_image_url,
+                    product_count,
                     modifier,
                     start_time
                 ) VALUES (
@@ -987,10 +941,16 @@ class EventDao:
                     %(long_description)s,
                     %(banner_image_url)s,
                     %(detail_image_url)s,
+                    %(product_count)s,
                     %(account_no)s,
                     %(current_time)s
                 )"""
 
+                # 기획전 리스트에서 상품 수를 세지 않도록 이력을 만들 때 기획전 상품 수를 같이 저장
+                event_info['product_count'] = 0
+                if event_info['event_type_id'] in range(3, 6) and event_product_info:
+                    event_info['product_count'] = len(event_product_info)
+
                 db_cursor.execute(insert_event_infos_infostatement, event_info)
 
                 # 위에서 생성된 기획전 정보의 id 값을 가져옴
@@ -1019,28 +979,17 @@ class EventDao:
                 # 기획전 타입이 상품 / 유튜브 일 경우
                 if event_info['event_type_id'] in range(3, 6):
 
-                    # for 문을 돌면서 들어온 이벤트 상품 정보를 이벤트 상품 테이블에 생성함
+                    # 들어온 이벤트 상품 정보를 한 번의 multi-row INSERT 로 이벤트 상품 테이블에 생성함
                     for product in event_product_info:
 
-                        # 기획전 타입이 상품이미지, 상품텍스트, 유튜브일 경우 기획전 상품정보 INSERT 문
-                        insert_event_product_detail_infos_statement = '''
-                            INSERT INTO event_detail_product_infos(
-                            product_order,
-                            product_id,
-                            event_info_id
-                        ) VALUES (
-                            %(product_order)s,
-                            %(product_id)s,
-                            %(event_info_id)s
-                            )
-                        '''
-
                         # 위에서 생성된 새로운 이력의 event_info 의 no 값을 이벤트 상품 정보에 바인딩을 위해 넣어줌.
                         product['event_info_id'] = event_info_no
-                        db_cursor.execute(insert_event_product_detail_infos_statement, product)
+
+                    bulk_insert(db_cursor, 'event_detail_product_infos', EVENT_PRODUCT_COLUMNS, event_product_info)
 
                 # 데이터베이스에 모든 작업을 끝냈으면 commit 을 통해서 샐재 결과를 데이터베이스에 반영해줌.
                 db_connection.commit()
+                invalidate_counts(EVENT_COUNT)
                 return jsonify({"message": "SUCCESS"}), 200
 
         except KeyError as e:
@@ -1058,6 +1007,10 @@ class EventDao:
 
         """ 등록된 모든 이벤트 목록 표출
 
+        기획전마다 최신 이력(close_time = '2037-12-31 23:59:59')만 검색한다.
+        기획전 상품 수는 이력을 만들 때 저장해둔 event_infos.product_count 를 읽는다.
+        기획전 이름은 ngram FULLTEXT 인덱스로 후보를 좁히고 like 문으로 다시 확인한다.
+
         Args:
             event_info: 이벤트 정보
                 event_type_id: 이벤트 타입
@@ -1100,15 +1053,11 @@ class EventDao:
                         name,
                         short_description,
                         youtube_url,
-                        (
-                            SELECT COUNT(0) FROM event_detail_product_infos
-                            WHERE event_detail_product_infos.event_info_id = event_infos.event_info_no
-                            AND event_infos.close_time = '2037-12-31 23:59:59.0'
-                        ) as product_count                    
+                        product_count
                     FROM
                         event_infos
                     WHERE
-                        1=1 
+                        close_time = '2037-12-31 23:59:59'
                     """
                 filter_query_count_stmt = """
                     SELECT
@@ -1116,7 +1065,7 @@ class EventDao:
                     FROM
                         event_infos
                     WHERE
-                        1=1
+                        close_time = '2037-12-31 23:59:59'
                 """
 
                 if event_info.get('event_start_time', None):
@@ -1128,6 +1077,11 @@ class EventDao:
                     filter_query_count_stmt += " AND event_end_time < %(event_end_time)s"
 
                 if event_info.get('event_name', None):
+                    event_info['event_name_phrase'] = make_ngram_search_phrase(event_info['event_name'])
+                    if event_info['event_name_phrase']:
+                        get_event_stmt += " AND MATCH(name) AGAINST(%(event_name_phrase)s IN BOOLEAN MODE)"
+                        filter_query_count_stmt += " AND MATCH(name) AGAINST(%(event_name_phrase)s IN BOOLEAN MODE)"
+
                     get_event_stmt += " AND name LIKE %(event_name)s"
                     filter_query_count_stmt += " AND name LIKE %(event_name)s"
                     event_info['event_name'] = f"%{event_info['event_name']}%"
@@ -1141,9 +1095,12 @@ class EventDao:
                 db_cursor.execute(get_event_stmt, event_info)
                 events = db_cursor.fetchall()
 
-                db_cursor.execute(filter_query_count_stmt, event_info)
-                event_count = db_cursor.fetchone()
-                event_count = event_count['COUNT(0)']
+                def count_filtered_events():
+                    db_cursor.execute(filter_query_count_stmt, event_info)
+                    return db_cursor.fetchone()['COUNT(0)']
+
+                # 검색 조건이 같으면 페이지를 넘기거나 페이지 크기를 바꿔도 count 쿼리를 다시 실행하지 않음
+                event_count = get_cached_count(EVENT_COUNT, event_info, count_filtered_events)
                 if events:
                     return jsonify({'event_count': event_count, 'event_list': events}), 200
 
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from connection import DatabaseConnection
 
 from event.model.event_dao import EventDao
+from reference_data import get_reference_data
+from utils import make_etag, make_conditional_response
 
 
 class EventService:
@@ -134,18 +136,17 @@ class EventService:
             return jsonify({'message': f'{e}'}), 500
 
     # noinspection PyMethodMayBeStatic
-    def get_event_types(self, db_connection):
+    def get_event_types(self):
 
         """ 기획전 타입 목록 표출
 
         기획전 전체 타입 목록을 표출합니다.
-
-        Args:
-            db_connection: 데이터베이스 커넥션 객체
+        데이터베이스에 접근하지 않고 메모리에 올려둔 기준 데이터로 응답합니다.
 
         Returns:
             200: 기획전 타입 목록
-            500: DB_CURSOR_ERROR, INVALID_KEY
+            304: 클라이언트가 가진 목록이 최신인 경우
+            500: 기준 데이터를 읽어오지 못한 경우
 
         Authors:
             leejm3@brandi.co.kr (이종민)
@@ -155,27 +156,25 @@ class EventService:
 
         """
         try:
-            event_dao = EventDao()
-            types = event_dao.get_event_types(db_connection)
-
-            return types
+            return get_reference_data().make_response('event_types', 'event_types')
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
 
     # noinspection PyMethodMayBeStatic
-    def get_event_sorts(self, event_type_info, db_connection):
+    def get_event_sorts(self, event_type_info):
         """ 기획전 타입별 종류 목록 표출
 
         기획전 특정 타입별 종류 목록을 표출합니다.
+        데이터베이스에 접근하지 않고 메모리에 올려둔 기준 데이터로 응답합니다.
 
         Args:
             event_type_info: 이벤트 타입 정보
-            db_connection: 데이터베이스 커넥션 객체
 
         Returns:
             200: 기획전 타입별 종류 목록
-            500: DB_CURSOR_ERROR, INVALID_KEY
+            304: 클라이언트가 가진 목록이 최신인 경우
+            500: 기준 데이터를 읽어오지 못한 경우
 
         Authors:
             leejm3@brandi.co.kr (이종민)
@@ -186,10 +185,9 @@ class EventService:
         """
 
         try:
-            event_dao = EventDao()
-            sorts = event_dao.get_event_sorts(event_type_info, db_connection)
-
-            return sorts
+            return get_reference_data().make_response(
+                'event_sorts', 'event_sorts', int(event_type_info['event_type_id'])
+            )
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
@@ -207,6 +205,7 @@ class EventService:
 
         Returns: http 응답코드
             200: 기획전 정보
+            304: 클라이언트가 가진 기획전 정보가 최신인 경우
             400: INVALID_EVENT_NO
             500: DB_CURSOR_ERROR, INVALID_KEY
 
@@ -220,7 +219,23 @@ class EventService:
 
         event_dao = EventDao()
         try:
-            getting_event_info_result = event_dao.get_event_infos(event_no, db_connection)
+            # 이력 번호만 먼저 조회해서 클라이언트가 가진 정보가 최신이면 상세 조회 없이 304 리턴
+            # 기획전 타입명, 종류명은 기준 데이터 캐시의 ETag 로 변경 여부를 확인
+            event_version = event_dao.get_event_infos_version(event_no, db_connection)
+            etag = None
+            if event_version:
+                reference_data = get_reference_data()
+                etag = make_etag(
+                    'event',
+                    event_no,
+                    event_version,
+                    reference_data.get('event_types')[1],
+                    reference_data.get('event_sorts', event_version['event_type_id'])[1]
+                )
+
+            getting_event_info_result = make_conditional_response(
+                etag, lambda: event_dao.get_event_infos(event_no, db_connection)
+            )
             return getting_event_info_result
 
         except Exception as e:
@@ -110,6 +110,7 @@ class EventView:
 
         Returns:
             200: 기획전 정보
+            304: If-None-Match 의 ETag 가 최신 기획전 정보와 같은 경우
             400: INVALID_EVENT_NO
             500: DB_CURSOR_ERROR, INVALID_KEY, NO_DATABASE_CONNECTION
 
@@ -418,26 +419,15 @@ class EventView:
             2020-04-09 (leejm3@brandi.co.kr): 초기 생성
 
         """
+        # 기준 데이터 캐시에서 응답하므로 데이터베이스 커넥션을 빌리지 않음
         try:
-            db_connection = get_db_connection()
-            if db_connection:
-                event_service = EventService()
-                types = event_service.get_event_types(db_connection)
-                return types
-
-            else:
-                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+            event_service = EventService()
+            types = event_service.get_event_types()
+            return types
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
 
-        finally:
-            try:
-                db_connection.close()
-
-            except Exception as e:
-                return jsonify({'message': f'{e}'}), 500
-
     @event_app.route("/type/<int:event_type_id>", methods=["GET"], endpoint='get_event_sorts')
     @login_required
     @validate_params(
@@ -472,26 +462,15 @@ class EventView:
         # event_type_id 저장
         event_type_info = {"event_type_id": args[0]}
 
+        # 기준 데이터 캐시에서 응답하므로 데이터베이스 커넥션을 빌리지 않음
         try:
-            db_connection = get_db_connection()
-            if db_connection:
-                event_service = EventService()
-                sorts = event_service.get_event_sorts(event_type_info, db_connection)
-                return sorts
-
-            else:
-                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+            event_service = EventService()
+            sorts = event_service.get_event_sorts(event_type_info)
+            return sorts
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
 
-        finally:
-            try:
-                db_connection.close()
-
-            except Exception as e:
-                return jsonify({'message': f'{e}'}), 500
-
     @event_app.route("/<int:event_no>", methods=["PUT"], endpoint='change_event_infos')
     @login_required
     @validate_params(
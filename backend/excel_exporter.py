@@ -0,0 +1,294 @@
+import re
+import zipfile
+
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# s3 multipart upload 의 파트 크기 (마지막 파트를 제외하면 최소 5MB)
+S3_PART_SIZE = 8 * 1024 * 1024
+
+# http 응답으로 내보낼 때 한 번에 보내는 크기
+HTTP_CHUNK_SIZE = 64 * 1024
+
+# xml 에 들어갈 수 없는 제어문자
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEADER_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+
+_SHEET_FOOTER_XML = '</sheetData></worksheet>'
+
+
+class XlsxStreamWriter:
+
+    def __init__(self, fp, sheet_name='Sheet1'):
+
+        """ 행 단위로 바로 써 내려가는 write-only xlsx 작성기
+
+        xlsx 는 xml 파일들을 zip 으로 묶은 형식이기 때문에, zip 을 스트림 모드로 열고
+        시트 xml 에 행을 하나씩 압축해서 fp 로 흘려보낸다.
+        행 데이터를 메모리나 임시 파일에 모아두지 않으므로 행 수와 상관없이 메모리 사용량이 일정하다.
+        문자열은 공유 문자열 테이블 없이 inline string 으로 쓴다.
+
+        Args:
+            fp: write() 가 가능한 파일 객체 (seek 가 안되는 스트림도 가능)
+            sheet_name: 시트 이름
+        """
+        self._zip = zipfile.ZipFile(fp, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._zip.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        self._zip.writestr('_rels/.rels', _ROOT_RELS_XML)
+        self._zip.writestr('xl/workbook.xml', _WORKBOOK_XML.format(sheet_name=escape(sheet_name, {'"': '&quot;'})))
+        self._zip.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+        self._zip.writestr('xl/styles.xml', _STYLES_XML)
+
+        self._sheet = self._zip.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self._sheet.write(_SHEET_HEADER_XML.encode('utf-8'))
+        self.row_count = 0
+
+    def append(self, values):
+        self.row_count += 1
+        cells = ''.join(self._to_cell(value) for value in values)
+        self._sheet.write(f'<row r="{self.row_count}">{cells}</row>'.encode('utf-8'))
+
+    def close(self):
+        self._sheet.write(_SHEET_FOOTER_XML.encode('utf-8'))
+        self._sheet.close()
+        self._zip.close()
+
+    def _to_cell(self, value):
+        if value is None:
+            return '<c/>'
+
+        if isinstance(value, bool):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+
+        if isinstance(value, (int, float, Decimal)):
+            return f'<c><v>{value}</v></c>'
+
+        if isinstance(value, datetime):
+            value = value.strftime('%Y-%m-%d %H:%M:%S')
+        elif isinstance(value, date):
+            value = value.strftime('%Y-%m-%d')
+        elif isinstance(value, bytes):
+            value = value.decode('utf-8')
+
+        text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class ChunkBuffer:
+
+    """ 작성된 바이트를 모아두었다가 drain() 할 때 꺼내주는 버퍼 (http 스트리밍용) """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.size = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        self.size += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+class S3MultipartUploadWriter:
+
+    def __init__(self, s3, bucket, key, content_type=XLSX_CONTENT_TYPE, part_size=S3_PART_SIZE):
+
+        """ s3 multipart upload 로 바로 업로드하는 파일 객체
+
+        write() 로 들어온 데이터를 part_size 만큼 모이면 파트 하나로 업로드한다.
+        로컬 디스크를 쓰지 않고, 메모리에는 최대 파트 하나 크기만 올라간다.
+        close() 하면 업로드를 완료하고, 도중에 실패하면 abort() 로 올라간 파트를 정리한다.
+
+        Args:
+            s3: s3 클라이언트
+            bucket: 버킷 이름
+            key: 업로드할 파일 이름
+            content_type: 파일 content type
+            part_size: 파트 크기
+        """
+        self._s3 = s3
+        self._bucket = bucket
+        self._key = key
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._parts = []
+        self._position = 0
+        self._upload_id = s3.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType=content_type
+        )['UploadId']
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        # 남은 데이터를 마지막 파트로 올리고 업로드 완료
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        self._s3.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts}
+        )
+
+    def abort(self):
+        try:
+            self._s3.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        except Exception as e:
+            print(f'S3_ABORT_MULTIPART_UPLOAD_FAIL_WITH {e}')
+
+    def _upload_part(self, data):
+        part_number = len(self._parts) + 1
+        response = self._s3.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+
+def write_xlsx_to_s3(s3, bucket, key, header, rows, sheet_name='Sheet1'):
+
+    """ 행을 읽어오는 대로 xlsx 로 만들어서 s3 에 multipart upload 한다
+
+    Args:
+        s3: s3 클라이언트
+        bucket: 버킷 이름
+        key: 업로드할 파일 이름
+        header: 첫 행에 들어갈 컬럼명 리스트
+        rows: 행 값 리스트를 하나씩 주는 iterable
+        sheet_name: 시트 이름
+
+    Returns:
+        작성한 데이터 행 수 (헤더 제외)
+    """
+    upload = S3MultipartUploadWriter(s3, bucket, key)
+    try:
+        xlsx_writer = XlsxStreamWriter(upload, sheet_name)
+        xlsx_writer.append(header)
+        for row in rows:
+            xlsx_writer.append(row)
+        xlsx_writer.close()
+        upload.close()
+        return xlsx_writer.row_count - 1
+
+    except Exception:
+        upload.abort()
+        raise
+
+
+def iter_xlsx(header, rows, sheet_name='Sheet1'):
+
+    """ 행을 읽어오는 대로 xlsx 바이트 조각을 만들어 주는 generator (http 스트리밍 응답용)
+
+    Args:
+        header: 첫 행에 들어갈 컬럼명 리스트
+        rows: 행 값 리스트를 하나씩 주는 iterable
+        sheet_name: 시트 이름
+
+    Returns:
+        xlsx 파일의 바이트 조각
+    """
+    buffer = ChunkBuffer()
+    xlsx_writer = XlsxStreamWriter(buffer, sheet_name)
+    xlsx_writer.append(header)
+    for row in rows:
+        xlsx_writer.append(row)
+        if buffer.size >= HTTP_CHUNK_SIZE:
+            yield buffer.drain()
+
+    xlsx_writer.close()
+    yield buffer.drain()
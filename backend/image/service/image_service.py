@@ -3,6 +3,8 @@ from connection import get_s3_connection
 from flask import jsonify
 
 from PIL import Image
+from image_resizer import resize_image
+from utils import ImageUpload
 
 
 class ImageService:
@@ -22,22 +24,9 @@ class ImageService:
         History:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
         """
-
-        standard_size = 640
-        try:
-            with Image.open(image_file) as opened_image:
-                big = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_big = opened_image.resize(big)
-                big_io = io.BytesIO()
-                image_file_form = image_file.content_type
-                if 'png' in image_file_form:
-                    resized_image_big.save(big_io, 'png')
-                if 'jpeg' in image_file_form:
-                    resized_image_big.save(big_io, 'jpeg')
-                big_io.seek(0)
-                return [big_io, str(uuid.uuid4())]
-        except:
-            return None
+        # 한 번 디코딩하는 리사이즈 엔진으로 640 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (640,))
+        return resized_images[0] if resized_images else None
 
     # 이미지 리사이즈 : medium
     def resize_to_medium(self, image_file):
@@ -54,18 +43,9 @@ class ImageService:
         History:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
         """
-        standard_size = 320
-        try:
-            with Image.open(image_file) as opened_image:
-                medium = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_medium = opened_image.resize(medium)
-                medium_io = io.BytesIO()
-                resized_image_medium.save(medium_io, "JPEG")
-                medium_io.seek(0)
-                return [medium_io, str(uuid.uuid4())]
-
-        except:
-            return None
+        # 한 번 디코딩하는 리사이즈 엔진으로 320 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (320,))
+        return resized_images[0] if resized_images else None
 
     # 이미지 리사이즈 : small
     def resize_to_small(self, image_file):
@@ -82,19 +62,9 @@ class ImageService:
         History:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
         """
-        standard_size = 120
-        try:
-            with Image.open(image_file) as opened_image:
-                small = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_small = opened_image.resize(small)
-                small_io = io.BytesIO()
-                resized_image_small.save(small_io, "JPEG")
-                small_io.seek(0)
-
-                return [small_io, str(uuid.uuid4())]
-
-        except:
-            return None
+        # 한 번 디코딩하는 리사이즈 엔진으로 120 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (120,))
+        return resized_images[0] if resized_images else None
 
     # 요청받은 상품 이미지를 리사이즈 하고 s3에 업로드
     def upload_product_image(self, request):
@@ -112,271 +82,8 @@ class ImageService:
         History:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
         """
-        # s3 연결
-        s3 = get_s3_connection()
-
-        # 리턴값이 들어갈 리스트
-        data = {
-            'image_file_1': {},
-            'image_file_2': {},
-            'image_file_3': {},
-            'image_file_4': {},
-            'image_file_5': {}
-        }
-
-        # 파일의 존재여부 확인, 이미지 순서를 파일 이름으로 받음.
-        image_file_1 = request.files.get('image_file_1', None)
-        image_file_2 = request.files.get('image_file_2', None)
-        image_file_3 = request.files.get('image_file_3', None)
-        image_file_4 = request.files.get('image_file_4', None)
-        image_file_5 = request.files.get('image_file_5', None)
-
-        # 순서1번의 이미지파일 이 존재하면 업로드하고 url을 딕셔너리에 추가
-        if image_file_1:
-            try:
-                # 들어온 파일의 사이즈와 확장자를 구함.
-                image_file_size = os.fstat(image_file_1.fileno()).st_size
-                image_file_form = image_file_1.content_type
-
-                # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-                if not ('image' in image_file_form):
-                    return jsonify({'message': 'INVALID_FILE'})
-
-                # 들어온 이미지 크기가 10MB보다 크면 request를 받지 않음.
-                if image_file_size > 10485760:
-                    return jsonify({'message': 'INVALID_IMAGE1'})
-
-                # big_size 업로드
-                big_size_buffer = self.resize_to_big(image_file_1)
-                if not big_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE33"}), 400
-                s3.put_object(Body=big_size_buffer[0], Bucket="brandi-intern", Key=big_size_buffer[1],
-                              ContentType='image/jpeg')
-                big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-                data['image_file_1']['big_size_url'] = big_size_url
-                data['image_file_1']['big_image_size_id'] = 1
-
-                # medium_size 업로드
-                medium_size_buffer = self.resize_to_medium(image_file_1)
-                if not medium_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=medium_size_buffer[0], Bucket="brandi-intern", Key=medium_size_buffer[1],
-                              ContentType='image/jpeg')
-                medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-                data['image_file_1']['medium_size_url'] = medium_size_url
-                data['image_file_1']['medium_image_size_id'] = 2
-
-                # small_size 업로드
-                small_size_buffer = self.resize_to_small(image_file_1)
-                if not small_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=small_size_buffer[0], Bucket="brandi-intern", Key=small_size_buffer[1],
-                              ContentType='image/jpeg')
-                small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-                data['image_file_1']['small_size_url'] = small_size_url
-                data['image_file_1']['small_image_size_id'] = 3
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message' : 'INVALID_REQUEST'})
-
-        # 순서2번의 이미지파일 이 존재하면 업로드하고 url을 딕셔너리에 추가
-        if image_file_2:
-            try:
-                # 들어온 파일의 사이즈와 확장자를 구함.
-                image_file_size = os.fstat(image_file_2.fileno()).st_size
-                image_file_form = image_file_2.content_type
-
-                # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-                if not ('image' in image_file_form):
-                    return jsonify({'message': 'INVALID_FILE'})
-
-                # 들어온 이미지 크기가 10MB보다 크면 request를 받지 않음.
-                if image_file_size > 10485760:
-                    return jsonify({'message': 'INVALID_IMAGE1'})
-
-                # big_size 업로드
-                big_size_buffer = self.resize_to_big(image_file_2)
-                if not big_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE2"}), 400
-                s3.put_object(Body=big_size_buffer[0], Bucket="brandi-intern", Key=big_size_buffer[1],
-                              ContentType='image/jpeg')
-                big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-                data['image_file_2']['big_size_url'] = big_size_url
-                data['image_file_2']['big_image_size_id'] = 1
-
-                # medium_size 업로드
-                medium_size_buffer = self.resize_to_medium(image_file_2)
-                if not medium_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE33"}), 400
-                s3.put_object(Body=medium_size_buffer[0], Bucket="brandi-intern", Key=medium_size_buffer[1],
-                              ContentType='image/jpeg')
-                medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-                data['image_file_2']['medium_size_url'] = medium_size_url
-                data['image_file_2']['medium_image_size_id'] = 2
-
-                # small_size 업로드
-                small_size_buffer = self.resize_to_small(image_file_2)
-                if not small_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=small_size_buffer[0], Bucket="brandi-intern", Key=small_size_buffer[1],
-                              ContentType='image/jpeg')
-                small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-                data['image_file_2']['small_size_url'] = small_size_url
-                data['image_file_2']['small_image_size_id'] = 3
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message' : 'INVALID_REQUEST'})
-
-        # 순서3번의 이미지파일 이 존재하면 업로드하고 url을 딕셔너리에 추가
-        if image_file_3:
-            try:
-                # 들어온 파일의 사이즈와 확장자를 구함.
-                image_file_size = os.fstat(image_file_3.fileno()).st_size
-                image_file_form = image_file_3.content_type
-
-                # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-                if not ('image' in image_file_form):
-                    return jsonify({'message': 'INVALID_FILE'})
-
-                # 들어온 이미지 크기가 10MB보다 크면 request를 받지 않음.
-                if image_file_size > 10485760:
-                    return jsonify({'message': 'INVALID_IMAGE1'})
-
-                # big_size 업로드
-                big_size_buffer = self.resize_to_big(image_file_3)
-                if not big_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=big_size_buffer[0], Bucket="brandi-intern", Key=big_size_buffer[1],
-                              ContentType='image/jpeg')
-                big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-                data['image_file_3']['big_size_url'] = big_size_url
-                data['image_file_3']['big_image_size_id'] = 1
-
-                # medium_size 업로드
-                medium_size_buffer = self.resize_to_medium(image_file_3)
-                if not medium_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=medium_size_buffer[0], Bucket="brandi-intern", Key=medium_size_buffer[1],
-                              ContentType='image/jpeg')
-                medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-                data['image_file_3']['medium_size_url'] = medium_size_url
-                data['image_file_3']['medium_image_size_id'] = 2
-
-                # small_size 업로드
-                small_size_buffer = self.resize_to_small(image_file_3)
-                if not small_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=small_size_buffer[0], Bucket="brandi-intern", Key=small_size_buffer[1],
-                              ContentType='image/jpeg')
-                small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-                data['image_file_3']['small_size_url'] = small_size_url
-                data['image_file_3']['small_image_size_id'] = 3
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message' : 'INVALID_REQUEST'})
-
-        # 순서4번의 이미지파일 이 존재하면 업로드하고 url을 딕셔너리에 추가
-        if image_file_4:
-            try:
-                # 들어온 파일의 사이즈와 확장자를 구함.
-                image_file_size = os.fstat(image_file_4.fileno()).st_size
-                image_file_form = image_file_4.content_type
-
-                # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-                if not ('image' in image_file_form):
-                    return jsonify({'message': 'INVALID_FILE'})
-
-                # 들어온 이미지 크기가 10MB보다 크면 request를 받지 않음.
-                if image_file_size > 10485760:
-                    return jsonify({'message': 'INVALID_IMAGE1'})
-
-                # big_size 업로드
-                big_size_buffer = self.resize_to_big(image_file_4)
-                if not big_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=big_size_buffer[0], Bucket="brandi-intern", Key=big_size_buffer[1],
-                              ContentType='image/jpeg')
-                big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-                data['image_file_4']['big_size_url'] = big_size_url
-                data['image_file_4']['big_image_size_id'] = 1
-
-                # medium_size 업로드
-                medium_size_buffer = self.resize_to_medium(image_file_4)
-                if not medium_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=medium_size_buffer[0], Bucket="brandi-intern", Key=medium_size_buffer[1],
-                              ContentType='image/jpeg')
-                medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-                data['image_file_4']['medium_size_url'] = medium_size_url
-                data['image_file_4']['medium_image_size_id'] = 2
-
-                # small_size 업로드
-                small_size_buffer = self.resize_to_small(image_file_4)
-                if not small_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=small_size_buffer[0], Bucket="brandi-intern", Key=small_size_buffer[1],
-                              ContentType='image/jpeg')
-                small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-                data['image_file_4']['small_size_url'] = small_size_url
-                data['image_file_4']['small_image_size_id'] = 3
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message' : 'INVALID_REQUEST'})
-
-        # 순서5번의 이미지파일 이 존재하면 업로드하고 url을 딕셔너리에 추가
-        if image_file_5:
-            try:
-                # 들어온 파일의 사이즈와 확장자를 구함.
-                image_file_size = os.fstat(image_file_5.fileno()).st_size
-                image_file_form = image_file_5.content_type
-
-                # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-                if not ('image' in image_file_form):
-                    return jsonify({'message': 'INVALID_FILE'})
-
-                # 들어온 이미지 크기가 10MB보다 크면 request를 받지 않음.
-                if image_file_size > 10485760:
-                    return jsonify({'message': 'INVALID_IMAGE1'})
-
-                # big_size 업로드
-                big_size_buffer = self.resize_to_big(image_file_5)
-                if not big_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=big_size_buffer[0], Bucket="brandi-intern", Key=big_size_buffer[1],
-                              ContentType='image/jpeg')
-                big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-                data['image_file_5']['big_size_url'] = big_size_url
-                data['image_file_5']['big_image_size_id'] = 1
-
-                # medium_size 업로드
-                medium_size_buffer = self.resize_to_medium(image_file_5)
-                if not medium_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=medium_size_buffer[0], Bucket="brandi-intern", Key=medium_size_buffer[1],
-                              ContentType='image/jpeg')
-                medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-                data['image_file_5']['medium_size_url'] = medium_size_url
-                data['image_file_5']['medium_image_size_id'] = 2
-
-                # small_size 업로드
-                small_size_buffer = self.resize_to_small(image_file_5)
-                if not small_size_buffer:
-                    return jsonify({"message": "INVALID_IMAGE"}), 400
-                s3.put_object(Body=small_size_buffer[0], Bucket="brandi-intern", Key=small_size_buffer[1],
-                              ContentType='image/jpeg')
-                small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-                data['image_file_5']['small_size_url'] = small_size_url
-                data['image_file_5']['small_image_size_id'] = 3
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message' : 'INVALID_REQUEST'})
-
-        return data
+        # 리사이즈 엔진과 동시 업로드 파이프라인을 사용하는 ImageUpload 에 위임
+        return ImageUpload().upload_product_image(request)
 
     # 요청받은 셀러 이미지를 s3에 업로드
     def upload_seller_image(self, request):
@@ -0,0 +1,93 @@
+import io
+import uuid
+
+from PIL import Image
+
+# 상품 이미지 크기별 가로 길이 (big, medium, small)
+PRODUCT_IMAGE_WIDTHS = (640, 320, 120)
+
+# 리사이즈 필터와 reducing_gap. reducing_gap 을 주면 큰 배율로 줄일 때 정수배 축소(reduce)를 먼저 한다.
+RESAMPLE_FILTER = Image.BICUBIC
+REDUCING_GAP = 2.0
+
+
+def get_scaled_size(size, standard_width):
+
+    """ 가로 길이를 기준으로 비율을 유지한 (가로, 세로) 크기를 구한다
+
+    Args:
+        size: 원본 이미지 (가로, 세로)
+        standard_width: 바꾸려는 가로 길이
+
+    Returns:
+        (가로, 세로)
+    """
+    return int(standard_width), max(1, int(size[1] * (standard_width / size[0])))
+
+
+def get_save_format(content_type):
+
+    """ 업로드된 파일의 content type 으로 저장할 이미지 형식을 정한다 (png 는 png, 나머지는 jpeg) """
+    if content_type and 'png' in content_type:
+        return 'PNG'
+    return 'JPEG'
+
+
+def get_save_content_type(content_type):
+
+    """ 리사이즈된 파일을 s3에 올릴 때 사용할 content type (저장한 형식에 맞춰 image/png 또는 image/jpeg) """
+    return f'image/{get_save_format(content_type).lower()}'
+
+
+def resize_image(image_file, widths=PRODUCT_IMAGE_WIDTHS):
+
+    """ 이미지를 한 번만 디코딩해서 여러 크기로 리사이즈
+
+    원본 파일은 한 번만 열고, 가장 큰 크기부터 작은 크기 순서로 바로 앞 단계의 결과를 다시 줄인다.
+    JPEG 은 draft 모드로 디코딩 단계에서 필요한 크기에 가까운 배율(1/2, 1/4, 1/8)로 읽어서
+    10MB 가 넘는 사진도 전체 해상도로 디코딩하지 않는다.
+    그 외 형식은 reducing_gap 을 사용해서 정수배 축소 후 리사이즈 한다.
+
+    Args:
+        image_file: 이미지 파일 객체 (content_type 속성이 있으면 저장 형식에 반영)
+        widths: 만들 가로 길이 목록, 큰 크기부터 순서대로
+
+    Returns:
+        [[BytesIO, uuid], ...]: widths 순서대로 리사이즈된 이미지 버퍼와 랜덤 이름
+        None: 리사이즈 실패
+    """
+    save_format = get_save_format(getattr(image_file, 'content_type', None))
+
+    try:
+        image_file.seek(0)
+        with Image.open(image_file) as opened_image:
+            original_size = opened_image.size
+            target_sizes = [get_scaled_size(original_size, width) for width in widths]
+
+            # JPEG 은 디코딩 전에 가장 큰 결과 크기 이상이 되는 배율로만 읽도록 설정
+            if opened_image.format == 'JPEG':
+                opened_image.draft(opened_image.mode, target_sizes[0])
+
+            resized_images = []
+            source_image = opened_image
+            for target_size in target_sizes:
+                resized_image = source_image.resize(target_size, RESAMPLE_FILTER, reducing_gap=REDUCING_GAP)
+
+                # jpeg 으로 저장할 수 없는 모드(RGBA, P 등)는 RGB 로 바꿔서 저장
+                if save_format == 'JPEG' and resized_image.mode not in ('RGB', 'L', 'CMYK'):
+                    resized_image = resized_image.convert('RGB')
+
+                buffer = io.BytesIO()
+                resized_image.save(buffer, save_format)
+                buffer.seek(0)
+                resized_images.append([buffer, str(uuid.uuid4())])
+
+                # 다음 크기는 방금 만든 이미지에서 줄인다.
+                source_image = resized_image
+
+            return resized_images
+
+    # 이미지를 pillow 객체로 만들지 못하는 경우 애러처리를 위해 None 을 리턴
+    except Exception as e:
+        print(f'IMAGE_RESIZE_ERROR_WITH {e}')
+        return None
@@ -0,0 +1,398 @@
+import os
+import sys
+import threading
+import time
+
+from bisect import bisect_left
+
+from flask import Response, request
+
+from connection_pool import get_pool_stats
+
+# 요청 처리 시간 histogram 버킷(초)
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 쿼리 실행 시간 histogram 버킷(초)
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# 쿼리를 실행한 DAO 메소드를 찾을 때 거슬러 올라갈 최대 프레임 수
+CALLER_FRAME_DEPTH = 12
+
+# DAO 밖(기준 데이터 캐시, CLI 등)에서 실행한 쿼리의 태그
+UNKNOWN_CALLER = 'unknown'
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 풀 통계 중 gauge(현재 값)로 내보낼 항목. 나머지는 누적 counter 로 내보낸다.
+POOL_GAUGE_KEYS = ('open', 'idle', 'in_use', 'max_size')
+POOL_COUNTER_KEYS = ('created', 'closed', 'checkouts', 'waits', 'timeouts', 'failed_pings', 'expired')
+
+# 요청 처리 스레드마다 현재 요청의 측정 값을 담아두는 곳
+_local = threading.local()
+
+# 꺼져 있으면 커서를 감싸지 않고, 요청 훅과 s3 이벤트 핸들러도 바로 리턴한다.
+_enabled = False
+
+
+class Histogram:
+
+    """ Prometheus histogram 과 같은 형태로 버킷별 개수, 합계, 개수를 모으는 객체 """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # 마지막 칸은 가장 큰 버킷보다 큰 값(+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+
+    """ 요청 하나를 처리하는 동안 쌓이는 데이터베이스, s3 사용 시간 """
+
+    __slots__ = ('started_at', 'status', 'db_seconds', 'queries', 'rows', 's3_seconds', 's3_calls', 'lock')
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.status = None
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.s3_seconds = 0.0
+        self.s3_calls = 0
+        # 상품 이미지 업로드처럼 여러 스레드에서 s3 를 호출하는 경우가 있으므로 s3 값은 lock 안에서 더한다.
+        self.lock = threading.Lock()
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+
+        """ 프로세스 안에서 요청, 쿼리, s3 호출 측정 값을 모으는 저장소
+
+        gunicorn 처럼 워커 프로세스가 여러 개면 워커마다 따로 모이고, /metrics 는 응답한 워커의 값을 보여준다.
+        """
+        self._lock = threading.Lock()
+        self._request_durations = {}
+        self._request_totals = {}
+        self._query_durations = {}
+        self._query_rows = {}
+        self._s3_totals = {}
+
+    def observe_request(self, endpoint, method, status, duration, request_metrics):
+        with self._lock:
+            histogram = self._request_durations.get((endpoint, method, status))
+            if histogram is None:
+                histogram = self._request_durations[(endpoint, method, status)] = Histogram(REQUEST_DURATION_BUCKETS)
+            histogram.observe(duration)
+
+            totals = self._request_totals.setdefault((endpoint, method), [0.0, 0, 0, 0.0, 0])
+            totals[0] += request_metrics.db_seconds
+            totals[1] += request_metrics.queries
+            totals[2] += request_metrics.rows
+            totals[3] += request_metrics.s3_seconds
+            totals[4] += request_metrics.s3_calls
+
+    def observe_query(self, caller, duration):
+        with self._lock:
+            histogram = self._query_durations.get(caller)
+            if histogram is None:
+                histogram = self._query_durations[caller] = Histogram(QUERY_DURATION_BUCKETS)
+            histogram.observe(duration)
+
+    def observe_rows(self, caller, row_count):
+        with self._lock:
+            self._query_rows[caller] = self._query_rows.get(caller, 0) + row_count
+
+    def observe_s3(self, operation, duration):
+        with self._lock:
+            totals = self._s3_totals.setdefault(operation, [0.0, 0])
+            totals[0] += duration
+            totals[1] += 1
+
+    def render(self):
+
+        """ 모은 값을 Prometheus text 형식(0.0.4)으로 만든다
+
+        Returns:
+            Prometheus text 형식 문자열
+        """
+        with self._lock:
+            request_durations = {key: _copy_histogram(value) for key, value in self._request_durations.items()}
+            request_totals = {key: list(value) for key, value in self._request_totals.items()}
+            query_durations = {key: _copy_histogram(value) for key, value in self._query_durations.items()}
+            query_rows = dict(self._query_rows)
+            s3_totals = {key: list(value) for key, value in self._s3_totals.items()}
+
+        lines = []
+        _render_histogram(
+            lines, 'brandi_http_request_duration_seconds', '요청 처리 시간',
+            ('endpoint', 'method', 'status'), request_durations
+        )
+        for index, (name, help_text) in enumerate((
+            ('brandi_http_request_db_seconds_total', '요청 처리 중 쿼리 실행 시간 합계'),
+            ('brandi_http_request_db_queries_total', '요청 처리 중 실행한 쿼리 수'),
+            ('brandi_http_request_db_rows_total', '요청 처리 중 읽어온 행 수'),
+            ('brandi_http_request_s3_seconds_total', '요청 처리 중 s3 호출 시간 합계 (동시에 호출하면 각 호출 시간을 더한 값)'),
+            ('brandi_http_request_s3_calls_total', '요청 처리 중 s3 호출 수'),
+        )):
+            _render_samples(lines, name, 'counter', help_text, (
+                (_format_labels(('endpoint', 'method'), key), totals[index])
+                for key, totals in sorted(request_totals.items())
+            ))
+
+        _render_histogram(
+            lines, 'brandi_db_query_duration_seconds', 'DAO 메소드별 쿼리 실행 시간',
+            ('dao_method',), {(caller,): histogram for caller, histogram in query_durations.items()}
+        )
+        _render_samples(lines, 'brandi_db_rows_fetched_total', 'counter', 'DAO 메소드별 읽어온 행 수', (
+            (_format_labels(('dao_method',), (caller,)), row_count)
+            for caller, row_count in sorted(query_rows.items())
+        ))
+
+        _render_samples(lines, 'brandi_s3_call_seconds_total', 'counter', 's3 작업별 호출 시간 합계', (
+            (_format_labels(('operation',), (operation,)), totals[0])
+            for operation, totals in sorted(s3_totals.items())
+        ))
+        _render_samples(lines, 'brandi_s3_calls_total', 'counter', 's3 작업별 호출 수', (
+            (_format_labels(('operation',), (operation,)), totals[1])
+            for operation, totals in sorted(s3_totals.items())
+        ))
+
+        pool_stats = sorted(get_pool_stats().items())
+        for key in POOL_GAUGE_KEYS:
+            _render_samples(lines, f'brandi_db_pool_{key}', 'gauge', f'커넥션 풀 {key}', (
+                (_format_labels(('pool',), (name,)), stats[key]) for name, stats in pool_stats
+            ))
+        for key in POOL_COUNTER_KEYS:
+            _render_samples(lines, f'brandi_db_pool_{key}_total', 'counter', f'커넥션 풀 누적 {key}', (
+                (_format_labels(('pool',), (name,)), stats[key]) for name, stats in pool_stats
+            ))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _copy_histogram(histogram):
+    copied = Histogram(histogram.buckets)
+    copied.counts = list(histogram.counts)
+    copied.sum = histogram.sum
+    copied.count = histogram.count
+    return copied
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    return ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _render_samples(lines, name, metric_type, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {metric_type}')
+    for labels, value in samples:
+        lines.append(f'{name}{{{labels}}} {_format_value(value)}')
+
+
+def _render_histogram(lines, name, help_text, label_names, histograms):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in sorted(histograms.items()):
+        labels = _format_labels(label_names, key)
+        cumulative = 0
+        for bucket, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{{labels}}} {_format_value(histogram.sum)}')
+        lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+_registry = MetricsRegistry()
+
+
+def _reset_registry_after_fork():
+    # fork 된 워커 프로세스는 부모의 값과 lock 을 물려받지 않고 비어있는 상태로 시작한다.
+    global _registry
+    _registry = MetricsRegistry()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_registry_after_fork)
+
+
+def is_enabled():
+    return _enabled
+
+
+def find_dao_method():
+
+    """ 현재 쿼리를 실행한 DAO 메소드 이름을 호출 스택에서 찾는다
+
+    *_dao.py 파일에서 self 를 가진 첫 프레임을 '클래스명.메소드명' 으로 태그한다.
+    get_cached_count 에 넘기는 함수처럼 DAO 메소드 안에서 만든 함수는 그 함수를 만든 메소드로 태그된다.
+
+    Returns:
+        'SellerDao.get_seller_list' 형태의 문자열. DAO 밖에서 실행한 쿼리는 'unknown'
+    """
+    frame = sys._getframe(1)
+    for _ in range(CALLER_FRAME_DEPTH):
+        if frame is None:
+            break
+        if frame.f_code.co_filename.endswith('_dao.py'):
+            dao = frame.f_locals.get('self')
+            if dao is not None:
+                return f'{type(dao).__name__}.{frame.f_code.co_name}'
+        frame = frame.f_back
+    return UNKNOWN_CALLER
+
+
+def record_query(caller, duration):
+
+    """ 쿼리 실행 시간을 DAO 메소드별, 현재 요청별로 기록한다
+
+    Args:
+        caller: 쿼리를 실행한 DAO 메소드 태그 (find_dao_method)
+        duration: 쿼리 실행 시간(초)
+    """
+    if not _enabled:
+        return
+    _registry.observe_query(caller, duration)
+
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is not None:
+        request_metrics.db_seconds += duration
+        request_metrics.queries += 1
+
+
+def record_rows(caller, row_count):
+    if not _enabled or not row_count:
+        return
+    _registry.observe_rows(caller, row_count)
+
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is not None:
+        request_metrics.rows += row_count
+
+
+def bind_request_metrics(function):
+
+    """ 다른 스레드에서 실행할 함수가 현재 요청의 측정 값에 기록하도록 감싼다
+
+    상품 이미지 업로드처럼 스레드 풀에서 s3 를 호출하는 작업도 요청별 s3 시간에 포함시킬 때 사용한다.
+    측정이 꺼져 있거나 요청 처리 중이 아니면 함수를 그대로 리턴한다.
+
+    Args:
+        function: 다른 스레드에서 실행할 함수
+
+    Returns:
+        감싼 함수
+    """
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is None:
+        return function
+
+    def run_with_request_metrics(*args, **kwargs):
+        previous = getattr(_local, 'request_metrics', None)
+        _local.request_metrics = request_metrics
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _local.request_metrics = previous
+
+    return run_with_request_metrics
+
+
+def start_s3_call(context, **kwargs):
+    # botocore before-call 이벤트 핸들러. 호출마다 새로 만들어지는 context 에 시작 시각을 넣어둔다.
+    if _enabled:
+        context['metrics_started_at'] = time.perf_counter()
+
+
+def finish_s3_call(model, context, **kwargs):
+    # botocore after-call, after-call-error 이벤트 핸들러
+    started_at = context.pop('metrics_started_at', None) if _enabled else None
+    if started_at is None:
+        return
+
+    duration = time.perf_counter() - started_at
+    _registry.observe_s3(model.name, duration)
+
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is not None:
+        with request_metrics.lock:
+            request_metrics.s3_seconds += duration
+            request_metrics.s3_calls += 1
+
+
+def start_request():
+    _local.request_metrics = RequestMetrics()
+
+
+def set_response_status(response):
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is not None:
+        request_metrics.status = response.status_code
+    return response
+
+
+def finish_request(exception=None):
+    request_metrics = getattr(_local, 'request_metrics', None)
+    if request_metrics is None:
+        return
+    _local.request_metrics = None
+
+    # after_request 를 거치지 않고 끝난 요청은 처리되지 않은 예외이므로 500 으로 기록한다.
+    status = request_metrics.status or 500
+    _registry.observe_request(
+        request.endpoint or 'not_found',
+        request.method,
+        str(status),
+        time.perf_counter() - request_metrics.started_at,
+        request_metrics
+    )
+
+
+def metrics_view():
+
+    """ Prometheus 가 수집하는 측정 값 응답
+
+    Returns:
+        200: Prometheus text 형식의 측정 값
+    """
+    return Response(_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def init_app(app):
+
+    """ METRICS_ENABLED 설정이 켜져 있으면 요청 측정 훅과 /metrics 엔드포인트를 등록한다
+
+    꺼져 있으면 아무것도 등록하지 않으므로 커서를 감싸거나 요청마다 값을 모으는 비용이 없다.
+
+    Args:
+        app: Flask 앱 객체
+    """
+    global _enabled
+
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    _enabled = True
+    app.before_request(start_request)
+    app.after_request(set_response_status)
+    app.teardown_request(finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
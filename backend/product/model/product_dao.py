@@ -1,6 +1,71 @@
+from datetime import datetime
+
 from flask import jsonify
 from mysql.connector.errors import Error
 
+from connection import bulk_insert
+from cache import get_cached_count, invalidate_counts, PRODUCT_COUNT
+from utils import encode_cursor, decode_cursor, make_ngram_search_phrase, escape_like
+
+# multi-row INSERT 로 넣는 상품 이미지, 태그 컬럼
+PRODUCT_IMAGE_COLUMNS = ('image_url', 'product_info_id', 'image_size_id', 'image_order')
+PRODUCT_TAG_COLUMNS = ('name', 'product_info_id')
+
+# 상품 상세 여러 개 조회에서 한 번에 조회할 수 있는 최대 상품 수
+PRODUCT_DETAILS_LIMIT = 100
+
+# 상품 리스트 커서에 담는 등록일시 형식
+PRODUCT_CURSOR_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 셀러별 상품 수(seller_product_stats)를 product_infos 의 최신 이력으로 다시 계산하는 sql 문
+REBUILD_SELLER_PRODUCT_STATS_STATEMENT = """
+    INSERT INTO seller_product_stats
+    (
+        seller_account_id,
+        product_count
+    )
+    SELECT
+        seller_accounts.seller_account_no,
+        COUNT(product_infos.product_info_no)
+    
+    FROM
+        seller_accounts
+    
+    LEFT JOIN product_infos
+        ON product_infos.seller_id = seller_accounts.seller_account_no
+        AND product_infos.close_time = '2037-12-31 23:59:59'
+    
+    GROUP BY
+        seller_accounts.seller_account_no
+    
+    ON DUPLICATE KEY UPDATE
+        product_count = VALUES(product_count)
+"""
+
+# 상품명 검색 테이블(product_name_search)을 product_infos 의 최신 이력으로 다시 채우는 sql 문
+REBUILD_PRODUCT_NAME_SEARCH_STATEMENT = """
+    INSERT INTO product_name_search
+    (
+        product_id,
+        product_info_id,
+        name
+    )
+    SELECT
+        product_id,
+        product_info_no,
+        name
+    
+    FROM
+        product_infos
+    
+    WHERE
+        close_time = '2037-12-31 23:59:59'
+    
+    ON DUPLICATE KEY UPDATE
+        product_info_id = VALUES(product_info_id),
+        name = VALUES(name)
+"""
+
 
 class ProductDao:
 
@@ -72,64 +137,6 @@ class ProductDao:
             db_connection.rollback()
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
-    # noinspection PyMethodMayBeStatic
-    def get_second_categories(self, db_connection, first_category_no):
-
-        """ 상품 2차 카테고리 목록 표출
-
-        선택된 상품 1차 카테고릭에 따라 해당하는 2차카테고리 목록 표출
-
-        Args:
-            first_category_no(integer): 1차 카테고리 인덱스 번호
-            db_connection: 데이터베이스 커넥션 객체
-
-        Returns:
-            200: 1차 카테고리에 해당하는 상품 2차 카테고리 목록
-            400: key error
-            404: CATEGORY_DOES_NOT_EXIST
-            500: database cursor error
-
-        Authors:
-            leesh3@brandi.co.kr (이소헌)
-            leejm3@brandi.co.kr (이종민)
-
-        History:
-            2020-04-02 (leesh3@brandi.co.kr): 초기 생성
-            2020-04-16 (leejm3@brandi.co.kr): SQL 문 별칭 적용, 에러 주석 추가
-
-        """
-        try:
-            with db_connection.cursor() as db_cursor:
-                get_stmt = """
-                    SELECT 
-                        PC01.second_category_no, PC01.name 
-                    
-                    FROM 
-                        second_categories AS PC01
-                    
-                    INNER JOIN first_categories AS PC02 
-                    ON PC02.first_category_no = PC01.first_category_id 
-                    
-                    WHERE 
-                        PC02.first_category_no = %(first_category_no)s;
-                """
-                db_cursor.execute(get_stmt, {'first_category_no': first_category_no})
-                second_categories = db_cursor.fetchall()
-                if second_categories:
-                    return jsonify({'second_categories': second_categories}), 200
-
-                return jsonify({'message': 'CATEGORY_DOES_NOT_EXIST'}), 404
-
-        except KeyError as e:
-            print(f'KEY_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'INVALID_KEY'}), 400
-
-        except Error as e:
-            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
-            db_connection.rollback()
-            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
-
     # noinspection PyMethodMayBeStatic
     def get_product_detail(self, product_no, db_connection):
 
@@ -240,6 +247,149 @@ class ProductDao:
             db_connection.rollback()
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
+    # noinspection PyMethodMayBeStatic
+    def get_product_details(self, product_nos, db_connection):
+
+        """ 여러 상품의 상세 정보를 한 번에 표출
+
+        상품 정보, 태그, 이미지를 상품마다 조회하지 않고 테이블별로 IN 쿼리 한 번씩(총 3번) 조회한 뒤
+        상품 정보 이력 번호로 묶는다. 상품별 결과는 get_product_detail 의 응답과 같은 형태다.
+
+        Args:
+            product_nos: 상품 번호 리스트
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            200: {'products': {상품 번호: 상품 상세 정보}, 'not_found': 존재하지 않는 상품 번호 리스트}
+            500: DB_CURSOR_ERROR
+        """
+        try:
+            with db_connection.cursor() as db_cursor:
+                get_stmt = """
+                    SELECT
+                        seller_id,
+                        is_available,
+                        is_on_display,
+                        product_sort_id,
+                        first_category_id,
+                        second_category_id,
+                        product_infos.name,
+                        short_description,
+                        color_filter_id,
+                        style_filter_id,
+                        long_description,
+                        youtube_url,
+                        stock,
+                        price,
+                        discount_rate,
+                        discount_start_time,
+                        discount_end_time,
+                        min_unit,
+                        max_unit,
+                        product_id,
+                        product_info_no,
+                        seller_account_no
+                    FROM 
+                        product_infos 
+                    INNER JOIN 
+                        seller_accounts 
+                        ON product_infos.seller_id = seller_accounts.seller_account_no
+                    WHERE 
+                        product_id IN %(product_ids)s 
+                    AND
+                        close_time='2037-12-31 23:59:59.0'
+                """
+                db_cursor.execute(get_stmt, {'product_ids': tuple(product_nos)})
+                product_informations = db_cursor.fetchall()
+
+                # 상품 정보 이력 번호별로 태그와 이미지를 모아줄 상품 정보
+                products_by_info_no = {}
+                for product_information in product_informations:
+                    product_information['tags'] = []
+                    product_information['images'] = []
+                    products_by_info_no[product_information['product_info_no']] = product_information
+
+                if products_by_info_no:
+                    product_info_nos = {'product_info_nos': tuple(products_by_info_no.keys())}
+
+                    get_tag_stmt = """
+                        SELECT
+                            product_info_id,
+                            name
+                        FROM
+                            product_tags
+                        WHERE
+                            product_info_id IN %(product_info_nos)s
+                    """
+                    db_cursor.execute(get_tag_stmt, product_info_nos)
+                    for tag in db_cursor.fetchall():
+                        products_by_info_no[tag['product_info_id']]['tags'].append(tag['name'])
+
+                    get_image_stmt = """
+                        SELECT
+                            product_info_id,
+                            image_order,
+                            image_url
+                        FROM
+                            product_images
+                        WHERE
+                            product_info_id IN %(product_info_nos)s
+                        AND
+                            image_size_id = 3                            
+                    """
+                    db_cursor.execute(get_image_stmt, product_info_nos)
+                    for image in db_cursor.fetchall():
+                        products_by_info_no[image.pop('product_info_id')]['images'].append(image)
+
+                products = {
+                    str(product_information['product_id']): product_information
+                    for product_information in product_informations
+                }
+                not_found = [product_no for product_no in product_nos if str(product_no) not in products]
+
+                return jsonify({'products': products, 'not_found': not_found}), 200
+
+        except Error as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            db_connection.rollback()
+            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
+
+    # noinspection PyMethodMayBeStatic
+    def get_product_detail_version(self, product_no, db_connection):
+
+        """ 상품 상세 정보의 현재 버전(최신 이력 번호) 조회
+
+        상품 정보는 수정할 때마다 새 이력(product_info_no)이 생기고, 태그와 이미지도 이력 번호에 묶여 있으므로
+        최신 이력 번호가 같으면 상품 상세 응답도 같다. 조건부 GET 의 ETag 를 만드는 데 사용한다.
+
+        Args:
+            product_no: 상품 번호
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            최신 product_info_no, 상품이 없거나 조회에 실패하면 None
+        """
+        try:
+            with db_connection.cursor() as db_cursor:
+                get_version_stmt = """
+                    SELECT
+                        product_info_no
+                    FROM
+                        product_infos
+                    WHERE
+                        product_id = %(product_id)s
+                    AND
+                        close_time = '2037-12-31 23:59:59.0'
+                """
+                db_cursor.execute(get_version_stmt, {'product_id': product_no})
+                version = db_cursor.fetchone()
+                return version['product_info_no'] if version else None
+
+        except Error as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            db_connection.rollback()
+            return None
+
     # noinspection PyMethodMayBeStatic
     def insert_new_product(self, product_info, db_connection):
 
@@ -259,6 +409,8 @@ class ProductDao:
                 3. product_images
                 4. product_tags
                 5. product_change_histories
+                셀러별 상품 수(seller_product_stats)도 같은 트랜잭션에서 1 증가하고,
+                상품명 검색 테이블(product_name_search)에도 같은 트랜잭션에서 추가한다.
 
             400: key_error
             404: ACCOUNT_DOES_NOT_EXIST
@@ -378,55 +530,27 @@ class ProductDao:
                 product_info_id = db_cursor.lastrowid
 
                 # 3. TABLE product_images
+                # 이미지 순서별, 크기별 행을 모아서 한 번의 multi-row INSERT 로 넣음
                 images = product_info['images']
+                image_rows = []
                 for image_set in images.keys():
                     image_order = image_set[-1]
                     image_sizes = ['big', 'medium', 'small']
 
                     if images[image_set]:
                         for size in image_sizes:
-                            image_info = {
+                            image_rows.append({
                                 'image_url': images[image_set][f'{size}_size_url'],
                                 'product_info_id': product_info_id,
                                 'image_size_id': images[image_set][f'{size}_image_size_id'],
                                 'image_order': image_order,
-                            }
-
-                            insert_image_stmt = """
-                                INSERT INTO product_images(
-                                    image_url,
-                                    product_info_id,
-                                    image_size_id,
-                                    image_order
-                                ) VALUES (
-                                    %(image_url)s,
-                                    %(product_info_id)s,
-                                    %(image_size_id)s,
-                                    %(image_order)s
-                                )
-                            """
-                            db_cursor.execute(insert_image_stmt, image_info)
-                    else:
-                        pass
-
-                # 4. TABLE product_tags
-                for tag in product_info['tags']:
+                            })
 
-                    tag_info = {
-                        'name': tag,
-                        'product_info_id': product_info_id
-                    }
+                bulk_insert(db_cursor, 'product_images', PRODUCT_IMAGE_COLUMNS, image_rows)
 
-                    insert_tag_stmt = """
-                        INSERT INTO product_tags(
-                            name,
-                            product_info_id
-                        ) VALUES (
-                            %(name)s,
-                            %(product_info_id)s
-                        )
-                    """
-                    db_cursor.execute(insert_tag_stmt, tag_info)
+                # 4. TABLE product_tags
+                tag_rows = [{'name': tag, 'product_info_id': product_info_id} for tag in product_info['tags']]
+                bulk_insert(db_cursor, 'product_tags', PRODUCT_TAG_COLUMNS, tag_rows)
 
                 # 5. TABLE product_change_histories
                 insert_history_stmt = """
@@ -458,7 +582,19 @@ class ProductDao:
                         product_info_no=%(product_info_no)s
                 """
                 db_cursor.execute(insert_history_stmt, {'product_info_no': product_info_id})
+
+                # 6. TABLE seller_product_stats
+                # 셀러 리스트에서 사용하는 셀러별 상품 수를 같은 트랜잭션 안에서 1 증가
+                self.change_seller_product_count(product_info['seller_id'], 1, db_cursor)
+
+                # 7. TABLE product_name_search
+                # 상품 리스트의 상품명 검색에서 사용하는 최신 상품명을 같은 트랜잭션 안에서 추가
+                self.change_product_name_search(product_info['product_id'], product_info_id, product_info['name'], db_cursor)
+
                 db_connection.commit()
+
+                # 상품이 추가되었으므로 상품 리스트 count 캐시 무효화
+                invalidate_counts(PRODUCT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -505,7 +641,8 @@ class ProductDao:
 
                 get_product_owner_stmt = """
                     SELECT
-                        account_id
+                        account_id,
+                        product_infos.seller_id
                     
                     FROM
                         seller_accounts
@@ -609,93 +746,79 @@ class ProductDao:
                 product_info_id = db_cursor.lastrowid
 
                 # 2. TABLE product_images
+                # 새로 올라온 이미지는 크기별 행을 모아서 한 번의 multi-row INSERT 로 넣고,
+                # 바뀌지 않은 이미지 순서는 이전 이력의 이미지를 한 번의 INSERT ... SELECT 로 복사함
                 images = product_info['images']
+                image_rows = []
+                unchanged_image_orders = []
                 for image_set in images.keys():
                     image_order = image_set[-1]
                     image_sizes = ['big', 'medium', 'small']
 
                     if images[image_set]:
                         for size in image_sizes:
-                            image_info = {
+                            image_rows.append({
                                 'image_url': images[image_set][f'{size}_size_url'],
                                 'product_info_id': product_info_id,
                                 'image_size_id': images[image_set][f'{size}_image_size_id'],
                                 'image_order': image_order
-                            }
-
-                            insert_image_stmt = """
-                                INSERT INTO product_images(
-                                    image_url,
-                                    product_info_id,
-                                    image_size_id,
-                                    image_order
-                                ) VALUES (
-                                    %(image_url)s,
-                                    %(product_info_id)s,
-                                    %(image_size_id)s,
-                                    %(image_order)s
-                                )
-                            """
-                            db_cursor.execute(insert_image_stmt, image_info)
+                            })
                     else:
-                        for image_size_id in range(1, len(image_sizes)+1):
-
-                            image_info = {
-                                'product_info_id': product_info_id,
-                                'product_id': product_info['product_id'],
-                                'image_size_id': image_size_id,
-                                'image_order': image_order,
-                                'previous_close_time': now
-                            }
-
-                            insert_image_stmt = """
-                                INSERT INTO product_images(
-                                    image_url,
-                                    image_size_id,
-                                    image_order,
-                                    product_info_id
-                                ) SELECT 
-                                    image_url,
-                                    image_size_id,
-                                    image_order,
-                                    %(product_info_id)s
-                                
-                                FROM
-                                    product_images
-                                
-                                WHERE
-                                    product_info_id=(
-                                        SELECT 
-                                            product_info_no
-                                        FROM 
-                                            product_infos 
-                                        WHERE 
-                                            product_id = %(product_id)s
-                                        AND
-                                            close_time = %(previous_close_time)s)                                        
-                                AND
-                                    image_order=%(image_order)s AND image_size_id=%(image_size_id)s                                
-                            """
-                            db_cursor.execute(insert_image_stmt, image_info)
+                        unchanged_image_orders.append(image_order)
 
-                # 3. TABLE product_tags
-                for tag in product_info['tags']:
+                bulk_insert(db_cursor, 'product_images', PRODUCT_IMAGE_COLUMNS, image_rows)
 
-                    tag_info = {
-                        'name': tag,
-                        'product_info_id': product_info_id
+                if unchanged_image_orders:
+                    image_info = {
+                        'product_info_id': product_info_id,
+                        'product_id': product_info['product_id'],
+                        'image_orders': tuple(unchanged_image_orders),
+                        'previous_close_time': now
                     }
 
-                    insert_tag_stmt = """
-                        INSERT INTO product_tags(
-                            name,
+                    insert_image_stmt = """
+                        INSERT INTO product_images(
+                            image_url,
+                            image_size_id,
+                            image_order,
                             product_info_id
-                        ) VALUES (
-                            %(name)s,
+                        ) SELECT 
+                            image_url,
+                            image_size_id,
+                            image_order,
                             %(product_info_id)s
-                        )
+                        
+                        FROM
+                            product_images
+                        
+                        WHERE
+                            product_info_id=(
+                                SELECT 
+                                    product_info_no
+                                FROM 
+                                    product_infos 
+                                WHERE 
+                                    product_id = %(product_id)s
+                                AND
+                                    close_time = %(previous_close_time)s)                                        
+                        AND
+                            image_order IN %(image_orders)s
+                        AND
+                            image_size_id IN (1, 2, 3)
                     """
-                    db_cursor.execute(insert_tag_stmt, tag_info)
+                    db_cursor.execute(insert_image_stmt, image_info)
+
+                # 3. TABLE product_tags
+                tag_rows = [{'name': tag, 'product_info_id': product_info_id} for tag in product_info['tags']]
+                bulk_insert(db_cursor, 'product_tags', PRODUCT_TAG_COLUMNS, tag_rows)
+
+                # 상품의 셀러가 바뀌면 이전 셀러와 새 셀러의 상품 수를 같은 트랜잭션 안에서 옮겨줌
+                if validated_account['seller_id'] != product_info['seller_account_id']:
+                    self.change_seller_product_count(validated_account['seller_id'], -1, db_cursor)
+                    self.change_seller_product_count(product_info['seller_account_id'], 1, db_cursor)
+
+                # 상품명 검색 테이블의 상품명을 새 이력으로 같은 트랜잭션 안에서 바꿔줌
+                self.change_product_name_search(product_info['product_id'], product_info_id, product_info['name'], db_cursor)
 
                 db_connection.commit()
 
@@ -731,6 +854,8 @@ class ProductDao:
                 db_cursor.execute(insert_history_stmt, {'product_info_no': product_info_id})
                 db_connection.commit()
 
+                # 상품 정보가 바뀌어 검색 결과가 달라질 수 있으므로 상품 리스트 count 캐시 무효화
+                invalidate_counts(PRODUCT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -743,49 +868,188 @@ class ProductDao:
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
     # noinspection PyMethodMayBeStatic
-    def get_color_filters(self, db_connection):
+    def change_seller_product_count(self, seller_id, amount, db_cursor):
 
-        """ 상품 등록시 컬러 필터 표출
+        """ 셀러별 상품 수 증가/감소
+
+        상품 등록, 셀러 변경, 삭제 트랜잭션 안에서 호출해서 상품 변경과 같이 커밋/롤백 되도록 한다.
+        셀러의 행이 없으면 새로 만든다.
 
         Args:
-            db_connection: 데이터베이스 연결 객체
+            seller_id: 셀러 번호(seller_account_no)
+            amount: 바뀐 상품 수 (등록 1, 삭제 -1)
+            db_cursor: 상품 변경 트랜잭션의 커서
+        """
+        change_count_stmt = """
+            INSERT INTO seller_product_stats
+            (
+                seller_account_id,
+                product_count
+            ) VALUES (
+                %(seller_account_id)s,
+                GREATEST(%(amount)s, 0)
+            )
+            ON DUPLICATE KEY UPDATE
+                product_count = GREATEST(product_count + %(amount)s, 0)
+        """
+        db_cursor.execute(change_count_stmt, {'seller_account_id': seller_id, 'amount': amount})
 
-        Returns:
-            200: 상품 등록시 선택할 수 있는 색상 필터
-            400: key_error
-            500: 데이터베이스 에러
+    # noinspection PyMethodMayBeStatic
+    def rebuild_seller_product_stats(self, db_connection):
 
-        Authors:
-            leesh3@brandi.co.kr (이소헌)
+        """ 셀러별 상품 수 전체 재계산
 
-        History:
-            2020-04-09 (leesh3@brandi.co.kr): 초기 생성
+        product_infos 의 최신 이력을 셀러별로 세어서 seller_product_stats 를 다시 채운다.
+        마이그레이션 이후 처음 채울 때나 카운터가 맞지 않을 때 flask rebuild-seller-product-stats 로 실행한다.
+
+        Args:
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            갱신된 셀러 수
         """
         try:
             with db_connection.cursor() as db_cursor:
-                get_colors_stmt = """
-                    SELECT
-                        *
-                    
-                    FROM
-                        color_filters
-                    
-                    WHERE NOT
-                        color_filter_no=19
-                """
-                db_cursor.execute(get_colors_stmt)
-                colors = db_cursor.fetchall()
+                db_cursor.execute("START TRANSACTION")
+                db_cursor.execute(REBUILD_SELLER_PRODUCT_STATS_STATEMENT)
+                db_cursor.execute("SELECT COUNT(0) AS seller_count FROM seller_product_stats")
+                seller_count = db_cursor.fetchone()['seller_count']
+                db_connection.commit()
+                return seller_count
 
-                return jsonify({'colors': colors}), 200
+        except Exception:
+            db_connection.rollback()
+            raise
 
-        except KeyError as e:
-            print(f'KEY_ERROR WITH {e}')
-            return jsonify({'message': 'INVALID_KEY'}), 400
+    # noinspection PyMethodMayBeStatic
+    def change_product_name_search(self, product_id, product_info_id, name, db_cursor):
 
-        except Error as e:
-            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+        """ 상품명 검색 테이블에 상품의 최신 상품명 저장
+
+        상품 등록, 수정 트랜잭션 안에서 새 이력을 만든 뒤 호출해서 상품 변경과 같이 커밋/롤백 되도록 한다.
+        상품의 행이 없으면 새로 만든다.
+
+        Args:
+            product_id: 상품 번호(product_no)
+            product_info_id: 새로 만든 상품 정보 이력 번호
+            name: 상품명
+            db_cursor: 상품 변경 트랜잭션의 커서
+        """
+        change_name_stmt = """
+            INSERT INTO product_name_search
+            (
+                product_id,
+                product_info_id,
+                name
+            ) VALUES (
+                %(product_id)s,
+                %(product_info_id)s,
+                %(name)s
+            )
+            ON DUPLICATE KEY UPDATE
+                product_info_id = VALUES(product_info_id),
+                name = VALUES(name)
+        """
+        db_cursor.execute(change_name_stmt, {'product_id': product_id, 'product_info_id': product_info_id, 'name': name})
+
+    # noinspection PyMethodMayBeStatic
+    def rebuild_product_name_search(self, db_connection):
+
+        """ 상품명 검색 테이블 전체 재생성
+
+        product_infos 의 최신 이력으로 product_name_search 를 다시 채운다.
+        검색 결과가 최신 상품명과 맞지 않을 때 flask rebuild-product-name-search 로 실행한다.
+
+        Args:
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            갱신된 상품 수
+        """
+        try:
+            with db_connection.cursor() as db_cursor:
+                db_cursor.execute("START TRANSACTION")
+                db_cursor.execute(REBUILD_PRODUCT_NAME_SEARCH_STATEMENT)
+                db_cursor.execute("SELECT COUNT(0) AS product_count FROM product_name_search")
+                product_count = db_cursor.fetchone()['product_count']
+                db_connection.commit()
+                return product_count
+
+        except Exception:
             db_connection.rollback()
-            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
+            raise
+
+    # noinspection PyMethodMayBeStatic
+    def build_product_name_condition(self, filter_info):
+
+        """ 상품 리스트의 상품명 검색 조건
+
+        exact 는 기존처럼 최신 이력의 상품명과 전체 일치로 찾는다.
+        prefix, contains 는 상품마다 최신 상품명 한 행만 있는 product_name_search 에서 상품 번호를 찾는다.
+            - prefix: 상품명 B-tree 인덱스 범위 검색 (LIKE '키워드%')
+            - contains: ngram FULLTEXT 구문 검색으로 후보를 좁히고 LIKE '%키워드%' 로 다시 확인한다.
+              인덱스로 찾을 수 없는 짧은 검색어는 LIKE 로만 찾는다.
+        키워드에 들어있는 %, _ 는 와일드카드가 아닌 글자 그대로 찾는다.
+
+        Args:
+            filter_info: 필터에 쓰이는 쿼리 정보 (product_name, product_name_match). 바인딩할 값을 추가한다.
+
+        Returns:
+            WHERE 절에 붙일 조건문
+        """
+        product_name = filter_info['product_name']
+        product_name_match = filter_info.get('product_name_match', None) or 'contains'
+
+        if product_name_match == 'exact':
+            return " AND PL02.name = %(product_name)s"
+
+        if product_name_match == 'prefix':
+            filter_info['product_name_pattern'] = escape_like(product_name) + '%'
+            return """
+                AND PL01.product_no IN (
+                    SELECT product_id
+                    FROM product_name_search
+                    WHERE name LIKE %(product_name_pattern)s
+                )
+            """
+
+        filter_info['product_name_pattern'] = '%' + escape_like(product_name) + '%'
+        filter_info['product_name_phrase'] = make_ngram_search_phrase(product_name)
+        if filter_info['product_name_phrase']:
+            return """
+                AND PL01.product_no IN (
+                    SELECT product_id
+                    FROM product_name_search
+                    WHERE MATCH(name) AGAINST(%(product_name_phrase)s IN BOOLEAN MODE)
+                    AND name LIKE %(product_name_pattern)s
+                )
+            """
+
+        return """
+            AND PL01.product_no IN (
+                SELECT product_id
+                FROM product_name_search
+                WHERE name LIKE %(product_name_pattern)s
+            )
+        """
+
+    # noinspection PyMethodMayBeStatic
+    def make_product_list_cursor(self, product, direction):
+
+        """ 상품 리스트의 한 행으로 페이지네이션 커서를 만든다
+
+        Args:
+            product: 상품 리스트 행 (created_at, product_no)
+            direction: next(다음 페이지), prev(이전 페이지)
+
+        Returns:
+            커서 문자열
+        """
+        return encode_cursor({
+            'created_at': product['created_at'].strftime(PRODUCT_CURSOR_TIME_FORMAT),
+            'product_no': product['product_no'],
+            'direction': direction
+        })
 
     # noinspection PyMethodMayBeStatic
     def get_product_list(self, filter_info, db_connection):
@@ -797,7 +1061,8 @@ class ProductDao:
             db_connection: 연결된 database connection 객체
 
         Returns:
-            200: 필터링된 상품 정보 리스트
+            200: 필터링된 상품 정보 리스트, 다음/이전 페이지 커서
+            400: INVALID_CURSOR
             500: DB_CURSOR_ERROR
 
         Authors:
@@ -818,6 +1083,25 @@ class ProductDao:
                 - 등록순 정렬 추가
         """
 
+        # 커서가 들어오면 커서에 담긴 마지막 상품의 (등록일시, 상품번호) 를 기준으로 페이지를 가져온다.
+        cursor_info = None
+        if filter_info.get('cursor', None):
+            cursor_info = decode_cursor(filter_info['cursor'], ('created_at', 'product_no', 'direction'))
+            try:
+                filter_info['cursor_created_at'] = datetime.strptime(cursor_info['created_at'], PRODUCT_CURSOR_TIME_FORMAT)
+                if type(cursor_info['product_no']) is not int:
+                    raise ValueError
+                filter_info['cursor_product_no'] = cursor_info['product_no']
+
+            except (TypeError, ValueError):
+                return jsonify({'message': 'INVALID_CURSOR'}), 400
+        is_prev_page = cursor_info is not None and cursor_info['direction'] == 'prev'
+
+        # 상품명 검색 조건은 리스트, count 쿼리에 같이 사용
+        product_name_condition = ''
+        if filter_info.get('product_name', None):
+            product_name_condition = self.build_product_name_condition(filter_info)
+
         try:
             with db_connection as db_cursor:
 
@@ -885,8 +1169,7 @@ class ProductDao:
                     select_product_list_statement += " AND PL04.name_kr = %(seller_name)s"
 
                 # 상품명
-                if filter_info.get('product_name', None):
-                    select_product_list_statement += " AND PL02.name = %(product_name)s"
+                select_product_list_statement += product_name_condition
 
                 # 상품번호
                 if filter_info.get('product_number', None):
@@ -913,21 +1196,66 @@ class ProductDao:
                     else:
                         select_product_list_statement += " AND PL02.discount_rate = 0"
 
-                # 등록순 정렬
-                select_product_list_statement += " ORDER BY PL01.created_at DESC"
+                # 이전 페이지: 커서보다 최근에 등록된 상품을 등록 오래된 순으로 가져와서 순서를 뒤집는다.
+                if is_prev_page:
+                    select_product_list_statement += """
+                        AND (
+                            PL01.created_at > %(cursor_created_at)s
+                            OR (PL01.created_at = %(cursor_created_at)s AND PL01.product_no > %(cursor_product_no)s)
+                        )
+                        ORDER BY PL01.created_at ASC, PL01.product_no ASC
+                    """
+
+                # 다음 페이지: 커서보다 먼저 등록된 상품부터 등록순 정렬
+                # offset 만큼 행을 읽고 버리지 않고 (created_at, product_no) 인덱스에서 바로 다음 행부터 읽는다.
+                elif cursor_info:
+                    select_product_list_statement += """
+                        AND (
+                            PL01.created_at < %(cursor_created_at)s
+                            OR (PL01.created_at = %(cursor_created_at)s AND PL01.product_no < %(cursor_product_no)s)
+                        )
+                        ORDER BY PL01.created_at DESC, PL01.product_no DESC
+                    """
 
-                # 페이징 마지막
+                # 등록순 정렬 (등록일시가 같으면 상품번호순)
+                else:
+                    select_product_list_statement += " ORDER BY PL01.created_at DESC, PL01.product_no DESC"
+
+                # 페이징 마지막, 다음(이전) 페이지가 있는지 확인하기 위해 limit 보다 하나 더 가져옴.
                 if filter_info.get('limit', None):
-                    select_product_list_statement += " LIMIT %(limit)s"
+                    filter_info['fetch_limit'] = filter_info['limit'] + 1
+                    select_product_list_statement += " LIMIT %(fetch_limit)s"
 
-                # 페이징 시작
-                if filter_info.get('offset', None):
+                # 페이징 시작, 커서가 들어오면 offset 은 사용하지 않음.
+                if filter_info.get('offset', None) and not cursor_info:
                     select_product_list_statement += " OFFSET %(offset)s"
 
                 # sql 쿼리와 pagination 데이터 바인딩
                 db_cursor.execute(select_product_list_statement, filter_info)
                 product_info = db_cursor.fetchall()
 
+                # limit 보다 하나 더 가져온 행이 있으면 그 방향으로 페이지가 더 있음.
+                has_more = False
+                if filter_info.get('limit', None):
+                    has_more = len(product_info) > filter_info['limit']
+                    product_info = product_info[:filter_info['limit']]
+
+                if is_prev_page:
+                    product_info.reverse()
+                    has_next_page = True
+                    has_prev_page = has_more
+                else:
+                    has_next_page = has_more
+                    has_prev_page = cursor_info is not None or bool(filter_info.get('offset', None))
+
+                # 현재 페이지의 마지막, 첫번째 상품으로 다음, 이전 페이지 커서를 만듦.
+                next_cursor = None
+                prev_cursor = None
+                if product_info and has_next_page:
+                    next_cursor = self.make_product_list_cursor(product_info[-1], 'next')
+                if product_info and has_prev_page:
+                    prev_cursor = self.make_product_list_cursor(product_info[0], 'prev')
+
                 # pagination 을 위해서 상품 몇개인지 카운트
                 product_count_statement = '''
                     SELECT 
@@ -983,8 +1311,7 @@ class ProductDao:
                     product_count_statement += " AND PL04.name_kr = %(seller_name)s"
 
                 # 상품명
-                if filter_info.get('product_name', None):
-                    product_count_statement += " AND PL02.name = %(product_name)s"
+                product_count_statement += product_name_condition
 
                 # 상품번호
                 if filter_info.get('product_number', None):
@@ -1012,12 +1339,18 @@ class ProductDao:
                         product_count_statement += " AND PL02.discount_rate = 0"
 
                 # 실행
-                db_cursor.execute(product_count_statement, filter_info)
-                product_count = db_cursor.fetchone()
+                def count_filtered_products():
+                    db_cursor.execute(product_count_statement, filter_info)
+                    return db_cursor.fetchone()['filtered_product_count']
+
+                # 검색 조건이 같으면 페이지를 넘기거나 페이지 크기를 바꿔도 count 쿼리를 다시 실행하지 않음
+                product_count = get_cached_count(PRODUCT_COUNT, filter_info, count_filtered_products)
 
                 # 상품 리스트와 검색된 상품 수 리턴
                 return jsonify({'product_list': product_info,
-                                'product_count': product_count['filtered_product_count']
+                                'product_count': product_count,
+                                'next_cursor': next_cursor,
+                                'prev_cursor': prev_cursor
                                 }), 200
 
         # 데이터베이스 error
@@ -1,5 +1,7 @@
 from flask import jsonify, g
-from product.model.product_dao import ProductDao
+from product.model.product_dao import ProductDao, PRODUCT_DETAILS_LIMIT
+from reference_data import get_reference_data
+from utils import make_etag, make_conditional_response
 
 
 class ProductService:
@@ -43,18 +45,20 @@ class ProductService:
         return categories
 
     # noinspection PyMethodMayBeStatic
-    def get_second_categories(self, db_connection, first_category_no):
+    def get_second_categories(self, first_category_no):
 
         """ 상품 2차 카테고리 목록 표출
 
         선택된 상품 1차 카테고릭에 따라 해당하는 2차카테고리 목록 표출
+        데이터베이스에 접근하지 않고 메모리에 올려둔 기준 데이터로 응답
 
         Args:
             first_category_no(integer): 1차 카테고리 인덱스 번호
-            db_connection: 데이터베이스 커넥션 객체
 
         Returns:
             200: 1차 카테고리에 해당하는 상품 2차 카테고리 목록
+            304: 클라이언트가 가진 목록이 최신인 경우
+            404: CATEGORY_DOES_NOT_EXIST
 
         Authors:
             leesh3@brandi.co.kr (이소헌)
@@ -63,10 +67,12 @@ class ProductService:
             2020-04-02 (leesh3@brandi.co.kr): 초기 생성
 
         """
-        product_dao = ProductDao()
-        categories = product_dao.get_second_categories(db_connection, first_category_no)
+        reference_data = get_reference_data()
+        second_categories = reference_data.get('second_categories', first_category_no)[0]
+        if not second_categories:
+            return jsonify({'message': 'CATEGORY_DOES_NOT_EXIST'}), 404
 
-        return categories
+        return reference_data.make_response('second_categories', 'second_categories', first_category_no)
 
     # noinspection PyMethodMayBeStatic
     def get_product_detail(self, product_no, db_connection):
@@ -81,6 +87,7 @@ class ProductService:
 
         Returns:
             200: 상품별 상세 정보
+            304: 클라이언트가 가진 상품 정보가 최신인 경우
 
         Authors:
 
@@ -92,10 +99,36 @@ class ProductService:
         """
 
         product_dao = ProductDao()
-        product_infos = product_dao.get_product_detail(product_no, db_connection)
+
+        # 최신 이력 번호만 먼저 조회해서 클라이언트가 가진 정보가 최신이면 상세 조회 없이 304 리턴
+        product_info_no = product_dao.get_product_detail_version(product_no, db_connection)
+        etag = make_etag('product', product_no, product_info_no) if product_info_no else None
+
+        product_infos = make_conditional_response(
+            etag, lambda: product_dao.get_product_detail(product_no, db_connection)
+        )
 
         return product_infos
 
+    # noinspection PyMethodMayBeStatic
+    def get_product_details(self, product_nos, db_connection):
+
+        """ 여러 상품의 상세 정보 표출
+
+        Args:
+            product_nos: 상품 번호 리스트 (중복 제외)
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            200: 상품 번호별 상세 정보, 존재하지 않는 상품 번호 리스트
+            400: TOO_MANY_PRODUCTS
+        """
+        if len(product_nos) > PRODUCT_DETAILS_LIMIT:
+            return jsonify({'message': 'TOO_MANY_PRODUCTS'}), 400
+
+        product_dao = ProductDao()
+        return product_dao.get_product_details(product_nos, db_connection)
+
     # noinspection PyMethodMayBeStatic
     def insert_new_product(self, product_info, db_connection):
 
@@ -181,15 +214,14 @@ class ProductService:
         return jsonify({'message': 'INVALID_AUTH_ID'}), 400
 
     # noinspection PyMethodMayBeStatic
-    def get_color_filters(self, db_connection):
+    def get_color_filters(self):
 
         """ 상품 등록시 컬러 필터 표출
-
-        Args:
-            db_connection: 데이터베이스 연결 객체
+        데이터베이스에 접근하지 않고 메모리에 올려둔 기준 데이터로 응답
 
         Returns:
             200: 상품 등록시 선택할 수 있는 색상 필터
+            304: 클라이언트가 가진 목록이 최신인 경우
 
         Authors:
             leesh3@brandi.co.kr (이소헌)
@@ -197,8 +229,7 @@ class ProductService:
         History:
             2020-04-09 (leesh3@brandi.co.kr): 초기 생성
         """
-        product_dao = ProductDao()
-        return product_dao.get_color_filters(db_connection)
+        return get_reference_data().make_response('color_filters', 'colors')
 
     # noinspection PyMethodMayBeStatic
     def get_product_list(self, filter_info, db_connection):
@@ -37,14 +37,21 @@ class ProductView:
         Param('is_available', GET, int, required=False),
         Param('is_on_display', GET, int, required=False),
         Param('is_on_discount', GET, int, required=False),
-        Param('offset', GET, int),
+        Param('offset', GET, int, required=False),
         Param('limit', GET, int),
         Param('is_available', GET, str, required=False,
               rules=[Pattern(r"^[0-1]{1}$")]),
         Param('is_on_display', GET, str, required=False,
               rules=[Pattern(r"^[0-1]{1}$")]),
         Param('is_on_discount', GET, str, required=False,
-              rules=[Pattern(r"^[0-1]{1}$")])
+              rules=[Pattern(r"^[0-1]{1}$")]),
+
+        # 커서 페이지네이션: 응답의 next_cursor / prev_cursor 값을 그대로 넘김 (offset 대신 사용)
+        Param('cursor', GET, str, required=False),
+
+        # 상품명 검색 방식: exact(전체 일치), prefix(앞부분 일치), contains(부분 일치, 기본값)
+        Param('product_name_match', GET, str, required=False,
+              rules=[Pattern(r"^(exact|prefix|contains)$")])
     )
     def get_product_list(*args):
 
@@ -109,8 +116,10 @@ class ProductView:
             'is_available': args[6],
             'is_on_display': args[7],
             'is_on_discount': args[8],
-            'offset': args[9],
-            'limit': args[10]
+            'offset': args[9] if args[9] else 0,
+            'limit': args[10],
+            'cursor': args[14],
+            'product_name_match': args[15]
         }
 
         # offset 과 limit 에 음수가 들어오면 default 값 지정
@@ -153,6 +162,7 @@ class ProductView:
 
         Returns:
             200: 상품별 상세 정보
+            304: If-None-Match 의 ETag 가 최신 상품 정보와 같은 경우
             500: 데이터베이스 에러
 
         Authors:
@@ -184,6 +194,52 @@ class ProductView:
             except Exception as e:
                 return jsonify({'message': f'{e}'}), 500
 
+    @product_app.route("/details", methods=["GET"], endpoint='get_product_details')
+    @login_required
+    @validate_params(
+        Param('ids', GET, str,
+              rules=[Pattern(r"^\d+(,\d+)*$")])
+    )
+    def get_product_details(*args):
+
+        """ 여러 상품의 상세 정보를 한 번에 표출하는 엔드포인트
+
+        기획전 상품 편집처럼 상품 상세가 여러 개 필요한 화면에서 상품마다 요청하지 않도록
+        쿼리 파라미터로 상품 번호 목록(ids=1,2,3)을 받아 상품 번호별 상세 정보를 표출.
+
+        Args:
+            ids: 쉼표로 구분한 상품 번호 목록
+
+        Returns:
+            200: {'products': {상품 번호: 상품별 상세 정보}, 'not_found': 존재하지 않는 상품 번호 리스트}
+            400: TOO_MANY_PRODUCTS
+            401: INVALID_TOKEN
+            500: 데이터베이스 에러
+        """
+
+        # 중복된 상품 번호는 한 번만 조회 (요청 순서 유지)
+        product_nos = list(dict.fromkeys(int(product_no) for product_no in args[0].split(',')))
+
+        try:
+            db_connection = get_db_connection()
+            if db_connection:
+                product_service = ProductService()
+                product_details = product_service.get_product_details(product_nos, db_connection)
+                return product_details
+
+            else:
+                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+
+        except Exception as e:
+            return jsonify({'message': f'{e}'}), 500
+
+        finally:
+            try:
+                db_connection.close()
+
+            except Exception as e:
+                return jsonify({'message': f'{e}'}), 500
+
     @product_app.route("/category", methods=["GET"])
     @login_required
     @validate_params(
@@ -264,26 +320,15 @@ class ProductView:
         """
         first_category_no = args[0]
 
+        # 기준 데이터 캐시에서 응답하므로 데이터베이스 커넥션을 빌리지 않음
         try:
-            db_connection = get_db_connection()
-            if db_connection:
-                product_service = ProductService()
-                categories = product_service.get_second_categories(db_connection, first_category_no)
-                return categories
-
-            else:
-                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 400
+            product_service = ProductService()
+            categories = product_service.get_second_categories(first_category_no)
+            return categories
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
 
-        finally:
-            try:
-                db_connection.close()
-
-            except Exception as e:
-                return jsonify({'message': f'{e}'}), 500
-
     @product_app.route("/color", methods=["GET"])
     def get_color_filters():
 
@@ -291,6 +336,7 @@ class ProductView:
 
         Returns:
             200: 상품 등록시 선택할 수 있는 색상 필터
+            304: 클라이언트가 가진 목록이 최신인 경우
             500: 데이터 베이스 에러
 
         Authors:
@@ -299,26 +345,15 @@ class ProductView:
         History:
             2020-04-09 (leesh3@brandi.co.kr): 초기 생성
         """
+        # 기준 데이터 캐시에서 응답하므로 데이터베이스 커넥션을 빌리지 않음
         try:
-            db_connection = get_db_connection()
-            if db_connection:
-                product_service = ProductService()
-                get_color_result = product_service.get_color_filters(db_connection)
-                return get_color_result
-
-            else:
-                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+            product_service = ProductService()
+            get_color_result = product_service.get_color_filters()
+            return get_color_result
 
         except Exception as e:
             return jsonify({'message': f'{e}'}), 500
 
-        finally:
-            try:
-                db_connection.close()
-
-            except Exception as e:
-                return jsonify({'message': f'{e}'}), 500
-
     @product_app.route('', methods=['POST'], endpoint='insert_new_product')
     @login_required
     @validate_params(
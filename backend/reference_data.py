@@ -0,0 +1,241 @@
+import os
+import threading
+import time
+
+from flask import jsonify, request
+
+from connection import get_db_connection
+from utils import make_etag
+
+# 버전 스탬프를 다시 확인하기까지의 시간(초). 이 시간 동안은 데이터베이스에 접근하지 않고 메모리에서 응답한다.
+REFERENCE_VERSION_CHECK_INTERVAL = 10
+
+# 브라우저가 재요청 없이 응답을 재사용하는 시간(초). 이후에는 ETag 로 재검증해서 바뀌지 않았으면 304 를 받는다.
+REFERENCE_MAX_AGE = 60
+
+# 메모리에 올려두는 기준 데이터 테이블별 조회 쿼리
+REFERENCE_TABLE_STATEMENTS = {
+    'color_filters': """
+        SELECT
+            color_filter_no,
+            name_kr,
+            name_en,
+            image_url,
+            is_deleted
+        FROM
+            color_filters
+        WHERE NOT
+            color_filter_no = 19
+        ORDER BY
+            color_filter_no
+    """,
+    'event_types': """
+        SELECT
+            event_type_no as event_type_id,
+            name as event_type_name
+        FROM
+            event_types
+        ORDER BY
+            event_type_no
+    """,
+    'event_sorts': """
+        SELECT
+            event_type_id,
+            event_sort_no as event_sort_id,
+            name as event_sort_name
+        FROM
+            event_sorts
+        ORDER BY
+            event_sort_no
+    """,
+    'second_categories': """
+        SELECT
+            first_category_id,
+            second_category_no,
+            name
+        FROM
+            second_categories
+        ORDER BY
+            second_category_no
+    """,
+    'seller_types': """
+        SELECT
+            product_sort_id,
+            seller_type_no,
+            name as seller_type_name
+        FROM
+            seller_types
+        ORDER BY
+            seller_type_no
+    """
+}
+
+
+def group_rows(rows, group_key):
+
+    """ 조회 결과를 group_key 값별 리스트로 묶는다 (group_key 컬럼은 결과에서 뺀다)
+
+    Args:
+        rows: 조회 결과 리스트
+        group_key: 묶을 기준 컬럼명
+
+    Returns:
+        {group_key 값: [행, ...]}
+    """
+    groups = {}
+    for row in rows:
+        row = dict(row)
+        groups.setdefault(row.pop(group_key), []).append(row)
+    return groups
+
+
+class ReferenceDataCache:
+
+    def __init__(self, connection_factory=get_db_connection, check_interval=REFERENCE_VERSION_CHECK_INTERVAL):
+
+        """ 색상 필터, 기획전 타입/종류, 2차 카테고리, 셀러 속성처럼 거의 바뀌지 않는 기준 데이터 캐시
+
+        처음 사용할 때 기준 데이터 테이블을 한 번에 메모리로 읽어오고, 이후에는 메모리에서 응답한다.
+        check_interval 마다 reference_data_versions 테이블의 버전 스탬프를 확인해서
+        (기준 데이터 테이블의 트리거가 변경될 때마다 버전을 올린다) 바뀌었으면 다시 읽어온다.
+        버전 확인에 실패하면 기존 데이터로 계속 응답하고 다음 주기에 다시 확인한다.
+
+        Args:
+            connection_factory: 데이터베이스 커넥션을 만드는 함수
+            check_interval: 버전 스탬프 확인 주기(초)
+        """
+        self.connection_factory = connection_factory
+        self.check_interval = check_interval
+        self._tables = None
+        self._etags = {}
+        self._versions = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _read_versions(self, db_cursor):
+        db_cursor.execute("""
+            SELECT name, version
+            FROM reference_data_versions
+        """)
+        return {row['name']: row['version'] for row in db_cursor.fetchall()}
+
+    def _load(self, db_cursor, versions):
+        tables = {}
+        for name, statement in REFERENCE_TABLE_STATEMENTS.items():
+            db_cursor.execute(statement)
+            tables[name] = db_cursor.fetchall()
+
+        tables['event_sorts'] = group_rows(tables['event_sorts'], 'event_type_id')
+        tables['second_categories'] = group_rows(tables['second_categories'], 'first_category_id')
+        tables['seller_types'] = group_rows(tables['seller_types'], 'product_sort_id')
+
+        # 응답마다 해시를 계산하지 않도록 읽어올 때 ETag 를 같이 만들어 둔다.
+        etags = {}
+        for name, data in tables.items():
+            if isinstance(data, dict):
+                for key, rows in data.items():
+                    etags[(name, key)] = make_etag(name, key, rows)
+            else:
+                etags[(name, None)] = make_etag(name, data)
+
+        self._tables = tables
+        self._etags = etags
+        self._versions = versions
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._tables is not None and now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if self._tables is not None and now - self._checked_at < self.check_interval:
+                return
+
+            db_connection = None
+            try:
+                db_connection = self.connection_factory()
+                with db_connection.cursor() as db_cursor:
+                    # 버전을 먼저 읽어서, 읽어오는 도중에 바뀐 데이터는 다음 확인 때 다시 읽도록 한다.
+                    versions = self._read_versions(db_cursor)
+                    if self._tables is None or versions != self._versions:
+                        self._load(db_cursor, versions)
+                self._checked_at = now
+
+            except Exception as e:
+                # 처음 읽어오는 경우에는 응답할 데이터가 없으므로 에러를 그대로 올린다.
+                if self._tables is None:
+                    raise
+                print(f'REFERENCE_DATA_REFRESH_ERROR_WITH {e}')
+                self._checked_at = now
+
+            finally:
+                if db_connection is not None:
+                    db_connection.close()
+
+    def get(self, name, key=None):
+
+        """ 기준 데이터 조회
+
+        Args:
+            name: 테이블명 (REFERENCE_TABLE_STATEMENTS 의 키)
+            key: 묶여있는 테이블의 기준 값 (event_sorts: 기획전 타입, second_categories: 1차 카테고리,
+                 seller_types: 상품 분류)
+
+        Returns:
+            (행 리스트, ETag). 묶여있는 테이블에 key 가 없으면 ([], None)
+        """
+        self._refresh()
+        tables, etags = self._tables, self._etags
+        if key is None:
+            return tables[name], etags[(name, None)]
+        return tables[name].get(key, []), etags.get((name, key), None)
+
+    def make_response(self, name, result_key, key=None):
+
+        """ 기준 데이터를 ETag, Cache-Control 헤더와 함께 응답으로 만든다
+
+        요청의 If-None-Match 가 현재 ETag 와 같으면 본문 없이 304 를 리턴한다.
+        로그인한 사용자만 볼 수 있는 응답도 있으므로 공유 캐시에는 저장되지 않도록 private 으로 지정한다.
+
+        Args:
+            name: 테이블명
+            result_key: 응답 json 의 키
+            key: 묶여있는 테이블의 기준 값
+
+        Returns:
+            200: {result_key: 기준 데이터 리스트}
+            304: 클라이언트가 가진 데이터가 최신인 경우
+        """
+        rows, etag = self.get(name, key)
+        response = jsonify({result_key: rows})
+        if etag:
+            response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.max_age = REFERENCE_MAX_AGE
+        return response.make_conditional(request)
+
+
+# 프로세스마다 하나씩 만들어지는 캐시
+_reference_data = None
+_reference_data_pid = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_data():
+
+    """ 현재 프로세스의 기준 데이터 캐시를 리턴하고, 없으면 새로 만든다
+
+    fork 된 워커 프로세스에서는 부모의 lock 상태를 물려받지 않도록 pid 가 바뀌면 새로 만든다.
+
+    Returns:
+        ReferenceDataCache 객체
+    """
+    global _reference_data, _reference_data_pid
+
+    pid = os.getpid()
+    if _reference_data is None or _reference_data_pid != pid:
+        with _reference_data_lock:
+            if _reference_data is None or _reference_data_pid != pid:
+                _reference_data = ReferenceDataCache()
+                _reference_data_pid = pid
+    return _reference_data
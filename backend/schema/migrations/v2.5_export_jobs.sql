@@ -0,0 +1,31 @@
+-- brandi_schema_v2.4 이후 증분 마이그레이션
+-- 셀러 리스트 엑셀 다운로드 같은 오래 걸리는 내보내기 작업을 비동기로 처리하기 위한 작업 테이블
+use brandi;
+
+-- export_jobs Table Create SQL
+CREATE TABLE export_jobs
+(
+    `export_job_no`    INT             NOT NULL    AUTO_INCREMENT COMMENT 'id',
+    `job_type`         VARCHAR(45)     NOT NULL    COMMENT '작업 종류(seller_list)',
+    `params`           TEXT            NOT NULL    COMMENT '검색 조건(json)',
+    `params_hash`      CHAR(64)        NOT NULL    COMMENT '작업 종류 + 검색 조건 sha256',
+    `inflight_key`     CHAR(64)        NULL        COMMENT '진행중인 같은 작업의 중복 요청 방지 키, 작업이 끝나면 NULL',
+    `status`           VARCHAR(20)     NOT NULL    DEFAULT 'pending' COMMENT '상태(pending, running, done, failed)',
+    `total_count`      INT             NULL        COMMENT '내보낼 전체 행 수',
+    `processed_count`  INT             NOT NULL    DEFAULT 0 COMMENT '처리된 행 수',
+    `file_url`         VARCHAR(500)    NULL        COMMENT '완료된 파일 다운로드 url',
+    `error_message`    VARCHAR(500)    NULL        COMMENT '실패 사유',
+    `attempts`         INT             NOT NULL    DEFAULT 0 COMMENT '실행 시도 횟수',
+    `requester`        INT             NOT NULL    COMMENT '요청자',
+    `created_at`       DATETIME        NOT NULL    DEFAULT CURRENT_TIMESTAMP COMMENT '요청 일시',
+    `started_at`       DATETIME        NULL        COMMENT '실행 시작 일시',
+    `heartbeat_at`     DATETIME        NULL        COMMENT '실행중인 워커가 마지막으로 진행상황을 기록한 일시',
+    `finished_at`      DATETIME        NULL        COMMENT '완료(실패) 일시',
+    PRIMARY KEY (export_job_no),
+    UNIQUE KEY UX_export_jobs_inflight_key (inflight_key),
+    KEY IX_export_jobs_status_created_at (status, created_at)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci COMMENT '비동기 내보내기 작업';
+
+ALTER TABLE export_jobs
+    ADD CONSTRAINT FK_export_jobs_requester FOREIGN KEY (requester)
+        REFERENCES accounts (account_no);
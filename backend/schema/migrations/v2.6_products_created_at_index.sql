@@ -0,0 +1,7 @@
+-- v2.5 이후 증분 마이그레이션
+-- 상품 리스트 커서 페이지네이션 (등록일시, 상품번호) 를 위한 인덱스
+-- ORDER BY created_at DESC, product_no DESC 와 커서 조건을 인덱스 범위 검색으로 처리한다.
+use brandi;
+
+ALTER TABLE products
+    ADD INDEX IX_products_created_at_product_no (created_at, product_no);
@@ -0,0 +1,47 @@
+-- v2.6 이후 증분 마이그레이션
+-- 선분이력 테이블의 최신 이력(close_time = '2037-12-31 23:59:59') 조회 패턴에 맞춘 복합 인덱스
+-- foreign key 컬럼이 맨 앞에 오는 인덱스를 만들면 mysql 이 foreign key 용으로 자동 생성한 인덱스는 대신 사용되지 않는다.
+-- 적용 후 python -m benchmarks.explain_check 로 DAO 쿼리에 full table scan 이 없는지 확인한다.
+use brandi;
+
+-- seller_infos
+-- 셀러 계정별 최신 이력 조회 (셀러 상세, 셀러 정보 수정, 셀러 상태 변경, 상품 등록 셀러 확인)
+-- 셀러 리스트: 최신 이력만 seller_account_id 순서로 읽기 (offset/커서 페이지네이션)
+-- 셀러 한글명/영문명 중복 확인
+ALTER TABLE seller_infos
+    ADD INDEX IX_seller_infos_seller_account_id_close_time (seller_account_id, close_time),
+    ADD INDEX IX_seller_infos_close_time_seller_account_id (close_time, seller_account_id),
+    ADD INDEX IX_seller_infos_name_kr (name_kr),
+    ADD INDEX IX_seller_infos_name_en (name_en);
+
+-- manager_infos
+-- 셀러 정보 이력별 담당자 조회, 셀러 리스트의 대표 담당자(ranking = 1) 조인
+ALTER TABLE manager_infos
+    ADD INDEX IX_manager_infos_seller_info_id_ranking (seller_info_id, ranking);
+
+-- product_infos
+-- 상품별 최신 이력 조회 (상품 상세, 상품 수정, 이전 이력 닫기)
+-- 셀러별 최신 상품 수 (셀러 리스트의 product_count)
+ALTER TABLE product_infos
+    ADD INDEX IX_product_infos_product_id_close_time (product_id, close_time),
+    ADD INDEX IX_product_infos_seller_id_close_time (seller_id, close_time);
+
+-- product_images
+-- 상품 정보 이력별 대표 이미지(image_order = 1) 와 크기별 이미지 조회, 상품 수정시 이미지 복사
+ALTER TABLE product_images
+    ADD INDEX IX_product_images_info_order_size (product_info_id, image_order, image_size_id);
+
+-- event_infos
+-- 기획전별 최신 이력 조회 (기획전 상세, 기획전 수정)
+ALTER TABLE event_infos
+    ADD INDEX IX_event_infos_event_id_close_time (event_id, close_time);
+
+-- event_detail_product_infos
+-- 기획전 정보 이력별 상품 목록(상품 순서대로), 기획전 상품 수
+ALTER TABLE event_detail_product_infos
+    ADD INDEX IX_event_detail_product_infos_event_info_id_order (event_info_id, product_order);
+
+-- seller_status_change_histories
+-- 셀러 상태 변경 이력 (변경 시각 순서)
+ALTER TABLE seller_status_change_histories
+    ADD INDEX IX_status_change_histories_account_changed_time (seller_account_id, changed_time);
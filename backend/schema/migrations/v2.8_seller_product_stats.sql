@@ -0,0 +1,35 @@
+-- v2.7 이후 증분 마이그레이션
+-- 셀러 리스트의 셀러별 상품 수를 행마다 product_infos 를 세는 서브쿼리 대신 미리 세어둔 카운터 테이블에서 읽는다.
+-- 상품 등록/셀러 변경 트랜잭션 안에서 ProductDao.change_seller_product_count 로 갱신된다.
+-- 카운터가 맞지 않으면 FLASK_APP=app flask rebuild-seller-product-stats 로 다시 계산한다.
+use brandi;
+
+-- seller_product_stats Table Create SQL
+CREATE TABLE seller_product_stats
+(
+    `seller_account_id`  INT         NOT NULL    COMMENT '셀러 계정 아이디',
+    `product_count`      INT         NOT NULL    DEFAULT 0 COMMENT '최신 이력 기준 상품 수',
+    `updated_at`         DATETIME    NOT NULL    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '갱신일시',
+    PRIMARY KEY (seller_account_id)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci COMMENT '셀러별 상품 수';
+
+ALTER TABLE seller_product_stats
+    ADD CONSTRAINT FK_seller_product_stats_seller_account_id FOREIGN KEY (seller_account_id)
+        REFERENCES seller_accounts (seller_account_no);
+
+-- 기존 데이터 채우기
+INSERT INTO seller_product_stats
+(
+    seller_account_id,
+    product_count
+)
+SELECT
+    seller_accounts.seller_account_no,
+    COUNT(product_infos.product_info_no)
+FROM
+    seller_accounts
+LEFT JOIN product_infos
+    ON product_infos.seller_id = seller_accounts.seller_account_no
+    AND product_infos.close_time = '2037-12-31 23:59:59'
+GROUP BY
+    seller_accounts.seller_account_no;
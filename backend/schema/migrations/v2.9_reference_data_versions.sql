@@ -0,0 +1,64 @@
+-- v2.8 이후 증분 마이그레이션
+-- 기준 데이터(색상 필터, 기획전 타입/종류, 2차 카테고리, 셀러 속성) 버전 스탬프
+-- 각 프로세스의 ReferenceDataCache 는 기준 데이터를 메모리에서 응답하고, 주기적으로 이 테이블의 버전만 확인해서 바뀌었으면 다시 읽어온다.
+-- 기준 데이터 테이블이 어떤 경로로 변경되어도 버전이 올라가도록 트리거로 갱신한다.
+use brandi;
+
+-- reference_data_versions Table Create SQL
+CREATE TABLE reference_data_versions
+(
+    `name`        VARCHAR(45)    NOT NULL    COMMENT '기준 데이터 테이블명',
+    `version`     INT            NOT NULL    DEFAULT 1 COMMENT '버전',
+    `updated_at`  DATETIME       NOT NULL    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '갱신일시',
+    PRIMARY KEY (name)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci COMMENT '기준 데이터 버전';
+
+INSERT INTO reference_data_versions
+(
+    name
+) VALUES
+    ('color_filters'),
+    ('event_types'),
+    ('event_sorts'),
+    ('second_categories'),
+    ('seller_types');
+
+-- color_filters
+CREATE TRIGGER TR_color_filters_ai AFTER INSERT ON color_filters FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'color_filters';
+CREATE TRIGGER TR_color_filters_au AFTER UPDATE ON color_filters FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'color_filters';
+CREATE TRIGGER TR_color_filters_ad AFTER DELETE ON color_filters FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'color_filters';
+
+-- event_types
+CREATE TRIGGER TR_event_types_ai AFTER INSERT ON event_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_types';
+CREATE TRIGGER TR_event_types_au AFTER UPDATE ON event_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_types';
+CREATE TRIGGER TR_event_types_ad AFTER DELETE ON event_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_types';
+
+-- event_sorts
+CREATE TRIGGER TR_event_sorts_ai AFTER INSERT ON event_sorts FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_sorts';
+CREATE TRIGGER TR_event_sorts_au AFTER UPDATE ON event_sorts FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_sorts';
+CREATE TRIGGER TR_event_sorts_ad AFTER DELETE ON event_sorts FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'event_sorts';
+
+-- second_categories
+CREATE TRIGGER TR_second_categories_ai AFTER INSERT ON second_categories FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'second_categories';
+CREATE TRIGGER TR_second_categories_au AFTER UPDATE ON second_categories FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'second_categories';
+CREATE TRIGGER TR_second_categories_ad AFTER DELETE ON second_categories FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'second_categories';
+
+-- seller_types
+CREATE TRIGGER TR_seller_types_ai AFTER INSERT ON seller_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'seller_types';
+CREATE TRIGGER TR_seller_types_au AFTER UPDATE ON seller_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'seller_types';
+CREATE TRIGGER TR_seller_types_ad AFTER DELETE ON seller_types FOR EACH ROW
+    UPDATE reference_data_versions SET version = version + 1 WHERE name = 'seller_types';
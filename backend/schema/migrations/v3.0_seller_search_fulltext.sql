@@ -0,0 +1,17 @@
+-- v2.9 이후 증분 마이그레이션
+-- 셀러 리스트의 셀러 한글명, 담당자 연락처 부분 일치 검색을 위한 ngram FULLTEXT 인덱스
+-- LIKE '%키워드%' 는 인덱스를 사용할 수 없으므로 MATCH ... AGAINST 구문 검색으로 후보를 먼저 좁히고 LIKE 로 다시 확인한다.
+-- 토큰 크기는 서버 설정 ngram_token_size(기본값 2)를 따르며 utils.NGRAM_TOKEN_SIZE 와 같아야 한다.
+use brandi;
+
+-- 기본 stopword 목록('a', 'is' 등)이 들어간 토큰은 ngram 인덱스에서 빠져서 부분 일치 결과가 달라지므로
+-- stopword 없이 인덱스를 만든다. (인덱스를 만들 때의 설정이 인덱스에 적용된다)
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE seller_infos
+    ADD FULLTEXT INDEX FT_seller_infos_name_kr (name_kr) WITH PARSER ngram;
+
+ALTER TABLE manager_infos
+    ADD FULLTEXT INDEX FT_manager_infos_contact_number (contact_number) WITH PARSER ngram;
+
+SET SESSION innodb_ft_enable_stopword = ON;
@@ -0,0 +1,49 @@
+-- v3.0 이후 증분 마이그레이션
+-- 상품 리스트의 상품명 부분 일치/앞부분 일치 검색을 위한 검색 테이블
+-- product_infos 에는 모든 이력이 쌓이므로 상품마다 최신 이력의 상품명 한 행만 따로 두고 인덱스를 건다.
+--   - 앞부분 일치: IX_product_name_search_name (B-tree) 범위 검색
+--   - 부분 일치: FT_product_name_search_name (ngram FULLTEXT) 구문 검색 후 LIKE 로 다시 확인
+-- 상품 등록/수정 트랜잭션 안에서 ProductDao.change_product_name_search 로 갱신된다.
+-- 맞지 않으면 FLASK_APP=app flask rebuild-product-name-search 로 다시 채운다.
+use brandi;
+
+-- product_name_search Table Create SQL
+CREATE TABLE product_name_search
+(
+    `product_id`       INT            NOT NULL    COMMENT '상품 아이디',
+    `product_info_id`  INT            NOT NULL    COMMENT '최신 상품 정보 아이디',
+    `name`             VARCHAR(45)    NOT NULL    COMMENT '최신 이력 기준 상품명',
+    `updated_at`       DATETIME       NOT NULL    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '갱신일시',
+    PRIMARY KEY (product_id)
+)ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci COMMENT '상품명 검색';
+
+ALTER TABLE product_name_search
+    ADD CONSTRAINT FK_product_name_search_product_id FOREIGN KEY (product_id)
+        REFERENCES products (product_no);
+
+ALTER TABLE product_name_search
+    ADD INDEX IX_product_name_search_name (name);
+
+-- 기본 stopword 가 들어간 토큰이 빠지지 않도록 stopword 없이 인덱스를 만든다. (v3.0 참고)
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE product_name_search
+    ADD FULLTEXT INDEX FT_product_name_search_name (name) WITH PARSER ngram;
+
+SET SESSION innodb_ft_enable_stopword = ON;
+
+-- 기존 데이터 채우기
+INSERT INTO product_name_search
+(
+    product_id,
+    product_info_id,
+    name
+)
+SELECT
+    product_id,
+    product_info_no,
+    name
+FROM
+    product_infos
+WHERE
+    close_time = '2037-12-31 23:59:59';
@@ -0,0 +1,36 @@
+-- v3.1 이후 증분 마이그레이션
+-- 기획전 리스트를 최신 이력만, 기획전 상품 수를 행마다 세지 않고, 이름 검색은 인덱스로 처리하도록 변경
+use brandi;
+
+-- 기획전 정보 이력별 기획전 상품 수
+-- 기획전 상품은 이력을 만들 때만 추가되므로 이력을 INSERT 할 때 같이 저장한다. (EventDao 의 기획전 등록/수정)
+ALTER TABLE event_infos
+    ADD COLUMN `product_count` INT NOT NULL DEFAULT 0 COMMENT '기획전 상품 수' AFTER `youtube_url`;
+
+-- 기존 이력의 상품 수 채우기
+UPDATE
+    event_infos
+INNER JOIN (
+    SELECT
+        event_info_id,
+        COUNT(0) AS product_count
+    FROM
+        event_detail_product_infos
+    GROUP BY
+        event_info_id
+) AS event_product_counts
+    ON event_product_counts.event_info_id = event_infos.event_info_no
+SET
+    event_infos.product_count = event_product_counts.product_count;
+
+-- 기획전 리스트: 최신 이력만 event_info_no 순서로 읽기 (offset 페이지네이션)
+ALTER TABLE event_infos
+    ADD INDEX IX_event_infos_close_time_event_info_no (close_time, event_info_no);
+
+-- 기획전 이름 부분 일치 검색 (ngram 구문 검색 후 LIKE 로 다시 확인, v3.0 참고)
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE event_infos
+    ADD FULLTEXT INDEX FT_event_infos_name (name) WITH PARSER ngram;
+
+SET SESSION innodb_ft_enable_stopword = ON;
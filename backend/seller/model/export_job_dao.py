@@ -0,0 +1,271 @@
+from mysql.connector.errors import IntegrityError
+
+# 내보내기 작업 상태
+EXPORT_JOB_PENDING = 'pending'
+EXPORT_JOB_RUNNING = 'running'
+EXPORT_JOB_DONE = 'done'
+EXPORT_JOB_FAILED = 'failed'
+
+
+class ExportJobDao:
+    """ 내보내기 작업 모델
+
+    요청 처리 중과 내보내기 워커 스레드 양쪽에서 사용하기 때문에 jsonify 응답을 만들지 않고,
+    조회 결과를 그대로 리턴하고 데이터베이스 에러는 호출한 쪽에서 처리한다.
+    """
+
+    # noinspection PyMethodMayBeStatic
+    def create_export_job(self, job_info, db_connection):
+
+        """ 내보내기 작업 등록 INSERT INTO DB
+        같은 작업 종류와 검색 조건으로 진행중인 작업이 있으면 새로 만들지 않고 진행중인 작업을 리턴한다.
+        진행중인 작업은 inflight_key(UNIQUE) 에 params_hash 를 가지고 있어서 동시에 들어온 요청도 하나만 등록된다.
+
+        Args:
+            job_info:
+                job_type: 작업 종류
+                params: 검색 조건 json 문자열
+                params_hash: 작업 종류 + 검색 조건 해시
+                requester: 요청자 계정 번호
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            (export_job_no, 새로 등록했는지 여부)
+        """
+        try:
+            with db_connection as db_cursor:
+                insert_export_job_statement = """
+                    INSERT INTO export_jobs
+                    (
+                        job_type,
+                        params,
+                        params_hash,
+                        inflight_key,
+                        requester
+                    ) VALUES (
+                        %(job_type)s,
+                        %(params)s,
+                        %(params_hash)s,
+                        %(params_hash)s,
+                        %(requester)s
+                    )
+                """
+                db_cursor.execute(insert_export_job_statement, job_info)
+                export_job_no = db_cursor.lastrowid
+                db_connection.commit()
+                return export_job_no, True
+
+        # 진행중인 같은 작업이 있으면 그 작업 번호를 리턴
+        except IntegrityError:
+            db_connection.rollback()
+            with db_connection as db_cursor:
+                db_cursor.execute("""
+                    SELECT export_job_no
+                    FROM export_jobs
+                    WHERE inflight_key = %(params_hash)s
+                """, job_info)
+                export_job = db_cursor.fetchone()
+
+            # 조회 직전에 작업이 끝났으면 다시 등록
+            if not export_job:
+                return self.create_export_job(job_info, db_connection)
+            return export_job['export_job_no'], False
+
+    # noinspection PyMethodMayBeStatic
+    def get_export_job(self, export_job_no, db_connection):
+
+        """ 내보내기 작업 상태 조회
+
+        Args:
+            export_job_no: 작업 번호
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            작업 정보 dict, 없으면 None
+        """
+        with db_connection as db_cursor:
+            db_cursor.execute("""
+                SELECT
+                    export_job_no,
+                    job_type,
+                    status,
+                    total_count,
+                    processed_count,
+                    file_url,
+                    error_message,
+                    requester,
+                    created_at,
+                    started_at,
+                    finished_at
+                FROM export_jobs
+                WHERE export_job_no = %(export_job_no)s
+            """, {'export_job_no': export_job_no})
+            return db_cursor.fetchone()
+
+    # noinspection PyMethodMayBeStatic
+    def get_runnable_export_jobs(self, lease_seconds, limit, db_connection):
+
+        """ 실행할 수 있는 내보내기 작업 목록 조회
+        대기중인 작업과, 실행중이지만 lease_seconds 동안 진행상황 기록이 없는 작업(워커가 재시작된 경우)을 오래된 순서로 가져온다.
+
+        Args:
+            lease_seconds: 실행중인 작업을 다른 워커가 가져갈 수 있게 되는 시간(초)
+            limit: 최대 개수
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            [{'export_job_no', 'job_type', 'params', 'attempts'}, ...]
+        """
+        with db_connection as db_cursor:
+            db_cursor.execute("""
+                SELECT export_job_no, job_type, params, attempts
+                FROM export_jobs
+                WHERE status = 'pending'
+                OR (status = 'running' AND heartbeat_at < NOW() - INTERVAL %(lease_seconds)s SECOND)
+                ORDER BY created_at ASC
+                LIMIT %(limit)s
+            """, {'lease_seconds': lease_seconds, 'limit': limit})
+            return db_cursor.fetchall()
+
+    # noinspection PyMethodMayBeStatic
+    def claim_export_job(self, export_job, lease_seconds, db_connection):
+
+        """ 내보내기 작업을 실행 상태로 바꿔서 이 워커가 가져감
+        조회 이후 다른 워커가 먼저 가져갔으면 바뀌는 행이 없으므로 False 를 리턴한다.
+
+        Args:
+            export_job: get_runnable_export_jobs 로 조회한 작업
+            lease_seconds: 실행중인 작업을 다른 워커가 가져갈 수 있게 되는 시간(초)
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            가져왔으면 True
+        """
+        with db_connection as db_cursor:
+            db_cursor.execute("""
+                UPDATE export_jobs
+                SET
+                    status = 'running',
+                    attempts = attempts + 1,
+                    started_at = NOW(),
+                    heartbeat_at = NOW()
+                WHERE export_job_no = %(export_job_no)s
+                AND attempts = %(attempts)s
+                AND (
+                    status = 'pending'
+                    OR (status = 'running' AND heartbeat_at < NOW() - INTERVAL %(lease_seconds)s SECOND)
+                )
+            """, {
+                'export_job_no': export_job['export_job_no'],
+                'attempts': export_job['attempts'],
+                'lease_seconds': lease_seconds
+            })
+            # rowcount 는 값이 바뀐 행 수지만, 가져오면서 attempts 가 항상 바뀌므로 조건에 맞은 행 수와 같다
+            claimed = db_cursor.rowcount == 1
+        db_connection.commit()
+        return claimed
+
+    # noinspection PyMethodMayBeStatic
+    def is_claimed_export_job(self, export_job_no, attempts, db_cursor):
+
+        """ 작업을 attempts 번째 시도로 가져간 워커가 아직 실행중인지 확인
+        mysql 의 UPDATE rowcount 는 조건에 맞은 행이 아니라 값이 바뀐 행 수라서, rowcount 가 0 일 때 작업을 잃었는지 구분하는데 사용한다.
+
+        Args:
+            export_job_no: 작업 번호
+            attempts: 작업을 가져올 때 기록된 시도 횟수
+            db_cursor: UPDATE 를 실행한 database cursor
+
+        Returns:
+            아직 attempts 번째 시도로 실행중이면 True
+        """
+        db_cursor.execute("""
+            SELECT export_job_no
+            FROM export_jobs
+            WHERE export_job_no = %(export_job_no)s
+            AND attempts = %(attempts)s
+            AND status = 'running'
+        """, {
+            'export_job_no': export_job_no,
+            'attempts': attempts
+        })
+        return db_cursor.fetchone() is not None
+
+    # noinspection PyMethodMayBeStatic
+    def update_export_job_progress(self, export_job_no, attempts, processed_count, total_count, db_connection):
+
+        """ 내보내기 작업 진행상황 기록 (실행중인 워커가 살아있다는 기록도 같이 갱신)
+        lease 가 만료되어 다른 워커가 작업을 다시 가져갔으면 attempts 가 달라져서 기록되지 않는다.
+
+        Args:
+            export_job_no: 작업 번호
+            attempts: 작업을 가져올 때 기록된 시도 횟수
+            processed_count: 처리된 행 수
+            total_count: 전체 행 수
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            기록되었는지 여부 (False 면 작업을 더 이상 가지고 있지 않음)
+        """
+        with db_connection as db_cursor:
+            db_cursor.execute("""
+                UPDATE export_jobs
+                SET
+                    processed_count = %(processed_count)s,
+                    total_count = %(total_count)s,
+                    heartbeat_at = NOW()
+                WHERE export_job_no = %(export_job_no)s
+                AND attempts = %(attempts)s
+                AND status = 'running'
+            """, {
+                'export_job_no': export_job_no,
+                'attempts': attempts,
+                'processed_count': processed_count,
+                'total_count': total_count
+            })
+            # 마지막 기록이 바로 앞 기록과 같은 초에 같은 값이면 바뀐 행이 없어서 rowcount 가 0 이므로 작업을 가지고 있는지 다시 확인
+            updated = db_cursor.rowcount == 1 or self.is_claimed_export_job(export_job_no, attempts, db_cursor)
+        db_connection.commit()
+        return updated
+
+    # noinspection PyMethodMayBeStatic
+    def finish_export_job(self, export_job_no, attempts, status, file_url, error_message, db_connection):
+
+        """ 내보내기 작업 완료(실패) 기록
+        작업이 끝났으므로 inflight_key 를 비워서 같은 조건의 새 요청이 다시 등록될 수 있게 한다.
+        다른 워커가 작업을 다시 가져갔으면 그 워커의 결과를 덮어쓰지 않도록 기록하지 않는다.
+
+        Args:
+            export_job_no: 작업 번호
+            attempts: 작업을 가져올 때 기록된 시도 횟수
+            status: done 또는 failed
+            file_url: 완료된 파일 url
+            error_message: 실패 사유
+            db_connection: 연결된 database connection 객체
+
+        Returns:
+            기록되었는지 여부
+        """
+        with db_connection as db_cursor:
+            db_cursor.execute("""
+                UPDATE export_jobs
+                SET
+                    status = %(status)s,
+                    file_url = %(file_url)s,
+                    error_message = %(error_message)s,
+                    inflight_key = NULL,
+                    finished_at = NOW()
+                WHERE export_job_no = %(export_job_no)s
+                AND attempts = %(attempts)s
+                AND status = 'running'
+            """, {
+                'export_job_no': export_job_no,
+                'attempts': attempts,
+                'status': status,
+                'file_url': file_url,
+                'error_message': error_message[:500] if error_message else None
+            })
+            # 조건에 맞으면 status 가 항상 바뀌지만, 다른 기록과 같은 규칙으로 rowcount 가 0 이면 다시 확인
+            finished = db_cursor.rowcount == 1 or self.is_claimed_export_job(export_job_no, attempts, db_cursor)
+        db_connection.commit()
+        return finished
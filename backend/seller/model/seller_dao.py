@@ -1,8 +1,47 @@
-import pandas as pd, uuid, os
-from flask import jsonify
+import json
+import uuid
+from datetime import datetime
+
+from flask import jsonify, Response
 from mysql.connector.errors import Error
 
-from connection import get_s3_connection
+from connection import get_s3_connection, DatabaseConnection, bulk_insert
+from cache import invalidate_account, get_cached_count, invalidate_counts, SELLER_COUNT, PRODUCT_COUNT
+from reference_data import get_reference_data
+from excel_exporter import write_xlsx_to_s3, iter_xlsx, XLSX_CONTENT_TYPE
+from utils import S3_BUCKET_NAME, encode_cursor, decode_cursor, make_ngram_search_phrase
+
+# 셀러 리스트 엑셀 파일의 컬럼명과 쿼리 결과 key (첫 컬럼은 1부터 시작하는 번호)
+SELLER_EXCEL_COLUMNS = (
+    ('셀러번호', 'seller_account_id'),
+    ('관리자계정ID', 'login_id'),
+    ('셀러영문명', 'name_en'),
+    ('셀러한글명', 'name_kr'),
+    ('브랜디회원번호', 'brandi_app_user_id'),
+    ('담당자명', 'manager_name'),
+    ('담당자전화번호', 'manager_contact_number'),
+    ('판매구분', 'seller_type_name'),
+    ('상품개수', 'product_count'),
+    ('셀러URL', 'site_url'),
+    ('셀러등록일', 'created_at'),
+    ('승인여부', 'seller_status'),
+)
+SELLER_EXCEL_HEADER = ['번호'] + [column_name for column_name, _ in SELLER_EXCEL_COLUMNS]
+
+# 엑셀 파일을 만들 때 데이터베이스에서 한 번에 읽어오는 행 수
+SELLER_EXCEL_CHUNK_SIZE = 1000
+
+# 셀러 상세의 담당자 최대 수
+SELLER_MANAGER_LIMIT = 3
+
+# 셀러 상세 쿼리에서 json 으로 묶어서 가져오는 상태 변경 일시의 형식
+SELLER_HISTORY_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 셀러 상태 일괄 변경 요청 하나에 넣을 수 있는 최대 셀러 수
+SELLER_STATUS_BULK_LIMIT = 1000
+
+# 셀러 상태 일괄 변경에서 multi-row INSERT 로 넣는 상태 변경 이력 컬럼
+SELLER_STATUS_HISTORY_COLUMNS = ('seller_account_id', 'changed_time', 'seller_status_id', 'modifier')
 
 
 class SellerDao:
@@ -142,6 +181,9 @@ class SellerDao:
                 # 실행 결과 반영
                 db_connection.commit()
 
+                # 로그인 인증에 사용하는 계정 상태 캐시 무효화
+                invalidate_account(change_info['parameter_account_no'])
+
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError:
@@ -190,6 +232,7 @@ class SellerDao:
                 }
 
                 # seller_info 테이블 SELECT (get 기본 정보)
+                # 담당자 정보와 셀러 상태 변경 기록은 json 배열로 묶어서 같은 쿼리에서 가져옴 (데이터베이스 왕복 1회)
                 select_seller_info_statement = """
                     SELECT 
                         seller_info_no,
@@ -199,6 +242,7 @@ class SellerDao:
                         CS03.name as seller_status_name,
                         CS04.seller_type_no as seller_type_no,
                         CS04.name as seller_type_name,
+                        CS02.product_sort_id as product_sort_id,
                         CS05.account_no as account_no,
                         CS05.login_id as account_login_id,
                         CS06.app_user_no as brandi_app_user_no,
@@ -229,7 +273,52 @@ class SellerDao:
                         weekend_end_time,
                         bank_name,
                         bank_holder_name,
-                        account_number
+                        account_number,
+                        
+                        -- 담당자 정보
+                        (
+                            SELECT
+                                JSON_ARRAYAGG(JSON_OBJECT(
+                                    'name', MI02.name,
+                                    'contact_number', MI02.contact_number,
+                                    'email', MI02.email,
+                                    'ranking', MI02.ranking
+                                ))
+                            
+                            FROM
+                                manager_infos AS MI02
+                            
+                            WHERE
+                                MI02.seller_info_id = CS02.seller_info_no
+                                AND MI02.is_deleted = 0
+                        ) as manager_infos,
+                        
+                        -- 셀러 상태 변경 기록
+                        (
+                            SELECT
+                                JSON_ARRAYAGG(JSON_OBJECT(
+                                    'changed_time', DATE_FORMAT(SH02.changed_time, '%%Y-%%m-%%d %%H:%%i:%%s'),
+                                    'seller_status_name', SH03.name,
+                                    'modifier', SH04.login_id
+                                ))
+                            
+                            FROM
+                                seller_status_change_histories as SH02
+
+                            -- 셀러 상태명
+                            INNER JOIN
+                                seller_statuses as SH03
+                                ON SH02.seller_status_id = SH03.status_no
+
+                            -- 수정자 로그인아이디
+                            LEFT JOIN
+                                accounts as SH04
+                                ON SH04.account_no = CS01.account_id
+
+                            WHERE 
+                                SH02.seller_account_id = CS01.seller_account_no
+                                AND SH04.is_deleted = 0
+                        ) as seller_status_change_histories
                     
                     FROM seller_accounts AS CS01
                     
@@ -272,123 +361,21 @@ class SellerDao:
                 if seller_info_result is None:
                     return seller_info_result
 
-                # 담당자 정보
-                # SELECT 문 조건 데이터
-                seller_info_no_data = {
-                    'seller_info_no': seller_info_result['seller_info_no']
-                }
-                # manager_infos 테이블 SELECT(get *)
-                select_manager_infos_statement = """
-                                SELECT
-                                    MI02.name,
-                                    MI02.contact_number,
-                                    MI02.email,
-                                    MI02.ranking
-                                    
-                                FROM 
-                                    seller_infos AS MI01
-                                
-                                INNER JOIN 
-                                    manager_infos AS MI02
-                                    ON MI01.seller_info_no = MI02.seller_info_id
-                                
-                                WHERE 
-                                    seller_info_no = %(seller_info_no)s
-                                    AND MI02.is_deleted = 0
-                                
-                                LIMIT 3
-                            """
-
-                # SELECT 문 실행
-                db_cursor.execute(select_manager_infos_statement, seller_info_no_data)
-
-                # manager_infos 출력 결과 저장
-                manager_infos = db_cursor.fetchall()
-
-                # seller_info_result 에 manager_info 저장
-                seller_info_result['manager_infos'] = [info for info in manager_infos]
-
-                # 셀러 상태 변경 기록
-                # SELECT 문 조건 데이터
-                account_info_data = {
-                    'seller_account_id': seller_info_result['seller_account_id']
-                }
-
-                # seller_status_change_histories 테이블 SELECT
-                select_status_history_statement = """
-                                SELECT
-                                    changed_time,
-                                    SH03.name as seller_status_name,
-                                    SH04.login_id as modifier
-                                
-                                FROM
-                                    seller_accounts as SH01
-
-                                -- 셀러상태이력 기본정보
-                                INNER JOIN
-                                    seller_status_change_histories as SH02
-                                    ON SH01.seller_account_no = SH02.seller_account_id
-
-                                -- 셀러 상태명
-                                INNER JOIN
-                                    seller_statuses as SH03
-                                    ON SH02.seller_status_id = SH03.status_no
-
-                                -- 수정자 로그인아이디
-                                LEFT JOIN
-                                    accounts as SH04
-                                    ON SH04.account_no = SH01.account_id
-
-                                WHERE 
-                                    SH01.seller_account_no = %(seller_account_id)s
-                                    AND SH04.is_deleted = 0
-                                
-                                ORDER BY changed_time
-                            """
-
-                # SELECT 문 실행
-                db_cursor.execute(select_status_history_statement, account_info_data)
-
-                # seller_status_change_histories 출력 결과 저장
-                status_histories = db_cursor.fetchall()
+                # 담당자 정보: 순위순으로 최대 3명
+                manager_infos = json.loads(seller_info_result['manager_infos'] or '[]')
+                manager_infos.sort(key=lambda manager_info: manager_info['ranking'])
+                seller_info_result['manager_infos'] = manager_infos[:SELLER_MANAGER_LIMIT]
 
-                # seller_info_result 에 seller_status_change_histories 저장
-                seller_info_result['seller_status_change_histories'] = [history for history in status_histories]
+                # 셀러 상태 변경 기록: 변경 일시를 datetime 으로 바꿔서 기존 응답과 같은 형식으로 표출, 변경 일시순 정렬
+                status_histories = json.loads(seller_info_result['seller_status_change_histories'] or '[]')
+                for history in status_histories:
+                    history['changed_time'] = datetime.strptime(history['changed_time'], SELLER_HISTORY_TIME_FORMAT)
+                status_histories.sort(key=lambda history: history['changed_time'])
+                seller_info_result['seller_status_change_histories'] = status_histories
 
                 # 셀러 속성 리스트(마스터가 셀러의 속성 변경하는 옵션 제공용)
-                # SELECT 문 조건 데이터
-                account_info_data = {
-                    'seller_info_no': seller_info_result['seller_info_no']
-                }
-
-                # seller_types 테이블 SELECT
-                select_seller_types_statement = """
-                                SELECT
-                                    ST03.seller_type_no as seller_type_no,
-                                    ST03.name as seller_type_name
-                                
-                                FROM 
-                                product_sorts as ST01
-                                
-                                -- 셀러정보
-                                INNER JOIN
-                                    seller_infos as ST02
-                                    ON ST01.product_sort_no = ST02.product_sort_id
-                               
-                                -- 상품속성
-                                INNER JOIN
-                                    seller_types as ST03
-                                    ON ST01.product_sort_no = ST03.product_sort_id
-
-                                WHERE 
-                                ST02.seller_info_no = %(seller_info_no)s
-                            """
-
-                # SELECT 문 실행
-                db_cursor.execute(select_seller_types_statement, account_info_data)
-
-                # seller_types 출력 결과 저장
-                seller_types = db_cursor.fetchall()
+                # 셀러의 상품 분류에 해당하는 셀러 속성을 메모리에 올려둔 기준 데이터에서 가져옴
+                seller_types = get_reference_data().get('seller_types', seller_info_result.pop('product_sort_id'))[0]
 
                 # seller_info_result 에 seller_types 저장
                 seller_info_result['seller_types'] = seller_types
@@ -408,37 +395,26 @@ class SellerDao:
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
     # noinspection PyMethodMayBeStatic
-    def get_seller_list(self, valid_param, db_connection):
+    def build_seller_list_statement(self, valid_param):
 
-        """ GET 셀러 리스트를 표출하고, 검색 키워드가 오면 키워드 별 검색 가능.
-        페이지네이션 기능: offset 과 limit 값을 받아서 페이지네이션 구현.
-        검색기능: 키워드를 받아서 검색기능 구현. 키워드가 추가 될 때 마다 검색어가 쿼리문에 추가됨
-        엑셀다운로드 기능: excel=1을 쿼리파라미터로 받으면 데이터베이스의 값을
-                        엑셀파일로 만들어 s3에 업로드하고 다운로드 링크를 리턴
+        """ 셀러 리스트 검색 쿼리와 검색된 셀러 수 count 쿼리를 만든다
+        키워드가 들어올 때 마다 검색어가 쿼리문에 추가된다. 정렬, limit, offset 은 추가하지 않는다.
+        LIKE 검색과 기간 검색을 위해 valid_param 의 name_kr, manager_contact_number, start_time, close_time 값을 바꾼다.
 
         Args:
-            db_connection: 연결된 database connection 객체
-            valid_param: view 에서 validation 을 통과한 파라미터들을 가져옴.
+            valid_param: view 에서 validation 을 통과한 파라미터들
 
-        Returns: http 응답코드
-            200: 키워드로 excel=1이 들어온 경우 s3에 올라간 엑셀파일 다운로드 url
-            200: 셀러 리스트 표출(검색기능 포함), 키워드에 맞는 셀러 숫자
-            500: SERVER ERROR
+        Returns:
+            (셀러 리스트 쿼리, 검색된 셀러 수 count 쿼리)
 
         Authors:
             yoonhc@brandi.co.kr (윤희철)
-
-        History:
-            2020-04-03(yoonhc@brandi.co.kr): 초기 생성
-            2020-04-07(yoonhc@brandi.co.kr): 엑셀 다운로드 기능 추가
-            2020-04-10(yoonhc@brandi.co.kr): 필터링 키워드가 들어오면 필터된 셀러를 count 하고 결과값에 추가하는 기능 작성
-            2020-04-14(yoonhc@brandi.co.kr): 키워드가 들어오면 쿼리문 자체에 string 을 추가하고 db_connection 을 열고 바인딩하는 방식으로 변경.
         """
 
         # 키워드 검색을 위해서 쿼리문을 미리 정의해줌.
         select_seller_list_statement = '''
             SELECT 
-            seller_account_id, 
+            seller_infos.seller_account_id, 
             accounts.login_id,
             name_en,
             name_kr,
@@ -447,12 +423,7 @@ class SellerDao:
             seller_status_id,
             seller_types.name as seller_type_name,
             site_url,
-            (
-                SELECT COUNT(0) 
-                FROM product_infos 
-                WHERE product_infos.seller_id  = seller_infos.seller_account_id 
-                AND product_infos.close_time = '2037-12-31 23:59:59' 
-            ) as product_count,
+            COALESCE(seller_product_stats.product_count, 0) as product_count,
             seller_accounts.created_at,
             manager_infos.name as manager_name,
             manager_infos.contact_number as manager_contact_number,
@@ -466,6 +437,7 @@ class SellerDao:
             LEFT JOIN seller_statuses ON seller_infos.seller_status_id = seller_statuses.status_no
             LEFT JOIN seller_types ON seller_infos.seller_type_id = seller_types.seller_type_no
             LEFT JOIN manager_infos on manager_infos.seller_info_id = seller_infos.seller_info_no 
+            LEFT JOIN seller_product_stats ON seller_product_stats.seller_account_id = seller_infos.seller_account_id
             WHERE seller_infos.close_time = '2037-12-31 23:59:59.0'
             AND accounts.is_deleted = 0
             AND seller_accounts.is_deleted = 0
@@ -497,9 +469,14 @@ class SellerDao:
             filter_query_values_count_statement += " AND accounts.login_id = %(login_id)s"
 
         # 셀러 한글명 같은 경우는 키워드로 들어온 값을 포함하는 모든 셀러를 검색해야 하기 때문에 like 문을 사용한다.
+        # 앞에 와일드카드가 붙은 like 문은 인덱스를 사용할 수 없으므로 ngram FULLTEXT 인덱스로 후보를 먼저 좁히고 like 문으로 다시 확인한다.
         name_kr = valid_param.get('name_kr', None)
         if valid_param.get('name_kr', None):
             valid_param['name_kr'] = '%'+name_kr+'%'
+            valid_param['name_kr_phrase'] = make_ngram_search_phrase(name_kr)
+            if valid_param['name_kr_phrase']:
+                select_seller_list_statement += " AND MATCH(seller_infos.name_kr) AGAINST(%(name_kr_phrase)s IN BOOLEAN MODE)"
+                filter_query_values_count_statement += " AND MATCH(seller_infos.name_kr) AGAINST(%(name_kr_phrase)s IN BOOLEAN MODE)"
             select_seller_list_statement += " AND name_kr LIKE %(name_kr)s"
             filter_query_values_count_statement += " AND name_kr LIKE %(name_kr)s"
 
@@ -520,9 +497,14 @@ class SellerDao:
             filter_query_values_count_statement += " AND seller_statuses.name = %(seller_status)s"
 
         # 담당자 연락처 같은 경우는 키워드로 들어온 값을 포함하는 모든 셀러를 검색해야 하기 때문에 like 문을 사용한다
+        # 셀러 한글명과 같이 ngram FULLTEXT 인덱스로 먼저 좁힌다.
         manager_contact_number = valid_param.get('manager_contact_number', None)
         if valid_param.get('manager_contact_number', None):
             valid_param['manager_contact_number'] = '%'+manager_contact_number+'%'
+            valid_param['manager_contact_number_phrase'] = make_ngram_search_phrase(manager_contact_number)
+            if valid_param['manager_contact_number_phrase']:
+                select_seller_list_statement += " AND MATCH(manager_infos.contact_number) AGAINST(%(manager_contact_number_phrase)s IN BOOLEAN MODE)"
+                filter_query_values_count_statement += " AND MATCH(manager_infos.contact_number) AGAINST(%(manager_contact_number_phrase)s IN BOOLEAN MODE)"
             select_seller_list_statement += " AND manager_infos.contact_number LIKE %(manager_contact_number)s"
             filter_query_values_count_statement += " AND manager_infos.contact_number LIKE %(manager_contact_number)s"
 
@@ -543,68 +525,106 @@ class SellerDao:
             select_seller_list_statement += " AND seller_accounts.created_at > %(start_time)s AND seller_accounts.created_at < %(close_time)s"
             filter_query_values_count_statement += " AND seller_accounts.created_at > %(start_time)s AND seller_accounts.created_at < %(close_time)s"
 
-        # sql 명령문에 키워드 추가가 완료되면 정렬, limit, offset 쿼리문을 추가해준다.
-        select_seller_list_statement += " ORDER BY seller_account_id DESC LIMIT %(limit)s OFFSET %(offset)s"
+        return select_seller_list_statement, filter_query_values_count_statement
 
-        try:
-            with db_connection as db_cursor:
+    # noinspection PyMethodMayBeStatic
+    def get_seller_list(self, valid_param, db_connection):
 
-                # sql 쿼리와 pagination 데이터 바인딩
-                db_cursor.execute(select_seller_list_statement, valid_param)
-                seller_info = db_cursor.fetchall()
+        """ GET 셀러 리스트를 표출하고, 검색 키워드가 오면 키워드 별 검색 가능.
+        페이지네이션 기능: offset 과 limit 값을 받아서 페이지네이션 구현.
+                         cursor 가 들어오면 offset 대신 커서 기준으로 페이지네이션 하고, 응답에 다음/이전 페이지 커서를 넣어줌.
+        검색기능: 키워드를 받아서 검색기능 구현. 키워드가 추가 될 때 마다 검색어가 쿼리문에 추가됨
+        엑셀다운로드 기능: excel=2를 쿼리파라미터로 받으면 데이터베이스의 값을 엑셀파일로 만들어 응답으로 내려줌
 
-                # 쿼리파라미터에 excel 키가 1로 들어오면 엑셀파일을 만듦.
-                if valid_param['excel'] == 1:
-                    s3 = get_s3_connection()
-
-                    # 엑셀파일로 만들경우 페이지네이션 적용을 받지않고 검색 적용만 받기 때문에 페이지네이션 부분 쿼리를 제거해준다.
-                    replaced_statement = select_seller_list_statement.replace('ORDER BY seller_account_id DESC LIMIT %(limit)s OFFSET %(offset)s', '')
-                    db_cursor.execute(replaced_statement, valid_param)
-                    seller_info = db_cursor.fetchall()
-
-                    # pandas 데이터 프레임을 만들기 위한 column 과 value 정리
-                    seller_list_dict = {
-                        '셀러번호': [seller['seller_account_id'] for seller in seller_info],
-                        '관리자계정ID': [seller['login_id'] for seller in seller_info],
-                        '셀러영문명': [seller['name_en'] for seller in seller_info],
-                        '셀러한글명': [seller['name_kr'] for seller in seller_info],
-                        '브랜디회원번호': [seller['brandi_app_user_id'] for seller in seller_info],
-                        '담당자명': [seller['manager_name'] for seller in seller_info],
-                        '담당자전화번호': [seller['manager_contact_number'] for seller in seller_info],
-                        '판매구분': [seller['seller_type_name'] for seller in seller_info],
-                        '상품개수': [seller['product_count'] for seller in seller_info],
-                        '셀러URL': [seller['site_url'] for seller in seller_info],
-                        '셀러등록일': [seller['created_at'] for seller in seller_info],
-                        '승인여부': [seller['seller_status'] for seller in seller_info]
-                    }
+        Args:
+            db_connection: 연결된 database connection 객체
+            valid_param: view 에서 validation 을 통과한 파라미터들을 가져옴.
 
-                    # 데이터베이스의 데이터를 기반으로 한 딕셔너리를 판다스 데이터 프레임으로 만들어줌.
-                    df = pd.DataFrame(data=seller_list_dict)
-                    # 첫번제 인덱스의 컬럼명을 지정해주고, 번호가 1부터 시작하도록 한다.
-                    df.index.name = '번호'
-                    df.index += 1
+        Returns: http 응답코드
+            200: 키워드로 excel=2가 들어온 경우 엑셀파일 다운로드 응답
+            200: 셀러 리스트 표출(검색기능 포함), 키워드에 맞는 셀러 숫자, 다음/이전 페이지 커서
+            400: INVALID_CURSOR
+            500: SERVER ERROR
 
-                    # 파일이름과 파일경로를 정의해줌.
-                    file_name = f'{self.gen_random_name()}.xlsx'
-                    file = f'../{file_name}'
+        Authors:
+            yoonhc@brandi.co.kr (윤희철)
 
-                    # 파일을 엑셀파일로 변환해서 로컬에 저장
-                    df.to_excel(file, encoding='utf8')
+        History:
+            2020-04-03(yoonhc@brandi.co.kr): 초기 생성
+            2020-04-07(yoonhc@brandi.co.kr): 엑셀 다운로드 기능 추가
+            2020-04-10(yoonhc@brandi.co.kr): 필터링 키워드가 들어오면 필터된 셀러를 count 하고 결과값에 추가하는 기능 작성
+            2020-04-14(yoonhc@brandi.co.kr): 키워드가 들어오면 쿼리문 자체에 string 을 추가하고 db_connection 을 열고 바인딩하는 방식으로 변경.
+        """
 
-                    # 로컬에 저장된 파일을 s3에 업로드. 업로드 할 때 실패할 것을 고려하여 try-except 사용.
-                    try:
-                        s3.upload_file(file, "brandi-intern", file_name)
-                    except Exception as e:
-                        print(f'error: {e}')
-                        return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
+        # 키워드 검색이 반영된 셀러 리스트 쿼리와 count 쿼리를 만듦.
+        select_seller_list_statement, filter_query_values_count_statement = self.build_seller_list_statement(valid_param)
+
+        # 쿼리파라미터에 excel 키가 2로 들어오면 엑셀파일을 응답으로 바로 내려줌. (excel=1 은 service 에서 내보내기 작업으로 등록)
+        # 엑셀파일로 만들경우 페이지네이션 적용을 받지않고 검색 적용만 받기 때문에 정렬만 추가해준다.
+        if valid_param.get('excel', None) == 2:
+            return self.stream_seller_list_excel(select_seller_list_statement + " ORDER BY seller_infos.seller_account_id DESC", valid_param)
+
+        # 커서가 들어오면 커서에 담긴 마지막 셀러 번호를 기준으로 페이지를 가져온다.
+        cursor_info = None
+        if valid_param.get('cursor', None):
+            cursor_info = decode_cursor(valid_param['cursor'], ('seller_account_id', 'direction'))
+            if not cursor_info or type(cursor_info['seller_account_id']) is not int:
+                return jsonify({'message': 'INVALID_CURSOR'}), 400
+            valid_param['cursor_seller_account_id'] = cursor_info['seller_account_id']
+        is_prev_page = cursor_info is not None and cursor_info['direction'] == 'prev'
+
+        # 다음(이전) 페이지가 있는지 확인하기 위해 limit 보다 하나 더 가져옴.
+        valid_param['fetch_limit'] = valid_param['limit'] + 1
+
+        # sql 명령문에 키워드 추가가 완료되면 정렬, limit 쿼리문을 추가해준다.
+        # 커서 페이지네이션은 offset 만큼 행을 읽고 버리지 않고 seller_account_id 인덱스에서 바로 다음 행부터 읽는다.
+        # 이전 페이지는 반대 방향으로 읽은 다음 순서를 뒤집는다.
+        if is_prev_page:
+            select_seller_list_statement += """
+                AND seller_infos.seller_account_id > %(cursor_seller_account_id)s
+                ORDER BY seller_infos.seller_account_id ASC LIMIT %(fetch_limit)s
+            """
+        elif cursor_info:
+            select_seller_list_statement += """
+                AND seller_infos.seller_account_id < %(cursor_seller_account_id)s
+                ORDER BY seller_infos.seller_account_id DESC LIMIT %(fetch_limit)s
+            """
+
+        # 커서가 없으면 기존처럼 offset 으로 페이지네이션
+        else:
+            select_seller_list_statement += " ORDER BY seller_infos.seller_account_id DESC LIMIT %(fetch_limit)s OFFSET %(offset)s"
 
-                    # s3에 올라간 파일을 다운받는 url
-                    file_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{file_name}'
+        try:
+            with db_connection as db_cursor:
 
-                    # s3에 올라간 후에 로컬에 있는 파일 삭제
-                    os.remove(file)
+                # sql 쿼리와 pagination 데이터 바인딩
+                db_cursor.execute(select_seller_list_statement, valid_param)
+                seller_info = db_cursor.fetchall()
 
-                    return jsonify({'file_url': file_url}), 200
+                # limit 보다 하나 더 가져온 행이 있으면 그 방향으로 페이지가 더 있음.
+                has_more = len(seller_info) > valid_param['limit']
+                seller_info = seller_info[:valid_param['limit']]
+                if is_prev_page:
+                    seller_info.reverse()
+                    has_next_page = True
+                    has_prev_page = has_more
+                else:
+                    has_next_page = has_more
+                    has_prev_page = cursor_info is not None or valid_param['offset'] > 0
+
+                # 현재 페이지의 마지막, 첫번째 셀러 번호로 다음, 이전 페이지 커서를 만듦.
+                next_cursor = None
+                prev_cursor = None
+                if seller_info and has_next_page:
+                    next_cursor = encode_cursor({
+                        'seller_account_id': seller_info[-1]['seller_account_id'],
+                        'direction': 'next'
+                    })
+                if seller_info and has_prev_page:
+                    prev_cursor = encode_cursor({
+                        'seller_account_id': seller_info[0]['seller_account_id'],
+                        'direction': 'prev'
+                    })
 
                 # 셀러 상태를 확인하여 해당 상태에서 취할 수 있는 action 을 기존의 seller_info 에 넣어줌.
                 for seller in seller_info:
@@ -639,21 +659,146 @@ class SellerDao:
                     LEFT JOIN accounts ON seller_accounts.account_id = accounts.account_no 
                     WHERE close_time = '2037-12-31 23:59:59.0' AND accounts.is_deleted = 0
                 '''
-                db_cursor.execute(seller_count_statement)
-                seller_count = db_cursor.fetchone()
+                def count_total_sellers():
+                    db_cursor.execute(seller_count_statement)
+                    return db_cursor.fetchone()['total_seller_count']
 
                 # 쿼리파라미터가 들어오면 필터된 셀러를 카운트하고 리턴 값에 포함시킨다. 쿼리파라미터가 들어오지않으면 전체 셀러 수를 포함시킴.
-                db_cursor.execute(filter_query_values_count_statement, valid_param)
-                filter_query_values_count = db_cursor.fetchone()
-                seller_count['filtered_seller_count'] = filter_query_values_count['filtered_seller_count']
+                def count_filtered_sellers():
+                    db_cursor.execute(filter_query_values_count_statement, valid_param)
+                    return db_cursor.fetchone()['filtered_seller_count']
+
+                # 검색 조건이 같으면 페이지를 넘기거나 페이지 크기를 바꿔도 count 쿼리를 다시 실행하지 않음
+                seller_count = {
+                    'total_seller_count': get_cached_count(SELLER_COUNT, {'count': 'total'}, count_total_sellers),
+                    'filtered_seller_count': get_cached_count(SELLER_COUNT, valid_param, count_filtered_sellers)
+                }
 
-                return jsonify({'seller_list': seller_info, 'seller_count': seller_count}), 200
+                return jsonify({
+                    'seller_list': seller_info,
+                    'seller_count': seller_count,
+                    'next_cursor': next_cursor,
+                    'prev_cursor': prev_cursor
+                }), 200
 
         # 데이터베이스 error
         except Exception as e:
             print(f'DATABASE_CURSOR_ERROR_WITH {e}')
             return jsonify({'error': 'DB_CURSOR_ERROR'}), 500
 
+    # noinspection PyMethodMayBeStatic
+    def iter_seller_excel_rows(self, db_cursor):
+
+        """ 셀러 리스트 엑셀 파일에 들어갈 행을 하나씩 만들어주는 generator
+        서버 사이드 커서에서 SELLER_EXCEL_CHUNK_SIZE 만큼씩 읽어오기 때문에 전체 결과를 메모리에 올리지 않는다.
+
+        Args:
+            db_cursor: 셀러 리스트 쿼리를 실행한 서버 사이드 커서
+
+        Returns:
+            [번호, 셀러번호, 관리자계정ID, ...] 형태의 행
+        """
+        number = 0
+        while True:
+            sellers = db_cursor.fetchmany(SELLER_EXCEL_CHUNK_SIZE)
+            if not sellers:
+                return
+
+            for seller in sellers:
+                number += 1
+                yield [number] + [seller[key] for _, key in SELLER_EXCEL_COLUMNS]
+
+    # noinspection PyMethodMayBeStatic
+    def write_seller_list_excel(self, valid_param, file_name, db_connection, progress_callback=None):
+
+        """ 검색된 셀러 리스트를 엑셀파일로 만들어 s3에 업로드
+        내보내기 작업 워커에서 실행되기 때문에 jsonify 응답 대신 값을 리턴하고, 실패하면 예외를 그대로 발생시킨다.
+        서버 사이드 커서로 읽은 행을 바로 xlsx 로 쓰고, 만들어지는 대로 s3 multipart upload 로 올린다.
+        로컬에 임시 파일을 만들지 않고, 메모리 사용량은 셀러 수와 상관없이 일정하다.
+
+        Args:
+            valid_param: 셀러 리스트 검색 조건
+            file_name: s3에 올릴 파일 이름
+            db_connection: 연결된 database connection 객체
+            progress_callback: (처리된 행 수, 전체 행 수) 를 받는 함수, 데이터베이스에서 행을 읽어올 때 마다 호출
+
+        Returns:
+            엑셀파일에 들어간 셀러 수
+        """
+        select_seller_list_statement, filter_query_values_count_statement = self.build_seller_list_statement(valid_param)
+
+        # 진행률 표시를 위해 검색된 셀러 수를 먼저 구함.
+        with db_connection as db_cursor:
+            db_cursor.execute(filter_query_values_count_statement, valid_param)
+            total_count = db_cursor.fetchone()['filtered_seller_count']
+
+        def iter_rows_with_progress(rows):
+            processed_count = 0
+            for row in rows:
+                yield row
+                processed_count += 1
+                if progress_callback and processed_count % SELLER_EXCEL_CHUNK_SIZE == 0:
+                    progress_callback(processed_count, total_count)
+
+        db_cursor = db_connection.server_side_cursor()
+        try:
+            db_cursor.execute(select_seller_list_statement + " ORDER BY seller_infos.seller_account_id DESC", valid_param)
+            row_count = write_xlsx_to_s3(
+                get_s3_connection(),
+                S3_BUCKET_NAME,
+                file_name,
+                SELLER_EXCEL_HEADER,
+                iter_rows_with_progress(self.iter_seller_excel_rows(db_cursor))
+            )
+
+        finally:
+            try:
+                db_cursor.close()
+            except Error:
+                pass
+
+        if progress_callback:
+            progress_callback(row_count, total_count)
+        return row_count
+
+    # noinspection PyMethodMayBeStatic
+    def stream_seller_list_excel(self, select_seller_list_statement, valid_param):
+
+        """ 검색된 셀러 리스트를 엑셀파일로 만들면서 바로 http 응답으로 내려줌
+        응답을 내려주는 동안 view 의 커넥션은 이미 반납되기 때문에 별도의 커넥션을 빌려서 사용하고,
+        파일을 모두 내려주거나 중간에 끊기면 커넥션을 반납한다.
+
+        Args:
+            select_seller_list_statement: 검색 조건과 정렬이 들어간 셀러 리스트 쿼리
+            valid_param: 쿼리에 바인딩할 파라미터
+
+        Returns: http 응답코드
+            200: 엑셀파일 스트리밍 응답
+            500: DB_CURSOR_ERROR
+        """
+        db_connection = DatabaseConnection()
+        try:
+            db_cursor = db_connection.server_side_cursor()
+            db_cursor.execute(select_seller_list_statement, valid_param)
+
+        except Exception as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            db_connection.close()
+            return jsonify({'error': 'DB_CURSOR_ERROR'}), 500
+
+        def generate_excel():
+            try:
+                yield from iter_xlsx(SELLER_EXCEL_HEADER, self.iter_seller_excel_rows(db_cursor))
+                db_cursor.close()
+            finally:
+                db_connection.close()
+
+        return Response(
+            generate_excel(),
+            mimetype=XLSX_CONTENT_TYPE,
+            headers={'Content-Disposition': 'attachment; filename=seller_list.xlsx'}
+        )
+
     # noinspection PyMethodMayBeStatic
     def change_seller_info(self, account_info, db_connection):
 
@@ -946,6 +1091,9 @@ class SellerDao:
                     db_cursor.execute(insert_status_history_statement, seller_status_data)
 
                 db_connection.commit()
+
+                # 셀러 정보가 바뀌면 셀러 리스트와 (셀러 조건으로 검색하는) 상품 리스트의 count 캐시 무효화
+                invalidate_counts(SELLER_COUNT, PRODUCT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -997,15 +1145,20 @@ class SellerDao:
                 # 새로운 이력 생성 이전의 셀러 정보를 가져옴
                 db_cursor.execute('''
                 SELECT 
-                    seller_info_no, seller_status_id
+                    seller_infos.seller_info_no,
+                    seller_infos.seller_status_id,
+                    seller_accounts.account_id
                 
                 FROM 
                     seller_infos
+                    
+                INNER JOIN seller_accounts
+                ON seller_accounts.seller_account_no = seller_infos.seller_account_id
                                 
                 WHERE 
-                    seller_account_id = %(seller_account_id)s
-                    AND close_time = '2037-12-31 23:59:59'
-                    AND is_deleted = 0
+                    seller_infos.seller_account_id = %(seller_account_id)s
+                    AND seller_infos.close_time = '2037-12-31 23:59:59'
+                    AND seller_infos.is_deleted = 0
                 ''', target_seller_info)
 
                 # 가져온 셀러정보를 타겟셀러 정보를 변수화
@@ -1158,6 +1311,10 @@ class SellerDao:
                 ''', target_seller_info)
 
                 db_connection.commit()
+
+                # 로그인 인증에 사용하는 계정 상태 캐시와 셀러, 상품 리스트 count 캐시 무효화
+                invalidate_account(previous_seller_info['account_id'])
+                invalidate_counts(SELLER_COUNT, PRODUCT_COUNT)
                 return jsonify({'message': 'SUCCESS'}), 200
 
         except KeyError as e:
@@ -1169,6 +1326,249 @@ class SellerDao:
             db_connection.rollback()
             return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
 
+    # noinspection PyMethodMayBeStatic
+    def change_seller_statuses(self, targets, modifier, db_connection):
+
+        """ 마스터 권한 셀러 상태 일괄 변경
+
+        여러 셀러의 상태를 한 트랜잭션 안에서 변경한다.
+        셀러마다 쿼리를 실행하지 않고 셀러 번호 목록(IN)으로 묶어서 실행하므로, 셀러 수와 관계없이 쿼리 수가 일정하다.
+            - 변경할 셀러의 최신 이력을 FOR UPDATE 로 한 번에 조회
+            - 바꿀 상태별로 INSERT ... SELECT 로 새 이력 생성 (상태 종류 수 만큼)
+            - 이전 이력의 선분을 UPDATE 한 번으로 끊음
+            - 이전 이력의 매니저 정보를 INSERT ... SELECT 한 번으로 새 이력에 복사
+            - 상태 변경 이력을 multi-row INSERT 로 추가
+        존재하지 않는 셀러, 이미 같은 상태인 셀러, 없는 상태 번호, 중복으로 들어온 셀러는 변경하지 않고 결과에 사유를 담는다.
+
+        Args:
+            targets: [{'seller_account_id': 셀러 계정 번호, 'seller_status_id': 바꿀 상태 번호}, ...]
+            modifier: 수정자 계정 번호
+            db_connection: 데이터베이스 커넥션 객체 (pymysql)
+
+        Returns:
+            200: 셀러별 결과 (SUCCESS, INVALID_ACTION, SELLER_DOES_NOT_EXIST, INVALID_SELLER_STATUS, DUPLICATE_SELLER)
+            500: DB_CURSOR_ERROR
+        """
+        try:
+            with db_connection.cursor() as db_cursor:
+
+                # 트랜잭션 시작
+                db_cursor.execute("START TRANSACTION")
+
+                # 자동 커밋 비활성화
+                db_cursor.execute("SET AUTOCOMMIT=0")
+
+                db_cursor.execute("SELECT status_no FROM seller_statuses")
+                seller_status_nos = {row['status_no'] for row in db_cursor.fetchall()}
+
+                # 변경 전 최신 이력을 한 번에 가져오고, 커밋할 때까지 다른 변경이 끼어들지 않도록 잠금
+                seller_account_ids = tuple({target['seller_account_id'] for target in targets})
+                db_cursor.execute("""
+                    SELECT
+                        seller_infos.seller_account_id,
+                        seller_infos.seller_info_no,
+                        seller_infos.seller_status_id,
+                        seller_accounts.account_id
+                    
+                    FROM
+                        seller_infos
+                    
+                    INNER JOIN seller_accounts
+                    ON seller_accounts.seller_account_no = seller_infos.seller_account_id
+                    
+                    WHERE
+                        seller_infos.seller_account_id IN %(seller_account_ids)s
+                        AND seller_infos.close_time = '2037-12-31 23:59:59'
+                        AND seller_infos.is_deleted = 0
+                    
+                    FOR UPDATE
+                """, {'seller_account_ids': seller_account_ids})
+                previous_seller_infos = {row['seller_account_id']: row for row in db_cursor.fetchall()}
+
+                # 셀러별 결과와 바꿀 상태별 이전 이력 번호
+                results = []
+                changed_sellers = []
+                previous_seller_info_nos_by_status = {}
+                requested_seller_account_ids = set()
+                for target in targets:
+                    seller_account_id = target['seller_account_id']
+                    seller_status_id = target['seller_status_id']
+                    previous_seller_info = previous_seller_infos.get(seller_account_id, None)
+
+                    if seller_account_id in requested_seller_account_ids:
+                        result = 'DUPLICATE_SELLER'
+                    elif not previous_seller_info:
+                        result = 'SELLER_DOES_NOT_EXIST'
+                    elif seller_status_id not in seller_status_nos:
+                        result = 'INVALID_SELLER_STATUS'
+                    elif previous_seller_info['seller_status_id'] == seller_status_id:
+                        result = 'INVALID_ACTION'
+                    else:
+                        result = 'SUCCESS'
+                        changed_sellers.append(previous_seller_info)
+                        previous_seller_info_nos_by_status.setdefault(seller_status_id, []).append(
+                            previous_seller_info['seller_info_no']
+                        )
+
+                    requested_seller_account_ids.add(seller_account_id)
+                    results.append({
+                        'seller_account_id': seller_account_id,
+                        'seller_status_id': seller_status_id,
+                        'result': result
+                    })
+
+                if not changed_sellers:
+                    db_connection.rollback()
+                    return jsonify({'changed_count': 0, 'results': results}), 200
+
+                # 선분이력을 닫아주는 시간
+                db_cursor.execute('SELECT NOW()')
+                close_time = db_cursor.fetchone()['NOW()']
+
+                # seller_infos: 바꿀 상태별로 이전 이력을 그대로 복사하고 상태만 바꾼 새 이력 생성
+                insert_seller_infos_statement = """
+                    INSERT INTO seller_infos
+                    (
+                        seller_account_id,
+                        profile_image_url,
+                        seller_status_id,
+                        seller_type_id,
+                        product_sort_id,                 
+                        name_kr,
+                        name_en,
+                        brandi_app_user_id,
+                        ceo_name,
+                        company_name,
+                        business_number,
+                        certificate_image_url,
+                        online_business_number,
+                        online_business_image_url,
+                        background_image_url,
+                        short_description,
+                        long_description,
+                        site_url,
+                        kakao_id,
+                        insta_id,
+                        yellow_id,
+                        center_number,
+                        zip_code,
+                        address,
+                        detail_address,
+                        weekday_start_time,
+                        weekday_end_time,
+                        weekend_start_time,
+                        weekend_end_time,
+                        bank_name,
+                        bank_holder_name,
+                        account_number,
+                        modifier
+                    )
+                    SELECT
+                        seller_account_id,
+                        profile_image_url,
+                        %(seller_status_id)s,
+                        seller_type_id,
+                        product_sort_id,                 
+                        name_kr,
+                        name_en,
+                        brandi_app_user_id,
+                        ceo_name,
+                        company_name,
+                        business_number,
+                        certificate_image_url,
+                        online_business_number,
+                        online_business_image_url,
+                        background_image_url,
+                        short_description,
+                        long_description,
+                        site_url,
+                        kakao_id,
+                        insta_id,
+                        yellow_id,
+                        center_number,
+                        zip_code,
+                        address,
+                        detail_address,
+                        weekday_start_time,
+                        weekday_end_time,
+                        weekend_start_time,
+                        weekend_end_time,
+                        bank_name,
+                        bank_holder_name,
+                        account_number,
+                        %(modifier)s
+                    FROM 
+                        seller_infos                    
+                    WHERE
+                        seller_info_no IN %(previous_seller_info_nos)s
+                """
+                for seller_status_id, previous_seller_info_nos in previous_seller_info_nos_by_status.items():
+                    db_cursor.execute(insert_seller_infos_statement, {
+                        'seller_status_id': seller_status_id,
+                        'modifier': modifier,
+                        'previous_seller_info_nos': tuple(previous_seller_info_nos)
+                    })
+
+                # 이전 이력의 선분을 한 번에 끊어줌
+                previous_seller_info_nos = tuple(seller['seller_info_no'] for seller in changed_sellers)
+                db_cursor.execute("""
+                    UPDATE
+                        seller_infos
+                    SET
+                        close_time = %(close_time)s
+                    WHERE
+                        seller_info_no IN %(previous_seller_info_nos)s
+                """, {'close_time': close_time, 'previous_seller_info_nos': previous_seller_info_nos})
+
+                # manager_infos: 이전 이력의 매니저 정보를 같은 셀러의 새 이력(선분이 열려있는 이력)으로 복사
+                db_cursor.execute("""
+                    INSERT INTO manager_infos (
+                        name,
+                        contact_number,
+                        email,
+                        ranking,
+                        seller_info_id
+                    ) 
+                    SELECT
+                        manager_infos.name,
+                        manager_infos.contact_number,
+                        manager_infos.email,
+                        manager_infos.ranking,
+                        new_seller_infos.seller_info_no
+                    FROM manager_infos
+                    INNER JOIN seller_infos as previous_seller_infos
+                    ON previous_seller_infos.seller_info_no = manager_infos.seller_info_id
+                    INNER JOIN seller_infos as new_seller_infos
+                    ON new_seller_infos.seller_account_id = previous_seller_infos.seller_account_id
+                    AND new_seller_infos.close_time = '2037-12-31 23:59:59'
+                    WHERE manager_infos.seller_info_id IN %(previous_seller_info_nos)s
+                """, {'previous_seller_info_nos': previous_seller_info_nos})
+
+                # 셀러 상태 변경 이력 테이블에 변경된 셀러만큼 row 추가
+                history_rows = [
+                    {
+                        'seller_account_id': result['seller_account_id'],
+                        'changed_time': close_time,
+                        'seller_status_id': result['seller_status_id'],
+                        'modifier': modifier
+                    }
+                    for result in results if result['result'] == 'SUCCESS'
+                ]
+                bulk_insert(db_cursor, 'seller_status_change_histories', SELLER_STATUS_HISTORY_COLUMNS, history_rows)
+
+                db_connection.commit()
+
+                # 로그인 인증에 사용하는 계정 상태 캐시와 셀러, 상품 리스트 count 캐시 무효화
+                for seller in changed_sellers:
+                    invalidate_account(seller['account_id'])
+                invalidate_counts(SELLER_COUNT, PRODUCT_COUNT)
+                return jsonify({'changed_count': len(changed_sellers), 'results': results}), 200
+
+        except Exception as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            db_connection.rollback()
+            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
+
     # noinspection PyMethodMayBeStatic
     def get_account_info(self, account_info, db_connection):
 
@@ -1557,6 +1957,9 @@ class SellerDao:
                 # 데이터 sql 명령문과 셀러 데이터 바인딩
                 db_cursor.execute(insert_status_histories_statement, account_info)
                 db_connection.commit()
+
+                # 새 셀러가 추가되었으므로 셀러 리스트 count 캐시 무효화
+                invalidate_counts(SELLER_COUNT)
                 return jsonify({"message": "SUCCESS"}), 200
 
         except KeyError as e:
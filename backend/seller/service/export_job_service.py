@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify
+from mysql.connector.errors import Error
+
+from connection import DatabaseConnection
+from seller.model.export_job_dao import ExportJobDao, EXPORT_JOB_DONE, EXPORT_JOB_FAILED
+from seller.model.seller_dao import SellerDao
+from utils import S3_BUCKET_URL
+
+# 내보내기 작업 워커 설정
+EXPORT_JOB_WORKERS = 2
+EXPORT_JOB_POLL_INTERVAL = 5
+EXPORT_JOB_LEASE_SECONDS = 120
+EXPORT_JOB_MAX_ATTEMPTS = 3
+
+# 작업 파라미터에서 제외할 키 (엑셀 파일 내용과 상관없는 값)
+EXPORT_EXCLUDED_PARAMS = ('excel', 'offset', 'limit', 'cursor')
+
+
+class ExportJobLostError(Exception):
+    """ 실행 도중 lease 가 만료되어 다른 워커가 작업을 다시 가져간 경우 """
+
+
+def run_seller_list_export(export_job, progress_callback, db_connection):
+
+    """ 셀러 리스트 엑셀 내보내기 작업 실행
+
+    Args:
+        export_job: 작업 정보 (export_job_no, params)
+        progress_callback: (처리된 행 수, 전체 행 수) 를 받는 함수
+        db_connection: 내보내기에 사용할 database connection 객체
+
+    Returns:
+        s3에 올라간 파일 url
+    """
+    file_name = f'seller_list_{export_job["export_job_no"]}_{SellerDao().gen_random_name()}.xlsx'
+    SellerDao().write_seller_list_excel(json.loads(export_job['params']), file_name, db_connection, progress_callback)
+    return f'{S3_BUCKET_URL}/{file_name}'
+
+
+# 작업 종류별 실행 함수
+EXPORT_JOB_HANDLERS = {
+    'seller_list': run_seller_list_export,
+}
+
+
+class ExportJobRunner:
+
+    def __init__(self, workers=EXPORT_JOB_WORKERS, poll_interval=EXPORT_JOB_POLL_INTERVAL,
+                 lease_seconds=EXPORT_JOB_LEASE_SECONDS):
+
+        """ export_jobs 테이블의 작업을 가져와서 실행하는 워커
+
+        poll_interval 마다(또는 새 작업이 등록되면 바로) 실행할 수 있는 작업을 조회하고,
+        빈 워커 스레드 수만큼 작업을 가져와서 실행한다.
+        작업 상태는 테이블에 기록되기 때문에 프로세스가 재시작되어도 대기중인 작업은 다시 실행되고,
+        실행 도중 죽은 작업은 lease_seconds 가 지나면 다른 워커가 다시 가져간다.
+
+        Args:
+            workers: 동시에 실행할 작업 수
+            poll_interval: 작업 조회 주기(초)
+            lease_seconds: 진행상황 기록이 없는 실행중 작업을 다시 가져가기까지의 시간(초)
+        """
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export-job')
+        self._wakeup = threading.Event()
+        self._running_count = 0
+        self._lock = threading.Lock()
+        self._poller = threading.Thread(target=self._poll_loop, name='export-job-poller', daemon=True)
+        self._poller.start()
+
+    def notify(self):
+        # 새 작업이 등록되면 다음 조회 주기를 기다리지 않고 바로 조회
+        self._wakeup.set()
+
+    def _poll_loop(self):
+        while True:
+            try:
+                self._claim_export_jobs()
+            except Exception as e:
+                print(f'EXPORT_JOB_POLL_ERROR_WITH {e}')
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _claim_export_jobs(self):
+        with self._lock:
+            free_workers = self.workers - self._running_count
+        if free_workers <= 0:
+            return
+
+        export_job_dao = ExportJobDao()
+        db_connection = DatabaseConnection()
+        try:
+            export_jobs = export_job_dao.get_runnable_export_jobs(self.lease_seconds, free_workers, db_connection)
+            for export_job in export_jobs:
+                if not export_job_dao.claim_export_job(export_job, self.lease_seconds, db_connection):
+                    continue
+
+                # 가져오면서 늘어난 시도 횟수로 이후 기록이 이 워커의 것인지 확인
+                claimed_attempts = export_job['attempts'] + 1
+
+                # 계속 실패하는(실행 도중 워커가 죽는) 작업은 실패 처리
+                if export_job['attempts'] >= EXPORT_JOB_MAX_ATTEMPTS:
+                    export_job_dao.finish_export_job(
+                        export_job['export_job_no'], claimed_attempts, EXPORT_JOB_FAILED, None, 'TOO_MANY_ATTEMPTS',
+                        db_connection
+                    )
+                    continue
+
+                export_job['attempts'] = claimed_attempts
+
+                with self._lock:
+                    self._running_count += 1
+                self._executor.submit(self._run_export_job, export_job)
+
+        finally:
+            db_connection.close()
+
+    def _run_export_job(self, export_job):
+        export_job_dao = ExportJobDao()
+        export_job_no = export_job['export_job_no']
+        attempts = export_job['attempts']
+
+        # 내보내기는 서버 사이드 커서를 사용하므로 진행상황 기록용 커넥션을 따로 빌림
+        export_connection = DatabaseConnection()
+        status_connection = DatabaseConnection()
+        try:
+            def progress_callback(processed_count, total_count):
+                # 작업을 다른 워커가 가져갔으면 더 진행하지 않고 중단
+                if not export_job_dao.update_export_job_progress(
+                        export_job_no, attempts, processed_count, total_count, status_connection
+                ):
+                    raise ExportJobLostError()
+
+            handler = EXPORT_JOB_HANDLERS[export_job['job_type']]
+            file_url = handler(export_job, progress_callback, export_connection)
+            if not export_job_dao.finish_export_job(
+                    export_job_no, attempts, EXPORT_JOB_DONE, file_url, None, status_connection
+            ):
+                print(f'EXPORT_JOB_{export_job_no}_LOST')
+
+        except ExportJobLostError:
+            print(f'EXPORT_JOB_{export_job_no}_LOST')
+
+        except Exception as e:
+            print(f'EXPORT_JOB_{export_job_no}_FAILED_WITH {e}')
+            try:
+                export_job_dao.finish_export_job(
+                    export_job_no, attempts, EXPORT_JOB_FAILED, None, str(e), status_connection
+                )
+            except Error as finish_error:
+                print(f'DATABASE_CURSOR_ERROR_WITH {finish_error}')
+
+        finally:
+            export_connection.close()
+            status_connection.close()
+            with self._lock:
+                self._running_count -= 1
+            self._wakeup.set()
+
+
+# 프로세스마다 하나씩 만들어지는 워커
+_export_job_runner = None
+_export_job_runner_pid = None
+_export_job_runner_lock = threading.Lock()
+
+
+def get_export_job_runner():
+
+    """ 현재 프로세스의 내보내기 작업 워커를 리턴하고, 없으면 새로 만들어 시작한다
+
+    fork 된 워커 프로세스에서는 부모의 스레드가 없으므로 pid 가 바뀌면 새로 만든다.
+
+    Returns:
+        ExportJobRunner 객체
+    """
+    global _export_job_runner, _export_job_runner_pid
+
+    pid = os.getpid()
+    if _export_job_runner is None or _export_job_runner_pid != pid:
+        with _export_job_runner_lock:
+            if _export_job_runner is None or _export_job_runner_pid != pid:
+                _export_job_runner = ExportJobRunner()
+                _export_job_runner_pid = pid
+    return _export_job_runner
+
+
+class ExportJobService:
+
+    # noinspection PyMethodMayBeStatic
+    def request_seller_list_export(self, valid_param, user, db_connection):
+
+        """ 셀러 리스트 엑셀 내보내기 작업 등록
+        검색 조건을 작업 테이블에 저장하고 바로 작업 번호를 리턴한다. 엑셀 파일은 워커가 만든다.
+        같은 검색 조건으로 진행중인 작업이 있으면 새로 등록하지 않고 그 작업 번호를 리턴한다.
+
+        Args:
+            valid_param: view 에서 validation 을 통과한 셀러 리스트 검색 조건
+            user: 유저 정보
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            202: 작업 번호, 상태 조회 url
+            500: DB_CURSOR_ERROR
+        """
+        params = {key: value for key, value in valid_param.items() if key not in EXPORT_EXCLUDED_PARAMS}
+        params_json = json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+        job_info = {
+            'job_type': 'seller_list',
+            'params': params_json,
+            'params_hash': hashlib.sha256(f'seller_list:{params_json}'.encode('utf-8')).hexdigest(),
+            'requester': user['account_no']
+        }
+
+        try:
+            export_job_no, created = ExportJobDao().create_export_job(job_info, db_connection)
+
+        except Error as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            db_connection.rollback()
+            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
+
+        # 워커가 바로 작업을 가져가도록 알림
+        get_export_job_runner().notify()
+
+        return jsonify({
+            'export_job_no': export_job_no,
+            'is_duplicated': not created,
+            'status_url': f'/seller/exports/{export_job_no}'
+        }), 202
+
+    # noinspection PyMethodMayBeStatic
+    def get_export_job(self, export_job_no, user, db_connection):
+
+        """ 내보내기 작업 상태 조회
+        진행률과 완료된 경우 다운로드 url 을 리턴한다.
+
+        Args:
+            export_job_no: 작업 번호
+            user: 유저 정보
+            db_connection: 데이터베이스 커넥션 객체
+
+        Returns:
+            200: 작업 상태, 진행률, 다운로드 url
+            403: 마스터 권한이 아닌 경우
+            404: EXPORT_JOB_DOES_NOT_EXIST
+            500: DB_CURSOR_ERROR
+        """
+        if user.get('auth_type_id', None) != 1:
+            return jsonify({'message': 'AUTHORIZATION_REQUIRED'}), 403
+
+        try:
+            export_job = ExportJobDao().get_export_job(export_job_no, db_connection)
+
+        except Error as e:
+            print(f'DATABASE_CURSOR_ERROR_WITH {e}')
+            return jsonify({'message': 'DB_CURSOR_ERROR'}), 500
+
+        if not export_job:
+            return jsonify({'message': 'EXPORT_JOB_DOES_NOT_EXIST'}), 404
+
+        # 전체 행 수를 아직 모르면 진행률은 0
+        total_count = export_job['total_count']
+        if export_job['status'] == EXPORT_JOB_DONE:
+            export_job['progress'] = 100
+        elif total_count:
+            export_job['progress'] = min(99, int(export_job['processed_count'] * 100 / total_count))
+        else:
+            export_job['progress'] = 0
+
+        # 작업이 남아있으면 워커가 실행되고 있도록 확인
+        get_export_job_runner()
+
+        return jsonify({'export_job': export_job}), 200
@@ -5,7 +5,8 @@ from datetime import datetime, timedelta
 from config import SECRET
 from connection import DatabaseConnection, get_s3_connection
 
-from seller.model.seller_dao import SellerDao
+from seller.model.seller_dao import SellerDao, SELLER_STATUS_BULK_LIMIT
+from seller.service.export_job_service import ExportJobService
 
 
 class SellerService:
@@ -290,6 +291,7 @@ class SellerService:
 
         Returns:
             seller_list_result: 셀러 정보 리스트
+            202: excel=1 인 경우 엑셀 내보내기 작업 번호
             403: auth_type_id가 1(마스터)이 아니면 열람 권한 없음
 
         Authors:
@@ -305,6 +307,12 @@ class SellerService:
 
         # 마스터 유저이면 dao 에 db_connection 전달
         if auth_type_id == 1:
+
+            # excel=1 이면 엑셀 내보내기 작업을 등록하고 작업 번호를 바로 리턴
+            if valid_param.get('excel', None) == 1:
+                export_job_service = ExportJobService()
+                return export_job_service.request_seller_list_export(valid_param, user, db_connection)
+
             seller_list_result = seller_dao.get_seller_list(valid_param, db_connection)
             return seller_list_result
 
@@ -346,6 +354,45 @@ class SellerService:
 
         return jsonify({'message': 'AUTHORIZATION_REQUIRED'}), 403
 
+    def change_seller_statuses(self, targets, user, db_connection):
+
+        """ 마스터 권한 셀러 상태 일괄 변경
+            Args:
+                targets: 유효성검사를 통과한 셀러 목록 [{'seller_account_id', 'seller_status_id'}, ...]
+                user: 유저 정보
+                db_connection: 데이터베이스 커넥션 객체
+
+            Returns:
+                seller_dao 에서 받은 셀러별 결과
+                400: INVALID_VALUE, TOO_MANY_SELLERS
+                403: 마스터 권한이 아닌 경우 수정 권한 없음
+
+        """
+        seller_dao = SellerDao()
+        auth_type_id = user.get('auth_type_id', None)
+
+        # 마스터 유저이면 dao 에 db_connection 전달
+        if auth_type_id == 1:
+
+            if not targets:
+                return jsonify({'message': 'INVALID_VALUE'}), 400
+
+            if len(targets) > SELLER_STATUS_BULK_LIMIT:
+                return jsonify({'message': 'TOO_MANY_SELLERS'}), 400
+
+            # 셀러 계정 번호와 셀러 상태 번호가 모두 정수로 들어와야 함 (json 의 true/false 는 제외)
+            for target in targets:
+                if not isinstance(target, dict):
+                    return jsonify({'message': 'INVALID_VALUE'}), 400
+
+                for key in ('seller_account_id', 'seller_status_id'):
+                    if type(target.get(key, None)) is not int or target[key] <= 0:
+                        return jsonify({'message': 'INVALID_VALUE'}), 400
+
+            return seller_dao.change_seller_statuses(targets, user['account_no'], db_connection)
+
+        return jsonify({'message': 'AUTHORIZATION_REQUIRED'}), 403
+
     # noinspection PyMethodMayBeStatic
     def login(self, account_info, db_connection):
 
@@ -15,6 +15,7 @@ from flask_request_validator import (
 )
 
 from seller.service.seller_service import SellerService
+from seller.service.export_job_service import ExportJobService, get_export_job_runner
 from connection import get_db_connection, DatabaseConnection
 from utils import login_required, ImageUpload
 
@@ -212,7 +213,8 @@ class SellerView:
         Param('close_time', GET, str, required=False),
         Param('excel', GET, int, required=False),
         Param('offset', GET, int, required=False),
-        Param('limit', GET, int, required=False)
+        Param('limit', GET, int, required=False),
+        Param('cursor', GET, str, required=False)
     )
     def get_seller_list(*args):
 
@@ -268,6 +270,7 @@ class SellerView:
         valid_param['excel'] = args[12]
         valid_param['offset'] = args[13] if args[13] else 0
         valid_param['limit'] = args[14] if args[14] else 10
+        valid_param['cursor'] = args[15]
 
         # 유저 정보를 g에서 읽어와서 service 에 전달
         user = g.account_info
@@ -846,3 +849,99 @@ class SellerView:
 
         except Exception as e:
             return ({'message': f'{e}'}), 400
+
+        finally:
+            try:
+                db_connection.close()
+            except Exception as e:
+                return jsonify({'message': f'{e}'}), 500
+
+    @seller_app.route('/status', methods=['PUT'], endpoint='change_seller_statuses')
+    @login_required
+    @validate_params(
+        Param('sellers', JSON, list)
+    )
+    def change_seller_statuses(*args):
+        """ 셀러 상태 일괄 변경
+        마스터 권한을 가진 어카운트가 여러 셀러의 상태를 한 번에 변경 하는 기능.
+        body 로 셀러 계정 번호와 변경하고자 하는 셀러 상태 번호 목록을 받는다.
+        모든 변경은 한 트랜잭션 안에서 처리되고, 셀러별 처리 결과를 리턴한다.
+
+        Args:
+            args: 유효성 검사를 통과한 파라미터 리스트
+                sellers: [{"seller_account_id": 셀러 계정 번호, "seller_status_id": 셀러 상태 번호}, ...]
+
+        Returns:
+            200: 변경된 셀러 수와 셀러별 결과
+                 (SUCCESS, INVALID_ACTION, SELLER_DOES_NOT_EXIST, INVALID_SELLER_STATUS, DUPLICATE_SELLER)
+            400: INVALID_VALUE, TOO_MANY_SELLERS
+            403: AUTHORIZATION_REQUIRED
+            500: NO_DATABASE_CONNECTION, DB_CURSOR_ERROR
+        """
+
+        # 유저정보를 가져와 서비스로 넘김
+        user = g.account_info
+
+        try:
+            db_connection = get_db_connection()
+            if db_connection:
+                seller_service = SellerService()
+                status_change_result = seller_service.change_seller_statuses(args[0], user, db_connection)
+                return status_change_result
+            else:
+                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+
+        except Exception as e:
+            return jsonify({'message': f'{e}'}), 500
+
+        finally:
+            try:
+                db_connection.close()
+            except Exception as e:
+                return jsonify({'message': f'{e}'}), 500
+
+    @seller_app.route('/exports/<int:export_job_no>', methods=['GET'], endpoint='get_export_job')
+    @login_required
+    @validate_params(
+        Param('export_job_no', PATH, int)
+    )
+    def get_export_job(*args):
+
+        """ 엑셀 내보내기 작업 상태 조회
+        셀러 리스트에서 excel=1 로 등록한 작업의 진행률과, 완료되면 다운로드 url 을 표출
+
+        Args:
+            args[0]: 작업 번호
+            g.account_info: 데코레이터에서 넘겨받은 계정 정보
+
+        Returns:
+            200: 작업 상태, 진행률, 다운로드 url
+            403: 마스터 권한이 아닌 경우
+            404: 작업이 없는 경우
+            500: database 연결에 실패한 경우
+        """
+        user = g.account_info
+
+        try:
+            db_connection = DatabaseConnection()
+            if db_connection:
+                export_job_service = ExportJobService()
+                return export_job_service.get_export_job(args[0], user, db_connection)
+            else:
+                return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 500
+
+        except Exception as e:
+            return jsonify({'message': f'{e}'}), 500
+
+        finally:
+            try:
+                db_connection.close()
+            except Exception as e:
+                return jsonify({'message': f'{e}'}), 500
+
+    @seller_app.before_app_first_request
+    def start_export_job_runner():
+
+        """ 워커 프로세스가 첫 요청을 받을 때 내보내기 작업 워커를 시작해서, 재시작 전에 남아있던 작업을 이어서 처리
+        """
+        get_export_job_runner()
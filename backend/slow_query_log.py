@@ -0,0 +1,362 @@
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+
+from collections import deque
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+
+# 이 시간(ms) 이상 걸린 실행은 바인딩된 파라미터와 EXPLAIN FORMAT=JSON 결과를 같이 저장한다.
+SLOW_QUERY_THRESHOLD_MS = 200
+
+# 쿼리 형태별로 퍼센타일 계산에 사용할 최근 실행 시간 개수
+SLOW_QUERY_SAMPLE_SIZE = 1000
+
+# 쿼리 형태별로 저장하는 가장 느린 실행 수
+SLOW_QUERY_EXAMPLES_PER_SHAPE = 5
+
+# 모을 최대 쿼리 형태 수. 넘으면 새 형태는 버리고 개수만 센다.
+SLOW_QUERY_MAX_SHAPES = 1000
+
+# 형태로 바꾼 쿼리 문자열을 재사용하는 캐시 크기 (DAO 의 쿼리 문자열은 대부분 같은 문자열이 반복된다)
+SHAPE_CACHE_SIZE = 2000
+
+# EXPLAIN 대기열 크기. 가득 차면 EXPLAIN 없이 파라미터만 저장한다.
+EXPLAIN_QUEUE_SIZE = 100
+
+# 저장할 파라미터 값 최대 길이, 리스트 최대 개수
+PARAM_VALUE_MAX_LENGTH = 200
+PARAM_LIST_MAX_LENGTH = 50
+
+# 이름에 들어있으면 값을 저장하지 않는 파라미터
+MASKED_PARAM_KEYWORDS = ('password', 'secret', 'token')
+
+# EXPLAIN 할 수 있는 문장
+EXPLAINABLE_KEYWORDS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+
+_COMMENT_PATTERN = re.compile(r'/\*.*?\*/|--[^\n]*|#[^\n]*', re.S)
+_STRING_PATTERN = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_PLACEHOLDER_PATTERN = re.compile(r'%\(\w+\)s|%s')
+_NUMBER_PATTERN = re.compile(r'(?<![\w.])\d+(?:\.\d+)?(?![\w.])')
+_VALUE_LIST_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUE_ROWS_PATTERN = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_SPACE_PATTERN = re.compile(r'\s+')
+
+# EXPLAIN 을 실행하는 스레드의 쿼리는 기록하지 않는다.
+_local = threading.local()
+
+_enabled = False
+
+
+def normalize_statement(statement):
+
+    """ 쿼리를 바인딩 값과 상관없는 형태(shape)로 바꾼다
+
+    문자열/숫자 값과 파라미터 자리(%(name)s, %s)를 ? 로 바꾸고, 주석을 지우고 공백을 하나로 합친다.
+    IN (...) 이나 multi-row INSERT 의 VALUES (...), (...) 처럼 개수만 다른 값 목록은 (...) 하나로 합친다.
+    필터 조건을 이어붙여 만드는 쿼리는 켜진 필터 조합마다 다른 형태가 된다.
+
+    Args:
+        statement: 실행한 쿼리 문자열
+
+    Returns:
+        쿼리 형태 문자열
+    """
+    if isinstance(statement, bytes):
+        statement = statement.decode('utf-8', 'replace')
+
+    shape = _STRING_PATTERN.sub('?', statement)
+    shape = _COMMENT_PATTERN.sub(' ', shape)
+    shape = _PLACEHOLDER_PATTERN.sub('?', shape)
+    shape = _NUMBER_PATTERN.sub('?', shape)
+    shape = _VALUE_LIST_PATTERN.sub('(...)', shape)
+    shape = _VALUE_ROWS_PATTERN.sub('(...)', shape)
+    return _SPACE_PATTERN.sub(' ', shape).strip()
+
+
+def _to_report_value(value, key=None):
+    # 바인딩된 파라미터를 json 으로 저장할 수 있는 값으로 바꾼다.
+    if key is not None and any(keyword in str(key).lower() for keyword in MASKED_PARAM_KEYWORDS):
+        return '****'
+
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+
+    if isinstance(value, dict):
+        return {str(k): _to_report_value(v, k) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple, set)):
+        values = [_to_report_value(v) for v in list(value)[:PARAM_LIST_MAX_LENGTH]]
+        if len(value) > PARAM_LIST_MAX_LENGTH:
+            values.append(f'... {len(value) - PARAM_LIST_MAX_LENGTH} more')
+        return values
+
+    if isinstance(value, (bytes, bytearray)):
+        return f'<{len(value)} bytes>'
+
+    if isinstance(value, (datetime, date, timedelta, Decimal)):
+        return str(value)
+
+    value = str(value)
+    if len(value) > PARAM_VALUE_MAX_LENGTH:
+        return value[:PARAM_VALUE_MAX_LENGTH] + '...'
+    return value
+
+
+def _percentile(sorted_values, percent):
+    # nearest-rank 퍼센타일
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class _QueryShape:
+
+    """ 쿼리 형태 하나의 실행 통계와 느린 실행 예시 """
+
+    __slots__ = ('shape_id', 'shape', 'dao_methods', 'count', 'total', 'max', 'slow_count', 'durations', 'examples')
+
+    def __init__(self, shape_id, shape):
+        self.shape_id = shape_id
+        self.shape = shape
+        self.dao_methods = set()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow_count = 0
+        self.durations = deque(maxlen=SLOW_QUERY_SAMPLE_SIZE)
+        self.examples = []
+
+
+class SlowQueryLog:
+
+    def __init__(self, connection_factory, threshold_ms=SLOW_QUERY_THRESHOLD_MS):
+
+        """ 쿼리 형태별 실행 시간 통계와 느린 쿼리의 실행 계획을 모으는 기록기
+
+        실행한 쿼리를 normalize_statement 로 형태별로 묶어서 실행 수, 합계, 최근 실행 시간의 퍼센타일을 계산한다.
+        threshold_ms 이상 걸린 실행은 형태별로 가장 느린 SLOW_QUERY_EXAMPLES_PER_SHAPE 개까지
+        바인딩된 파라미터를 저장하고, 별도 스레드에서 별도 커넥션으로 EXPLAIN FORMAT=JSON 을 실행해서 같이 저장한다.
+        요청을 처리하는 스레드는 EXPLAIN 을 기다리지 않는다.
+
+        Args:
+            connection_factory: EXPLAIN 에 사용할 데이터베이스 커넥션을 만드는 함수
+            threshold_ms: 느린 쿼리 기준 시간(ms)
+        """
+        self.connection_factory = connection_factory
+        self.threshold = threshold_ms / 1000
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self._shapes = {}
+        self._shape_cache = {}
+        self._dropped = 0
+        self._explain_queue = queue.Queue(EXPLAIN_QUEUE_SIZE)
+        self._explain_thread = None
+
+    def _get_shape(self, statement):
+        shape = self._shape_cache.get(statement)
+        if shape is None:
+            shape = normalize_statement(statement)
+            if len(self._shape_cache) >= SHAPE_CACHE_SIZE:
+                self._shape_cache.clear()
+            self._shape_cache[statement] = shape
+        return shape
+
+    def record(self, statement, params, duration, dao_method):
+
+        """ 쿼리 실행 한 번을 기록한다
+
+        Args:
+            statement: 실행한 쿼리 문자열
+            params: 바인딩된 파라미터
+            duration: 실행 시간(초)
+            dao_method: 쿼리를 실행한 DAO 메소드 태그
+        """
+        shape = self._get_shape(statement)
+        example = None
+
+        with self._lock:
+            query_shape = self._shapes.get(shape)
+            if query_shape is None:
+                if len(self._shapes) >= SLOW_QUERY_MAX_SHAPES:
+                    self._dropped += 1
+                    return
+                shape_id = hashlib.md5(shape.encode('utf-8')).hexdigest()[:16]
+                query_shape = self._shapes[shape] = _QueryShape(shape_id, shape)
+
+            query_shape.dao_methods.add(dao_method)
+            query_shape.count += 1
+            query_shape.total += duration
+            query_shape.max = max(query_shape.max, duration)
+            query_shape.durations.append(duration)
+
+            if duration < self.threshold:
+                return
+
+            query_shape.slow_count += 1
+            examples = query_shape.examples
+            if len(examples) >= SLOW_QUERY_EXAMPLES_PER_SHAPE:
+                # 저장된 예시보다 빠르면 저장하지 않음
+                if duration <= examples[-1]['duration_ms'] / 1000:
+                    return
+                examples.pop()
+
+            example = {
+                'duration_ms': round(duration * 1000, 3),
+                'dao_method': dao_method,
+                'executed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'params': _to_report_value(params),
+                'explain': None,
+            }
+            examples.append(example)
+            examples.sort(key=lambda saved: saved['duration_ms'], reverse=True)
+
+        if self._get_first_keyword(shape) in EXPLAINABLE_KEYWORDS:
+            try:
+                self._explain_queue.put_nowait((statement, params, example))
+                self._start_explain_thread()
+            except queue.Full:
+                example['explain'] = {'error': 'EXPLAIN_QUEUE_FULL'}
+        else:
+            example['explain'] = {'error': 'NOT_EXPLAINABLE'}
+
+    def _get_first_keyword(self, shape):
+        return shape.lstrip('( ').split(' ', 1)[0].upper()
+
+    def _start_explain_thread(self):
+        if self._explain_thread is None:
+            with self._lock:
+                if self._explain_thread is None:
+                    self._explain_thread = threading.Thread(
+                        target=self._run_explain, name='slow-query-explain', daemon=True
+                    )
+                    self._explain_thread.start()
+
+    def _run_explain(self):
+        _local.suspended = True
+        while True:
+            statement, params, example = self._explain_queue.get()
+            db_connection = None
+            try:
+                db_connection = self.connection_factory()
+                with db_connection.cursor() as db_cursor:
+                    db_cursor.execute(f'EXPLAIN FORMAT=JSON {statement}', params)
+                    explain_result = db_cursor.fetchone()
+                example['explain'] = json.loads(list(explain_result.values())[0])
+
+            except Exception as e:
+                example['explain'] = {'error': f'{e}'}
+
+            finally:
+                if db_connection is not None:
+                    try:
+                        db_connection.rollback()
+                    finally:
+                        db_connection.close()
+
+    def report(self, order_by='total', limit=50):
+
+        """ 쿼리 형태별 통계를 정렬해서 리턴한다
+
+        Args:
+            order_by: 정렬 기준 (total: 실행 시간 합계, p95: 95 퍼센타일, count: 실행 수, slow: 느린 실행 수)
+            limit: 리턴할 최대 형태 수
+
+        Returns:
+            {
+                'pid', 'threshold_ms', 'shape_count', 'dropped_executions',
+                'shapes': [{
+                    'shape_id', 'shape', 'dao_methods', 'count', 'slow_count',
+                    'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+                    'slow_examples': [{'duration_ms', 'dao_method', 'executed_at', 'params', 'explain'}, ...]
+                }, ...]
+            }
+        """
+        with self._lock:
+            snapshots = [
+                (query_shape, sorted(query_shape.durations), [dict(example) for example in query_shape.examples])
+                for query_shape in self._shapes.values()
+            ]
+            dropped = self._dropped
+
+        shapes = []
+        for query_shape, durations, examples in snapshots:
+            shapes.append({
+                'shape_id': query_shape.shape_id,
+                'shape': query_shape.shape,
+                'dao_methods': sorted(query_shape.dao_methods),
+                'count': query_shape.count,
+                'slow_count': query_shape.slow_count,
+                'total_ms': round(query_shape.total * 1000, 3),
+                'mean_ms': round(query_shape.total / query_shape.count * 1000, 3),
+                'p50_ms': round(_percentile(durations, 50) * 1000, 3),
+                'p95_ms': round(_percentile(durations, 95) * 1000, 3),
+                'p99_ms': round(_percentile(durations, 99) * 1000, 3),
+                'max_ms': round(query_shape.max * 1000, 3),
+                'slow_examples': examples,
+            })
+
+        sort_keys = {'total': 'total_ms', 'p95': 'p95_ms', 'count': 'count', 'slow': 'slow_count'}
+        shapes.sort(key=lambda shape: shape[sort_keys.get(order_by, 'total_ms')], reverse=True)
+
+        return {
+            'pid': os.getpid(),
+            'threshold_ms': self.threshold_ms,
+            'shape_count': len(snapshots),
+            'dropped_executions': dropped,
+            'shapes': shapes[:limit],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._shapes = {}
+            self._dropped = 0
+
+
+# 프로세스마다 하나씩 만들어지는 기록기
+_slow_query_log = None
+
+
+def _reset_slow_query_log_after_fork():
+    # fork 된 워커 프로세스는 부모의 통계, lock, EXPLAIN 스레드를 물려받지 않는다.
+    global _slow_query_log
+    if _slow_query_log is not None:
+        _slow_query_log = SlowQueryLog(_slow_query_log.connection_factory, _slow_query_log.threshold_ms)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_slow_query_log_after_fork)
+
+
+def is_enabled():
+    return _enabled
+
+
+def get_slow_query_log():
+    return _slow_query_log
+
+
+def record_statement(statement, params, duration, dao_method):
+    # TimedCursor 에서 execute 마다 호출한다. EXPLAIN 스레드의 쿼리는 기록하지 않는다.
+    if _slow_query_log is None or getattr(_local, 'suspended', False):
+        return
+    _slow_query_log.record(statement, params, duration, dao_method)
+
+
+def init_app(app, connection_factory):
+
+    """ SLOW_QUERY_LOG_ENABLED 설정이 켜져 있으면 쿼리 형태별 기록을 시작한다
+
+    Args:
+        app: Flask 앱 객체
+        connection_factory: EXPLAIN 에 사용할 데이터베이스 커넥션을 만드는 함수
+    """
+    global _enabled, _slow_query_log
+
+    if not app.config.get('SLOW_QUERY_LOG_ENABLED'):
+        return
+
+    _enabled = True
+    _slow_query_log = SlowQueryLog(connection_factory, app.config.get('SLOW_QUERY_THRESHOLD_MS', SLOW_QUERY_THRESHOLD_MS))
@@ -1,9 +1,12 @@
-import jwt, uuid, io, os
+import jwt, uuid, os, re, threading, json, base64, binascii, hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from mysql.connector.errors import Error
-from flask import request, jsonify, g
+from flask import request, jsonify, g, Response
 
 from connection import DatabaseConnection, get_s3_connection
-from PIL import Image
+from cache import account_cache
+from metrics import bind_request_metrics
+from image_resizer import resize_image, get_save_content_type, PRODUCT_IMAGE_WIDTHS
 from config import SECRET
 
 
@@ -16,8 +19,13 @@ def login_required(func):
                 payload = jwt.decode(access_token, SECRET['secret_key'], algorithm=SECRET['algorithm'])
                 account_no = payload['account_no']
 
-                db_connection = DatabaseConnection()
-                if db_connection:
+                # 캐시에 계정 상태가 있으면 데이터베이스를 조회하지 않는다.
+                account = account_cache.get(account_no)
+                if account is None:
+                    db_connection = DatabaseConnection()
+                    if not db_connection:
+                        return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 400
+
                     try:
                         with db_connection as db_cursor:
                             get_account_info_stmt = ("""
@@ -25,28 +33,157 @@ def login_required(func):
                             """)
                             db_cursor.execute(get_account_info_stmt, {'account_no': account_no})
                             account = db_cursor.fetchone()
-                            if account:
-                                if account['is_deleted'] == 0:
-                                    g.account_info = {
-                                        'account_no': account_no,
-                                        'auth_type_id': account['auth_type_id']
-                                    }
-                                    return func(*args, **kwargs)
-                                return jsonify({'message': 'DELETED_ACCOUNT'}), 400
-                            return jsonify({'message': 'ACCOUNT_DOES_NOT_EXIST'}), 404
 
                     except Error as e:
                         print(f'DATABASE_CURSOR_ERROR_WITH {e}')
                         return jsonify({'message': 'DB_CURSOR_ERROR'}), 400
 
+                    finally:
+                        # 인증용 커넥션은 view 함수가 실행되기 전에 풀에 반납
+                        db_connection.close()
+
+                    # 존재하는 계정만 캐시에 저장
+                    if account:
+                        account_cache.set(account_no, account)
+
+                if account:
+                    if account['is_deleted'] == 0:
+                        g.account_info = {
+                            'account_no': account_no,
+                            'auth_type_id': account['auth_type_id']
+                        }
+                        return func(*args, **kwargs)
+                    return jsonify({'message': 'DELETED_ACCOUNT'}), 400
+                return jsonify({'message': 'ACCOUNT_DOES_NOT_EXIST'}), 404
+
             except jwt.InvalidTokenError:
                 return jsonify({'message': 'INVALID_TOKEN'}), 401
 
-            return jsonify({'message': 'NO_DATABASE_CONNECTION'}), 400
         return jsonify({'message': 'INVALID_TOKEN'}), 401
     return wrapper
 
 
+# 상품 이미지가 올라가는 s3 버킷
+S3_BUCKET_NAME = 'brandi-intern'
+S3_BUCKET_URL = f'https://{S3_BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com'
+
+# 상품 이미지 리사이즈, 업로드에 사용하는 스레드 수
+PRODUCT_IMAGE_RESIZE_WORKERS = 4
+PRODUCT_IMAGE_UPLOAD_WORKERS = 15
+
+# 프로세스마다 만들어서 요청들이 같이 사용하는 스레드 풀
+_image_executors = {}
+_image_executors_lock = threading.Lock()
+
+
+def get_image_executor(name, max_workers):
+
+    """ 이미지 처리용 스레드 풀을 리턴하고, 없으면 새로 만든다
+
+    fork 된 워커 프로세스에서는 부모 프로세스의 스레드 풀을 사용할 수 없기 때문에 pid 가 바뀌면 새로 만든다.
+
+    Args:
+        name: 스레드 풀 이름
+        max_workers: 최대 스레드 수
+
+    Returns:
+        ThreadPoolExecutor 객체
+    """
+    pid = os.getpid()
+    with _image_executors_lock:
+        executor_info = _image_executors.get(name)
+        if executor_info is None or executor_info[0] != pid:
+            executor_info = (pid, ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'image-{name}'))
+            _image_executors[name] = executor_info
+    return executor_info[1]
+
+
+def encode_cursor(cursor_info):
+
+    """ 페이지네이션 커서 정보를 클라이언트에 내려줄 불투명한 문자열로 만든다
+
+    Args:
+        cursor_info: 커서 정보 dict (마지막으로 본 행의 정렬 키, 방향)
+
+    Returns:
+        url-safe base64 문자열
+    """
+    cursor_json = json.dumps(cursor_info, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(cursor_json.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, required_keys):
+
+    """ encode_cursor 로 만든 커서 문자열을 dict 로 되돌린다
+
+    Args:
+        cursor: 클라이언트가 보낸 커서 문자열
+        required_keys: 커서에 반드시 있어야 하는 키 목록
+
+    Returns:
+        커서 정보 dict, 형식이 맞지 않으면 None
+    """
+    try:
+        padded_cursor = cursor + '=' * (-len(cursor) % 4)
+        cursor_info = json.loads(base64.urlsafe_b64decode(padded_cursor.encode('ascii')).decode('utf-8'))
+
+    except (ValueError, UnicodeError, binascii.Error):
+        return None
+
+    if not isinstance(cursor_info, dict) or any(key not in cursor_info for key in required_keys):
+        return None
+
+    # 방향은 next(다음 페이지), prev(이전 페이지) 만 가능
+    if cursor_info.get('direction', 'next') not in ('next', 'prev'):
+        return None
+
+    return cursor_info
+
+
+def make_etag(*parts):
+
+    """ 응답 내용을 결정하는 값들로 ETag 값을 만든다
+
+    Args:
+        parts: json 으로 바꿀 수 있는 값들 (버전 번호, 데이터 등)
+
+    Returns:
+        sha1 hex 문자열
+    """
+    parts_json = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(parts_json.encode('utf-8')).hexdigest()
+
+
+def make_conditional_response(etag, load_response):
+
+    """ If-None-Match 헤더로 조건부 GET 응답을 만든다
+
+    클라이언트가 가진 ETag 가 현재 etag 와 같으면 load_response 를 호출하지 않고 본문 없이 304 를 리턴한다.
+    다르면 load_response 로 전체 응답을 만들고, 200 응답이면 ETag 를 붙인다.
+    편집 화면에서 항상 최신 데이터를 보도록 재사용 전에 매번 재검증(no-cache)하게 한다.
+
+    Args:
+        etag: 현재 데이터의 ETag 값, 데이터가 없거나 만들지 못했으면 None
+        load_response: (응답, 상태코드) 를 리턴하는 함수
+
+    Returns:
+        304 응답 또는 load_response 의 결과
+    """
+    if etag and request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    response, status = load_response()
+    if etag and status == 200:
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    return response, status
+
+
 class ImageUpload:
 
     # 이미지 리사이즈 : big
@@ -70,25 +207,9 @@ class ImageUpload:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
             2020-04-14 (yoonhc@brandi.co.kr): 확장자별(png, jpg)로 메모리에 저장하는 로직 구현.
         """
-
-        standard_size = 640
-        try:
-            with Image.open(image_file) as opened_image:
-                big = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_big = opened_image.resize(big)
-                big_io = io.BytesIO()
-                image_file_form = image_file.content_type
-
-                # 파일 타입을 화인하여 파일객체 확장자와 변환하고자하는 파일의 확장자를 맞춰줌.
-                if 'png' in image_file_form:
-                    resized_image_big.save(big_io, 'png')
-                if 'jpeg' in image_file_form:
-                    resized_image_big.save(big_io, 'jpeg')
-                big_io.seek(0)
-                return [big_io, str(uuid.uuid4())]
-        # 예외처리의 결과를 None 으로 리턴해서 이 함수를 호출하는 함수에서 에러를 잡아줌.
-        except:
-            return None
+        # 한 번 디코딩하는 리사이즈 엔진으로 640 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (640,))
+        return resized_images[0] if resized_images else None
 
     # 이미지 리사이즈 : medium
     def resize_to_medium(self, image_file):
@@ -112,24 +233,9 @@ class ImageUpload:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
             2020-04-14 (yoonhc@brandi.co.kr): 확장자별(png, jpg)로 메모리에 저장하는 로직 구현.
         """
-        standard_size = 320
-        try:
-            with Image.open(image_file) as opened_image:
-                medium = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_medium = opened_image.resize(medium)
-                medium_io = io.BytesIO()
-                image_file_form = image_file.content_type
-
-                # 파일 타입을 화인하여 파일객체 확장자와 변환하고자하는 파일의 확장자를 맞춰줌.
-                if 'png' in image_file_form:
-                    resized_image_medium.save(medium_io, 'png')
-                if 'jpeg' in image_file_form:
-                    resized_image_medium.save(medium_io, 'jpeg')
-                medium_io.seek(0)
-                return [medium_io, str(uuid.uuid4())]
-
-        except:
-            return None
+        # 한 번 디코딩하는 리사이즈 엔진으로 320 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (320,))
+        return resized_images[0] if resized_images else None
 
     # 이미지 리사이즈 : small
     def resize_to_small(self, image_file):
@@ -153,26 +259,32 @@ class ImageUpload:
             2020-04-02 (yoonhc@brandi.co.kr): 초기 생성
             2020-04-14 (yoonhc@brandi.co.kr): 확장자별(png, jpg)로 메모리에 저장하는 로직 구현.
         """
-        standard_size = 120
-        try:
-            with Image.open(image_file) as opened_image:
-                small = (int(standard_size), int(opened_image.size[1]*(standard_size/opened_image.size[0])))
-                resized_image_small = opened_image.resize(small)
-                small_io = io.BytesIO()
-                image_file_form = image_file.content_type
-
-                # 파일 타입을 화인하여 파일객체 확장자와 변환하고자하는 파일의 확장자를 맞춰줌.
-                if 'png' in image_file_form:
-                    resized_image_small.save(small_io, 'png')
-                if 'jpeg' in image_file_form:
-                    resized_image_small.save(small_io, 'jpeg')
-                small_io.seek(0)
-                return [small_io, str(uuid.uuid4())]
-
-        # 이미지를 pillow 객체로 만들지 못하는 경우 애러처리를 위해 None 을 리턴
-        except:
+        # 한 번 디코딩하는 리사이즈 엔진으로 120 크기 하나만 만든다.
+        resized_images = resize_image(image_file, (120,))
+        return resized_images[0] if resized_images else None
+
+    # 상품 이미지 하나를 3가지 크기로 리사이즈
+    def resize_product_image(self, image_file):
+        """ 상품 이미지 하나를 big, medium, small 크기로 리사이즈
+        리사이즈 워커 스레드에서 실행되며, 원본을 한 번만 디코딩해서 3가지 크기를 이어서 만든다.
+
+        Args:
+            image_file: 이미지 파일 객체
+
+        Returns:
+            [(size_name, image_size_id, [BytesIO, uuid]), ...]: 크기별 리사이즈 결과
+            None: 리사이즈 실패
+        """
+        # 원본은 한 번만 디코딩하고 big -> medium -> small 순서로 이어서 줄임
+        resized_images = resize_image(image_file, PRODUCT_IMAGE_WIDTHS)
+        if not resized_images:
             return None
 
+        return [
+            (size_name, image_size_id, buffer)
+            for (size_name, image_size_id), buffer in zip((('big', 1), ('medium', 2), ('small', 3)), resized_images)
+        ]
+
     # 요청받은 상품 이미지를 리사이즈 하고 s3에 업로드
     def upload_product_image(self, request):
         """ 상품 이미지 파일을 3가지 크기로 리사이즈 해서 s3에 업로드 하고 업로드한 이미지의 url, 사이즈를 리턴하는 함수.
@@ -181,12 +293,16 @@ class ImageUpload:
         파일의 크기가 일정크기를 넘으면 업로드 하지 않음.
         이미지가 들어오지 않아도 해당 이미지 순서에 있는 key는 존재하도록 설계
 
+        리사이즈는 리사이즈 스레드 풀에서 파일 단위로 동시에 실행하고,
+        리사이즈가 끝난 파일의 3가지 크기는 바로 업로드 스레드 풀에 넘겨서 동시에 업로드한다.
+        하나라도 실패하면 남은 작업을 취소하고, 이미 s3에 올라간 이미지는 삭제한다.
+
         Args:
             request: 상품 이미지 파일을 포함한 요청 값.
 
         Returns:
             data: s3 버킷에 올라간 이미지파일의 url(dictionary), size 를 포함한 딕셔너리
-            400: 파일형식이 잘못된 경우, 파일 크기가 너무 큰 경우,
+            400: 파일형식이 잘못된 경우, 파일 크기가 너무 큰 경우, 리사이즈에 실패한 경우
             500: s3에 업로드과정에서 애러가 난 경우.
 
         Authors:
@@ -210,248 +326,15 @@ class ImageUpload:
         }
 
         # 파일의 존재여부 확인, 이미지 순서를 파일 이름으로 받음.
-        image_file_1 = request.files.get('image_file_1', None)
-        image_file_2 = request.files.get('image_file_2', None)
-        image_file_3 = request.files.get('image_file_3', None)
-        image_file_4 = request.files.get('image_file_4', None)
-        image_file_5 = request.files.get('image_file_5', None)
-
-        # 순서1번의 이미지파일 이 존재하면 업로드하고 url 을 딕셔너리에 추가
-        if image_file_1:
-            # 들어온 파일의 사이즈와 확장자를 구함.
-            image_file_size = os.fstat(image_file_1.fileno()).st_size
-            image_file_form = image_file_1.content_type
-
-            # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-            if not ('image' in image_file_form):
-                return jsonify({'message': 'INVALID_FILE_FORM'}), 400
-
-            # 들어온 이미지 크기가 10MB 보다 크면 request 를 받지 않음.
-            if image_file_size > 1000000:
-                return jsonify({'message': 'INVALID_IMAGE_SIZE'}), 400
-
-            # big_size 업로드
-            big_size_buffer = self.resize_to_big(image_file_1)
-            if not big_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=big_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=big_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST'}), 400
-
-            big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-            data['image_file_1']['big_size_url'] = big_size_url
-            data['image_file_1']['big_image_size_id'] = 1
-
-            # medium_size 업로드
-            medium_size_buffer = self.resize_to_medium(image_file_1)
-            if not medium_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=medium_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=medium_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST'}), 400
-
-            medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-            data['image_file_1']['medium_size_url'] = medium_size_url
-            data['image_file_1']['medium_image_size_id'] = 2
-
-            # small_size 업로드
-            small_size_buffer = self.resize_to_small(image_file_1)
-            if not small_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=small_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=small_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST'}), 400
-
-            small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-            data['image_file_1']['small_size_url'] = small_size_url
-            data['image_file_1']['small_image_size_id'] = 3
-
-        # 순서2번의 이미지파일 이 존재하면 업로드하고 url 을 딕셔너리에 추가
-        if image_file_2:
-            # 들어온 파일의 사이즈와 확장자를 구함.
-            image_file_size = os.fstat(image_file_2.fileno()).st_size
-            image_file_form = image_file_2.content_type
-
-            # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-            if not ('image' in image_file_form):
-                return jsonify({'message': 'INVALID_FILE_FORM'})
-
-            # 들어온 이미지 크기가 10MB 보다 크면 request 를 받지 않음.
-            if image_file_size > 10485760:
-                return jsonify({'message': 'INVALID_IMAGE_SIZE'})
-
-            # big_size 업로드
-            big_size_buffer = self.resize_to_big(image_file_2)
-            if not big_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=big_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=big_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-            data['image_file_2']['big_size_url'] = big_size_url
-            data['image_file_2']['big_image_size_id'] = 1
-
-            # medium_size 업로드
-            medium_size_buffer = self.resize_to_medium(image_file_2)
-            if not medium_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=medium_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=medium_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-            data['image_file_2']['medium_size_url'] = medium_size_url
-            data['image_file_2']['medium_image_size_id'] = 2
-
-            # small_size 업로드
-            small_size_buffer = self.resize_to_small(image_file_2)
-            if not small_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=small_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=small_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
+        image_files = {}
+        for name in data:
+            image_file = request.files.get(name, None)
+            if not image_file:
+                continue
 
-            small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-            data['image_file_2']['small_size_url'] = small_size_url
-            data['image_file_2']['small_image_size_id'] = 3
-
-        # 순서3번의 이미지파일 이 존재하면 업로드하고 url 을 딕셔너리에 추가
-        if image_file_3:
             # 들어온 파일의 사이즈와 확장자를 구함.
-            image_file_size = os.fstat(image_file_3.fileno()).st_size
-            image_file_form = image_file_3.content_type
-
-            # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-            if not ('image' in image_file_form):
-                return jsonify({'message': 'INVALID_FILE_FORM'})
-
-            # 들어온 이미지 크기가 10MB 보다 크면 request 를 받지 않음.
-            if image_file_size > 10485760:
-                return jsonify({'message': 'INVALID_IMAGE_SIZE'})
-
-            # big_size 업로드
-            big_size_buffer = self.resize_to_big(image_file_3)
-            if not big_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=big_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=big_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-            data['image_file_3']['big_size_url'] = big_size_url
-            data['image_file_3']['big_image_size_id'] = 1
-
-            # medium_size 업로드
-            medium_size_buffer = self.resize_to_medium(image_file_3)
-            if not medium_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=medium_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=medium_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-            data['image_file_3']['medium_size_url'] = medium_size_url
-            data['image_file_3']['medium_image_size_id'] = 2
-
-            # small_size 업로드
-            small_size_buffer = self.resize_to_small(image_file_3)
-            if not small_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=small_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=small_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-            data['image_file_3']['small_size_url'] = small_size_url
-            data['image_file_3']['small_image_size_id'] = 3
-
-        # 순서4번의 이미지파일 이 존재하면 업로드하고 url 을 딕셔너리에 추가
-        if image_file_4:
-            # 들어온 파일의 사이즈와 확장자를 구함.
-            image_file_size = os.fstat(image_file_4.fileno()).st_size
-            image_file_form = image_file_4.content_type
+            image_file_size = os.fstat(image_file.fileno()).st_size
+            image_file_form = image_file.content_type
 
             # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
             if not ('image' in image_file_form):
@@ -461,147 +344,89 @@ class ImageUpload:
             if image_file_size > 10485760:
                 return jsonify({'message': 'INVALID_IMAGE_SIZE'}), 400
 
-            # big_size 업로드
-            big_size_buffer = self.resize_to_big(image_file_4)
-            if not big_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=big_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=big_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST4'}), 400
-
-            big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-            data['image_file_4']['big_size_url'] = big_size_url
-            data['image_file_4']['big_image_size_id'] = 1
+            image_files[name] = image_file
 
-            # medium_size 업로드
-            medium_size_buffer = self.resize_to_medium(image_file_4)
-            if not medium_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
+        resize_executor = get_image_executor('resize', PRODUCT_IMAGE_RESIZE_WORKERS)
+        upload_executor = get_image_executor('upload', PRODUCT_IMAGE_UPLOAD_WORKERS)
 
-            try:
-                s3.put_object(
-                    Body=medium_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=medium_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST'}), 400
-
-            medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-            data['image_file_4']['medium_size_url'] = medium_size_url
-            data['image_file_4']['medium_image_size_id'] = 2
-
-            # small_size 업로드
-            small_size_buffer = self.resize_to_small(image_file_4)
-            if not small_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=small_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=small_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error: {e}')
-                return jsonify({'message': 'INVALID_REQUEST'}), 400
-
-            small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-            data['image_file_4']['small_size_url'] = small_size_url
-            data['image_file_4']['small_image_size_id'] = 3
-
-        # 순서5번의 이미지파일 이 존재하면 업로드하고 url 을 딕셔너리에 추가
-        if image_file_5:
-            # 들어온 파일의 사이즈와 확장자를 구함.
-            image_file_size = os.fstat(image_file_5.fileno()).st_size
-            image_file_form = image_file_5.content_type
-
-            # 이미지 파일이 아닌 다른형식의 파일이 들어오는 것을 차단.
-            if not ('image' in image_file_form):
-                return jsonify({'message': 'INVALID_FILE_FORM'})
-
-            # 들어온 이미지 크기가 10MB 보다 크면 request 를 받지 않음.
-            if image_file_size > 10485760:
-                return jsonify({'message': 'INVALID_IMAGE_SIZE'})
-
-            # big_size 업로드
-            big_size_buffer = self.resize_to_big(image_file_5)
-            if not big_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=big_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=big_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
-
-            big_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{big_size_buffer[1]}'
-            data['image_file_5']['big_size_url'] = big_size_url
-            data['image_file_5']['big_image_size_id'] = 1
-
-            # medium_size 업로드
-            medium_size_buffer = self.resize_to_medium(image_file_5)
-            if not medium_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
-
-            try:
-                s3.put_object(
-                    Body=medium_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=medium_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
-
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
+        # 파일별 리사이즈 작업을 시작
+        resize_futures = {
+            resize_executor.submit(self.resize_product_image, image_file): name
+            for name, image_file in image_files.items()
+        }
+        upload_futures = {}
+        error = None
 
-            medium_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{medium_size_buffer[1]}'
-            data['image_file_5']['medium_size_url'] = medium_size_url
-            data['image_file_5']['medium_image_size_id'] = 2
+        try:
+            # 리사이즈가 끝난 파일부터 크기별 업로드 작업을 시작
+            for resize_future in as_completed(resize_futures):
+                name = resize_futures[resize_future]
+                resized_images = resize_future.result()
+                if not resized_images:
+                    error = ({'message': 'RESIZE_FAIL'}, 400)
+                    break
+
+                for size_name, image_size_id, buffer in resized_images:
+                    upload_future = upload_executor.submit(
+                        bind_request_metrics(s3.put_object),
+                        Body=buffer[0],
+                        Bucket=S3_BUCKET_NAME,
+                        Key=buffer[1],
+                        ContentType=get_save_content_type(image_files[name].content_type)
+                    )
+                    upload_futures[upload_future] = (name, size_name, image_size_id, buffer[1])
+
+            # 업로드 결과 확인. 하나라도 실패하면 나머지 결과는 기다리지 않음
+            if not error:
+                for upload_future in as_completed(upload_futures):
+                    upload_exception = upload_future.exception()
+                    if upload_exception:
+                        print(f'error: {upload_exception}')
+                        error = ({'message': 'S3_UPLOAD_FAIL'}, 500)
+                        break
+
+        except Exception as e:
+            print(f'error: {e}')
+            error = ({'message': 'RESIZE_FAIL'}, 400)
+
+        if error:
+            # 아직 시작하지 않은 작업은 취소하고, 실행중인 업로드가 끝나면 올라간 이미지를 삭제
+            for future in list(resize_futures) + list(upload_futures):
+                future.cancel()
+            wait(upload_futures)
+            uploaded_keys = [
+                upload_info[3] for upload_future, upload_info in upload_futures.items()
+                if not upload_future.cancelled() and not upload_future.exception()
+            ]
+            self.delete_uploaded_images(s3, uploaded_keys)
+            return jsonify(error[0]), error[1]
+
+        # 기존 응답과 같은 순서(big, medium, small)로 url, 사이즈를 딕셔너리에 추가
+        for name, size_name, image_size_id, key in sorted(upload_futures.values(), key=lambda info: (info[0], info[2])):
+            data[name][f'{size_name}_size_url'] = f'{S3_BUCKET_URL}/{key}'
+            data[name][f'{size_name}_image_size_id'] = image_size_id
 
-            # small_size 업로드
-            small_size_buffer = self.resize_to_small(image_file_5)
-            if not small_size_buffer:
-                return jsonify({"message": "RESIZE_FAIL"}), 400
+        return data
 
-            try:
-                s3.put_object(
-                    Body=small_size_buffer[0],
-                    Bucket="brandi-intern",
-                    Key=small_size_buffer[1],
-                    ContentType='image/jpeg'
-                )
+    # s3에 올라간 이미지 삭제
+    def delete_uploaded_images(self, s3, keys):
+        """ 업로드 도중 실패한 요청에서 이미 s3에 올라간 이미지를 삭제
 
-            except Exception as e:
-                print(f'error1 : {e}')
-                return jsonify({'message': 'S3_UPLOAD_FAIL'}), 500
+        Args:
+            s3: s3 클라이언트
+            keys: 삭제할 이미지 key 리스트
+        """
+        if not keys:
+            return
 
-            small_size_url = f'https://brandi-intern.s3.ap-northeast-2.amazonaws.com/{small_size_buffer[1]}'
-            data['image_file_5']['small_size_url'] = small_size_url
-            data['image_file_5']['small_image_size_id'] = 3
+        try:
+            s3.delete_objects(
+                Bucket=S3_BUCKET_NAME,
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+            )
 
-        return data
+        except Exception as e:
+            print(f'S3_DELETE_FAIL_WITH {e}')
 
     # 요청받은 셀러 이미지를 s3에 업로드 --> 현재 사용하지 않음.
     def upload_seller_image(self, request):
@@ -894,6 +719,9 @@ class ImageUpload:
         # request 로 받은 이미지 파일 리스트 키 값 저장
         image_name_list = list(request.files.keys())
 
+        # 모든 파일이 같은 s3 클라이언트를 사용
+        s3 = get_s3_connection()
+
         for name in image_name_list:
             image = request.files[name]
 
@@ -910,7 +738,6 @@ class ImageUpload:
                 return jsonify({'message': f'INVALID_{name}_IMAGE_SIZE'}), 400
 
             uploaded_image_name = str(uuid.uuid4())
-            s3 = get_s3_connection()
 
             # s3에 올리는 과정에서 발생하는 애러를 잡아줌. 위에서 확인한 이미지파일 form 을 컨텐츠 타입으로 지정.
             try:
@@ -932,3 +759,50 @@ class ImageUpload:
             data[name] = uploaded_image_url
 
         return data
+
+
+# 서버의 ngram_token_size 와 같은 값. 검색어가 이보다 짧으면 ngram FULLTEXT 인덱스로 찾을 수 없다.
+NGRAM_TOKEN_SIZE = 2
+
+# LIKE 에서는 와일드카드로 쓰이거나 BOOLEAN MODE 구문 검색에서 따옴표를 깨는 문자
+NGRAM_UNSAFE_CHARACTERS = ('%', '_', '"', '\\')
+
+
+def make_ngram_search_phrase(keyword):
+
+    """ 부분 일치(LIKE '%keyword%') 검색을 ngram FULLTEXT 인덱스로 먼저 좁히기 위한 BOOLEAN MODE 구문 검색어를 만든다
+
+    ngram 파서는 공백과 구두점(-, (, ) 등)에서 토큰을 끊고, 끊긴 조각을 NGRAM_TOKEN_SIZE 글자씩 잘라서 인덱싱한다.
+    그래서 검색어도 같은 기준으로 조각내고, 토큰을 만들 수 있는 조각마다 구문 검색("조각")을 필수 조건(+)으로 건다.
+    토큰보다 짧은 조각은 인덱스에 남지 않으므로 조건에서 빼는데, 이 때문에 구문 검색 결과가 LIKE 결과보다 넓을 수 있어서
+    호출하는 쪽에서는 기존 LIKE 조건을 그대로 같이 걸어서 결과를 다시 확인한다.
+    인덱스로 찾을 수 없는 검색어(토큰 길이에 닿는 조각이 없는 검색어, LIKE 와일드카드나 따옴표가 들어간 검색어)는
+    None 을 리턴하고 이 경우에는 LIKE 조건만으로 검색한다.
+
+    Args:
+        keyword: 검색어 (와일드카드를 붙이기 전 값)
+
+    Returns:
+        '+"조각1" +"조각2"' 형태의 BOOLEAN MODE 검색어, 인덱스를 사용할 수 없으면 None
+    """
+    if any(character in keyword for character in NGRAM_UNSAFE_CHARACTERS):
+        return None
+
+    segments = [segment for segment in re.split(r'[^\w]+', keyword) if len(segment) >= NGRAM_TOKEN_SIZE]
+    if not segments:
+        return None
+
+    return ' '.join(f'+"{segment}"' for segment in segments)
+
+
+def escape_like(keyword):
+
+    """ LIKE 패턴에서 키워드를 글자 그대로 찾도록 와일드카드(%, _)와 이스케이프 문자를 이스케이프한다
+
+    Args:
+        keyword: 검색어
+
+    Returns:
+        이스케이프된 검색어
+    """
+    return keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -32,6 +32,9 @@ import FormControl from '@material-ui/core/FormControl';
 import style from 'src/utils/styles';
 import styled, { keyframes, css } from 'styled-components';
 
+// 엑셀 다운로드 작업 상태 조회 주기 (ms)
+const EXCEL_POLL_INTERVAL = 1000;
+
 function createData(name, calories, fat, carbs, protein) {
   return { name, calories, fat, carbs, protein };
 }
@@ -505,8 +508,35 @@ function TestingTable(props) {
     })
       .then((res) => res.json())
       .then((res) => {
-        // 파일 다운로드
-        window.location.assign(res.file_url);
+        // 엑셀 파일은 서버에서 작업으로 만들어지므로, 완료될 때까지 상태를 조회
+        waitForExcelFile(res.status_url);
+      })
+      .catch((res) => console.log(res));
+  };
+
+  const waitForExcelFile = (statusUrl) => {
+    fetch(`${JMURL}${statusUrl}`, {
+      method: 'GET',
+      headers: {
+        Authorization: localStorage.getItem('token'),
+        'Content-Type': 'application/json',
+      },
+    })
+      .then((res) => res.json())
+      .then((res) => {
+        const exportJob = res.export_job;
+        if (!exportJob) {
+          alert('네트워크 오류');
+          return;
+        }
+        if (exportJob.status === 'done') {
+          // 파일 다운로드
+          window.location.assign(exportJob.file_url);
+        } else if (exportJob.status === 'failed') {
+          alert('엑셀 파일 생성에 실패했습니다.');
+        } else {
+          setTimeout(() => waitForExcelFile(statusUrl), EXCEL_POLL_INTERVAL);
+        }
       })
       .catch((res) => console.log(res));
   };